@@ -0,0 +1,100 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Alarm storm: the actions of N rules firing at once, dispatched as the previous RuleEngine did
+(regex match and eval of the parameters at every firing) and through the actions compiled when
+the rules are loaded. Timed with the real handlers (which publish the alarms on the event bus)
+and with the handlers replaced by no-ops, which isolates the dispatch cost.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_action_dispatch.py [rules]
+"""
+
+import asyncio
+import re
+import sys
+import time
+
+from openscada_lite.common.actions import action_utils
+from openscada_lite.common.actions.action_map import ACTION_MAP
+
+TEMPLATES = (
+    "raise_alarm()",
+    "send_command('Plant{a}@VALVE_{i}', 0)",
+    "client_alert('Plant{a} TAG_{i} is high', 'warning', 'Plant{a}@VALVE_{i}', 'TOGGLE', 10)",
+)
+
+
+def actions(count):
+    for i in range(count):
+        yield TEMPLATES[i % len(TEMPLATES)].format(a=i % 100, i=i)
+
+
+async def previous(action_str, identifier, track_id, rule_id):
+    match = re.match(r"(\w+)\((.*)\)", action_str, re.DOTALL)
+    action_name, params_str = match.groups()
+    params = eval(f"({params_str},)") if params_str else ()  # NOSONAR
+    handler = ACTION_MAP.get(action_name)
+    await handler(identifier, params, track_id=track_id, rule_id=rule_id)
+
+
+# action string -> BoundAction, as the rule engine keeps them per rule
+BOUND = {}
+
+
+async def compiled(action_str, identifier, track_id, rule_id):
+    await BOUND[action_str](identifier, track_id, rule_id)
+
+
+async def storm_seconds(dispatch, storm) -> float:
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for i, action in enumerate(storm):
+            await dispatch(action, f"Plant{i % 100}@TAG_{i}", "track", f"rule_{i}")
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def noop(identifier, params, track_id, rule_id):
+    return None
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    storm = list(actions(count))
+    started = time.perf_counter()
+    for action in storm:
+        BOUND[action] = action_utils.compile_action(action)
+    compile_time = time.perf_counter() - started
+
+    print(f"alarm storm of {count} rule firings, actions compiled in {compile_time * 1000:.1f} ms")
+    for label in ("handlers", "no-op handlers"):
+        if label == "no-op handlers":
+            for name in list(ACTION_MAP):
+                ACTION_MAP[name] = noop
+            for bound in BOUND.values():
+                bound.handler = noop
+        before = await storm_seconds(previous, storm)
+        after = await storm_seconds(compiled, storm)
+        print(
+            f"  {label:<15} previous: {before * 1000:7.2f} ms   compiled: {after * 1000:7.2f} ms"
+            f"   ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+CPU spent by AnimationService under StressTestDriver load, with and without coalescing.
+
+The StressTest driver of config/svg_system_config.json toggles its 250 datapoints every scan.
+Several scans are published per event-loop tick, as happens when a few drivers and the
+datapoint module share a busy loop; with coalescing the animation service only renders the
+latest value of each datapoint that is still waiting for it.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_coalescing.py [scans] [scans_per_tick]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import socketio
+from fastapi import APIRouter
+
+from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.bus.event_types import EventType
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.common.models.entities import Datapoint
+from openscada_lite.modules.animation.controller import AnimationController
+from openscada_lite.modules.animation.model import AnimationModel
+from openscada_lite.modules.animation.service import AnimationService
+from openscada_lite.modules.communication.drivers.test.stress_test_driver import (
+    StressTestDriver,
+)
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "config", "svg_system_config.json")
+
+
+async def run(scans: int, scans_per_tick: int, coalesce: bool) -> dict:
+    EventBus._instance = None
+    bus = EventBus.get_instance()
+    AnimationService.coalesce_bus_updates = coalesce
+    model = AnimationModel()
+    controller = AnimationController(model, socketio.AsyncServer(), "animation", APIRouter())
+    service = AnimationService(bus, model, controller)
+
+    handled = 0
+    process_msg = service.process_msg
+
+    def counting_process_msg(msg):
+        nonlocal handled
+        handled += 1
+        return process_msg(msg)
+
+    service.process_msg = counting_process_msg
+
+    config = Config.get_instance()
+    driver_config = next(d for d in config.get_drivers() if d["name"] == "StressTest")
+    types = config.get_types()
+    driver = StressTestDriver("StressTest")
+    driver.subscribe(
+        [Datapoint(name=dp["name"], type=types[dp["type"]]) for dp in driver_config["datapoints"]]
+    )
+
+    async def on_scan(raws):
+        # What DatapointService does with an accepted scan
+        updates = [
+            TagUpdateMsg(datapoint_identifier=raw.datapoint_identifier, value=raw.value)
+            for raw in raws
+        ]
+        await bus.publish_many(EventType.TAG_UPDATE, updates)
+
+    driver.register_values_listener(on_scan)
+
+    start = time.process_time()
+    for scan in range(scans):
+        driver._simulate_values()
+        await driver._publish_all()
+        if scan % scans_per_tick == scans_per_tick - 1:
+            await asyncio.sleep(0)
+    await bus.drain()
+    cpu = time.process_time() - start
+    bus.clear_subscribers()
+    return {"cpu": cpu, "handled": handled, "published": scans * len(driver._tags)}
+
+
+def main():
+    scans = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    scans_per_tick = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    Config.get_instance(CONFIG_FILE)
+    for coalesce in (False, True):
+        result = asyncio.run(run(scans, scans_per_tick, coalesce))
+        print(
+            f"coalesce={str(coalesce):5}  updates={result['published']}  "
+            f"handled by animation={result['handled']}  cpu={result['cpu']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+The datapoint store backends with 100k tags: memory held, a full live feed state
+(get_state_dicts with a cold cache), a column snapshot and an update of every tag.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_columnar_model.py [tags]
+"""
+
+import datetime
+import gc
+import sys
+import time
+import tracemalloc
+
+from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.modules.base.base_model import VersionedStore
+from openscada_lite.modules.datapoint.columnar_store import ColumnarTagStore
+
+
+def fill(store, tag_ids, now):
+    for i, tag_id in enumerate(tag_ids):
+        store[tag_id] = TagUpdateMsg(datapoint_identifier=tag_id, value=float(i), timestamp=now)
+    return store
+
+
+def timed(call) -> float:
+    started = time.perf_counter()
+    call()
+    return time.perf_counter() - started
+
+
+def run(store_cls, tag_ids):
+    now = datetime.datetime.now()
+    gc.collect()
+    tracemalloc.start()
+    store = fill(store_cls(), tag_ids, now)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    state = timed(store.get_state_dicts)
+    if isinstance(store, ColumnarTagStore):
+        snapshot = timed(store.snapshot)
+        update_all = timed(lambda: store.bulk_update(tag_ids, range(len(tag_ids)), "good", now))
+    else:
+        snapshot = timed(
+            lambda: [(msg.value, msg.quality, msg.timestamp) for msg in store.values()]
+        )
+        update_all = timed(lambda: fill(store, tag_ids, now))
+    return held, state, snapshot, update_all
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tag_ids = [f"Plant{i % 100}@TAG_{i}" for i in range(count)]
+    print(f"{count} tags")
+    for name, store_cls in (("TagUpdateMsg", VersionedStore), ("columnar", ColumnarTagStore)):
+        held, state, snapshot, update_all = run(store_cls, tag_ids)
+        print(
+            f"  {name:>12}: {held / count:4.0f} B/tag  state {state * 1000:6.1f} ms  "
+            f"snapshot {snapshot * 1000:6.1f} ms  update all {update_all * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
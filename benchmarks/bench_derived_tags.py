@@ -0,0 +1,93 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Derived tags in deep dependency chains (10 chains of 1000 derived tags): an update of a chain's
+source recomputed incrementally, with every derived tag recomputed in topological order instead,
+and with the change stopping at the first derived tag of the chain.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_derived_tags.py [chains] [depth]
+"""
+
+import sys
+import time
+
+from asteval import Interpreter
+
+from openscada_lite.common.models.entities import DerivedTag
+from openscada_lite.modules.rule.manager.condition_compiler import ConditionCompiler
+from openscada_lite.modules.rule.manager.derived_tags import DerivedTagGraph
+
+
+def chains(count, depth):
+    for c in range(count):
+        # The first link clamps the source, so values above 1000 do not change the chain
+        yield DerivedTag(f"Chain{c}@D0", f"min(Plant@SRC_{c}, 1000)")
+        for d in range(1, depth):
+            yield DerivedTag(f"Chain{c}@D{d}", f"Chain{c}@D{d - 1} + 1")
+
+
+def best_ms(call, repeat=5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    interpreter = Interpreter()
+    started = time.perf_counter()
+    graph = DerivedTagGraph(
+        list(chains(count, depth)),
+        ConditionCompiler(interpreter),
+        lambda tag: tag.replace("@", "__", 1),
+    )
+    build = time.perf_counter() - started
+    symtable = interpreter.symtable
+    for c in range(count):
+        symtable[f"Plant__SRC_{c}"] = 0
+        graph.update(f"Plant@SRC_{c}", "good")
+    topological = sorted(graph.order, key=graph.order.get)
+
+    values = iter(range(1, 10**9))
+
+    def incremental():
+        symtable["Plant__SRC_0"] = next(values) % 1000
+        assert len(graph.update("Plant@SRC_0", "good")) == depth
+
+    def full():
+        symtable["Plant__SRC_0"] = next(values) % 1000
+        for name in topological:
+            symtable[graph._safe_keys[name]] = graph._evaluate(name)[0]
+
+    def unchanged():
+        symtable["Plant__SRC_0"] = 1000 + next(values)
+        graph.update("Plant@SRC_0", "good")
+
+    symtable["Plant__SRC_0"] = 1000
+    graph.update("Plant@SRC_0", "good")
+    print(f"{count} chains of {depth} derived tags, graph built in {build * 1000:.0f} ms")
+    print(f"  source update, recompute everything: {best_ms(full):7.2f} ms")
+    print(f"  source update, incremental:          {best_ms(incremental):7.2f} ms")
+    print(f"  source update, clamped (no change):  {best_ms(unchanged):7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Memory and build time of a DatapointModel holding 100k TagUpdateMsg, against the same model
+holding the previous TagUpdateMsg layout: a dataclass with a __dict__ and a uuid4 track_id.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_dto_memory.py [messages]
+"""
+
+from dataclasses import dataclass, field
+import datetime
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Optional
+import uuid
+
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.modules.datapoint.model import DatapointModel
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "config", "system_config.json")
+
+
+@dataclass
+class DictTagUpdateMsg:
+    """TagUpdateMsg as it was before slots and counter based track ids."""
+
+    datapoint_identifier: str
+    value: Any
+    quality: str = "good"
+    timestamp: Optional[datetime.datetime] = None
+    test: bool = False
+    track_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+    def get_id(self) -> str:
+        return self.datapoint_identifier
+
+
+def build(msg_cls, count: int, now: datetime.datetime) -> list:
+    return [
+        msg_cls(datapoint_identifier=f"Plant@TAG_{i}", value=float(i), timestamp=now)
+        for i in range(count)
+    ]
+
+
+def traced(call):
+    """Result of call and the bytes it allocated that are still alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = call()
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held
+
+
+def measure(msg_cls, count: int):
+    """Bytes of the messages, bytes of the filled model and seconds to build the messages."""
+    now = datetime.datetime.now()
+    started = time.perf_counter()
+    build(msg_cls, count, now)
+    elapsed = time.perf_counter() - started
+
+    model = DatapointModel()
+    msgs, msgs_held = traced(lambda: build(msg_cls, count, now))
+
+    def store():
+        for msg in msgs:
+            model.update(msg)
+
+    _, model_held = traced(store)
+    return msgs_held, msgs_held + model_held, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    Config.get_instance(CONFIG_FILE)
+    print(f"DatapointModel with {count} messages")
+    for name, msg_cls in (("dict + uuid4", DictTagUpdateMsg), ("slots + counter", TagUpdateMsg)):
+        msgs_held, total, elapsed = measure(msg_cls, count)
+        print(
+            f"  {name:>16}: messages {msgs_held / count:4.0f} B/msg, "
+            f"with the model {total / 2**20:5.1f} MiB, "
+            f"built in {elapsed * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+to_dict() time and allocations of every DTO: the generated serializers against the previous
+make_json_serializable(asdict(msg)).
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_dto_serialization.py [calls]
+"""
+
+from dataclasses import asdict, fields
+import datetime
+import sys
+import timeit
+import tracemalloc
+
+from openscada_lite.common.models import dtos
+from openscada_lite.common.models.dtos import DTO, make_json_serializable
+from openscada_lite.common.tracking.tracking_types import DataFlowStatus
+
+NOW = datetime.datetime.now()
+
+# A representative message of every DTO
+SAMPLES = [
+    dtos.TagUpdateMsg(datapoint_identifier="WaterTank@LEVEL", value=42.5, timestamp=NOW),
+    dtos.RawTagUpdateMsg(datapoint_identifier="WaterTank@LEVEL", value=42.5, timestamp=NOW),
+    dtos.SendCommandMsg(command_id="c1", datapoint_identifier="WaterTank@PUMP_CMD", value="ON"),
+    dtos.CommandFeedbackMsg(
+        command_id="c1",
+        datapoint_identifier="WaterTank@PUMP_CMD",
+        value="ON",
+        feedback="OK",
+        timestamp=NOW,
+    ),
+    dtos.RaiseAlarmMsg(datapoint_identifier="WaterTank@LEVEL", rule_id="high_level"),
+    dtos.LowerAlarmMsg(datapoint_identifier="WaterTank@LEVEL", rule_id="high_level"),
+    dtos.AckAlarmMsg(alarm_occurrence_id="WaterTank@LEVEL@2025-01-01T00:00:00"),
+    dtos.AlarmUpdateMsg(
+        datapoint_identifier="WaterTank@LEVEL", activation_time=NOW, rule_id="high_level"
+    ),
+    dtos.DriverConnectStatus(driver_name="WaterTank", status="online"),
+    dtos.DriverConnectCommand(driver_name="WaterTank", status="connect"),
+    dtos.DataFlowEventMsg(
+        event_type="TagUpdateMsg",
+        source="datapoint",
+        status=DataFlowStatus.FORWARDED,
+        timestamp=NOW,
+        payload={"datapoint_identifier": "WaterTank@LEVEL", "value": 42.5},
+    ),
+    dtos.AnimationUpdateMsg(
+        svg_name="plant.svg",
+        element_id="tank1",
+        animation_type="fill_level",
+        value=42.5,
+        config={"attr": {"height": 42.5}, "duration": 0.5},
+        timestamp=NOW,
+    ),
+    dtos.AnimationUpdateRequestMsg(datapoint_identifier="WaterTank@LEVEL", quality="good"),
+    dtos.ClientAlertMsg(message="Open the valve?", alert_type="confirm"),
+    dtos.ClientAlertFeedbackMsg(feedback="confirm"),
+    dtos.GisUpdateMsg(
+        id="tank1",
+        latitude=40.4,
+        longitude=-3.7,
+        icon="tank.png",
+        states={"good": "tank.png"},
+    ),
+]
+
+
+def asdict_to_dict(msg) -> dict:
+    """The previous to_dict()."""
+    d = make_json_serializable(asdict(msg))
+    for f in fields(msg):
+        if f.name.startswith("_") or not f.metadata.get("serialize", True):
+            del d[f.name]
+    return d
+
+
+def all_dtos(cls=DTO):
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from all_dtos(sub)
+
+
+def allocated(call) -> int:
+    """Peak bytes traced during one call."""
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    missing = set(all_dtos()) - {type(msg) for msg in SAMPLES}
+    if missing:
+        print(f"No sample for: {', '.join(sorted(cls.__name__ for cls in missing))}")
+    print(
+        f"{'DTO':<26}{'asdict us':>10}{'to_dict us':>11}{'speedup':>9}"
+        f"{'asdict B':>10}{'to_dict B':>10}"
+    )
+    total_old = total_new = 0.0
+    for msg in SAMPLES:
+        assert msg.to_dict() == asdict_to_dict(msg)
+        old = min(timeit.repeat(lambda: asdict_to_dict(msg), number=calls, repeat=3))
+        new = min(timeit.repeat(msg.to_dict, number=calls, repeat=3))
+        old_peak = allocated(lambda: asdict_to_dict(msg))
+        new_peak = allocated(msg.to_dict)
+        total_old += old
+        total_new += new
+        print(
+            f"{type(msg).__name__:<26}{old / calls * 1e6:>10.2f}{new / calls * 1e6:>11.2f}"
+            f"{old / new:>8.1f}x{old_peak:>10}{new_peak:>10}"
+        )
+    print(
+        f"{'all':<26}{total_old / calls * 1e6:>10.2f}{total_new / calls * 1e6:>11.2f}"
+        f"{total_old / total_new:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
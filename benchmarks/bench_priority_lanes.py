@@ -0,0 +1,121 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Command round-trip latency under a tag storm, with and without priority lanes.
+
+Several drivers publish scans of TAG_UPDATE as fast as the loop lets them, to subscribers that
+do some work per update and yield per batch (like a socket emit). Meanwhile a command is sent
+every few milliseconds; the driver takes 2 ms to write it and answers with COMMAND_FEEDBACK.
+The round trip is measured from SEND_COMMAND to the feedback subscriber.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_priority_lanes.py [commands] [drivers]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.bus.event_types import EventType
+from openscada_lite.common.models.dtos import CommandFeedbackMsg, SendCommandMsg, TagUpdateMsg
+
+TAGS_PER_SCAN = 250
+DRIVER_WRITE_TIME = 0.002
+
+
+async def run(commands: int, drivers: int, priority_lanes: bool) -> dict:
+    EventBus._instance = None
+    bus = EventBus.get_instance()
+    bus.configure({"copy_on_publish": False, "priority_lanes": priority_lanes})
+    sent_at = {}
+    latencies = []
+    scans = 0
+
+    async def on_tags(batch):
+        # Stand-in for rules and animation: some work per update, then a yield per batch
+        sum(hash(msg.datapoint_identifier) for msg in batch for _ in range(5))
+        await asyncio.sleep(0)
+
+    async def on_tag(msg):
+        pass
+
+    async def on_command(msg):
+        await asyncio.sleep(DRIVER_WRITE_TIME)
+        await bus.publish(
+            EventType.COMMAND_FEEDBACK,
+            CommandFeedbackMsg(
+                command_id=msg.command_id,
+                datapoint_identifier=msg.datapoint_identifier,
+                value=msg.value,
+                feedback="OK",
+            ),
+        )
+
+    async def on_feedback(msg):
+        latencies.append(time.perf_counter() - sent_at[msg.command_id])
+
+    bus.subscribe(EventType.TAG_UPDATE, on_tag, batch_callback=on_tags)
+    bus.subscribe(EventType.SEND_COMMAND, on_command)
+    bus.subscribe(EventType.COMMAND_FEEDBACK, on_feedback)
+
+    stop = asyncio.Event()
+
+    async def driver(index: int):
+        nonlocal scans
+        scan = [
+            TagUpdateMsg(datapoint_identifier=f"D{index}@TAG{i}", value=i)
+            for i in range(TAGS_PER_SCAN)
+        ]
+        while not stop.is_set():
+            await bus.publish_many(EventType.TAG_UPDATE, scan)
+            scans += 1
+
+    tasks = [asyncio.create_task(driver(i)) for i in range(drivers)]
+    for i in range(commands):
+        await asyncio.sleep(0.005)
+        command_id = f"cmd-{i}"
+        sent_at[command_id] = time.perf_counter()
+        await bus.publish(
+            EventType.SEND_COMMAND,
+            SendCommandMsg(command_id=command_id, datapoint_identifier="D0@TAG0", value=1),
+        )
+    stop.set()
+    await asyncio.gather(*tasks)
+    bus.clear_subscribers()
+    latencies.sort()
+    return {
+        "median": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "scans": scans,
+    }
+
+
+def main():
+    commands = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    drivers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    for priority_lanes in (False, True):
+        result = asyncio.run(run(commands, drivers, priority_lanes))
+        print(
+            f"priority_lanes={str(priority_lanes):5}  command round trip "
+            f"median={result['median']:.2f}ms p99={result['p99']:.2f}ms  "
+            f"tag scans={result['scans']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
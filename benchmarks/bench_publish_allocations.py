@@ -0,0 +1,99 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+DTO allocations and time per tag update through the EventBus, with and without copy_on_publish.
+
+The pipeline mirrors production: a RAW_TAG_UPDATE subscriber converts the message to a
+TagUpdateMsg (DatapointService) and republishes it to four TAG_UPDATE subscribers (rules,
+animation, GIS, communication). One of them keeps every message it receives, like a model.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_publish_allocations.py [updates]
+"""
+
+import asyncio
+import sys
+import time
+
+from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.bus.event_types import EventType
+from openscada_lite.common.models.dtos import DTO, RawTagUpdateMsg, TagUpdateMsg
+
+_allocated = 0
+
+
+def _counting_new(cls, *args, **kwargs):
+    global _allocated
+    _allocated += 1
+    return object.__new__(cls)
+
+
+async def run(updates: int, copy_on_publish: bool) -> dict:
+    global _allocated
+    EventBus._instance = None
+    bus = EventBus.get_instance()
+    bus.configure({"copy_on_publish": copy_on_publish})
+    kept = []
+
+    async def datapoint(msg: RawTagUpdateMsg):
+        await bus.publish(
+            EventType.TAG_UPDATE,
+            TagUpdateMsg(
+                datapoint_identifier=msg.datapoint_identifier,
+                value=msg.value,
+                track_id=msg.track_id,
+            ),
+        )
+
+    async def consumer(msg: TagUpdateMsg):
+        pass
+
+    async def model(msg: TagUpdateMsg):
+        kept.append(msg)
+
+    bus.subscribe(EventType.RAW_TAG_UPDATE, datapoint)
+    for callback in (consumer, consumer, consumer, model):
+        bus.subscribe(EventType.TAG_UPDATE, callback)
+
+    raws = [
+        RawTagUpdateMsg(datapoint_identifier=f"Driver@TAG_{i % 1000}", value=i, track_id="t")
+        for i in range(updates)
+    ]
+    _allocated = 0
+    start = time.perf_counter()
+    for raw in raws:
+        await bus.publish(EventType.RAW_TAG_UPDATE, raw)
+    elapsed = time.perf_counter() - start
+    return {
+        "dtos_per_update": _allocated / updates,
+        "us_per_update": elapsed / updates * 1e6,
+    }
+
+
+def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    DTO.__new__ = _counting_new
+    for copy_on_publish in (True, False):
+        result = asyncio.run(run(updates, copy_on_publish))
+        print(
+            f"copy_on_publish={str(copy_on_publish):5}  "
+            f"DTOs allocated/update={result['dtos_per_update']:.2f}  "
+            f"us/update={result['us_per_update']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
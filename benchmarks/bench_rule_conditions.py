@@ -0,0 +1,82 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Rule condition evaluations per second for 10k rules: asteval parsing the condition string on
+every evaluation (the previous RuleEngine), asteval running a tree parsed once, and the
+conditions compiled by ConditionCompiler.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_rule_conditions.py [rules]
+"""
+
+import ast
+import sys
+import time
+
+from asteval import Interpreter
+
+from openscada_lite.modules.rule.manager.condition_compiler import ConditionCompiler
+
+TEMPLATES = (
+    "Plant{a}@TAG_{i} > 50",
+    "Plant{a}@TAG_{i} > 50 and Plant{b}@TAG_{j} == 'OPENED'",
+    "float(Plant{a}@TAG_{i}) < 10 or Plant{b}@TAG_{j} == TRUE",
+    "abs(Plant{a}@TAG_{i} - Plant{b}@TAG_{j}) * 2 >= 30",
+)
+
+
+def conditions(count):
+    for i in range(count):
+        j = (i + 1) % count
+        yield TEMPLATES[i % len(TEMPLATES)].format(a=i % 100, i=i, b=j % 100, j=j)
+
+
+def evaluations_per_second(evaluate, items) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for item in items:
+            evaluate(item)
+        best = min(best, time.perf_counter() - started)
+    return len(items) / best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    interpreter = Interpreter()
+    interpreter.symtable["TRUE"] = True
+    for i in range(count):
+        interpreter.symtable[f"Plant{i % 100}__TAG_{i}"] = float(i % 100)
+    rules = list(conditions(count))
+
+    def previous(condition):
+        return interpreter(condition.replace("@", "__"))
+
+    parsed = [ast.parse(c.replace("@", "__"), mode="eval").body for c in rules]
+    compiler = ConditionCompiler(interpreter)
+    started = time.perf_counter()
+    compiled = [compiler.compile(c.replace("@", "__")) for c in rules]
+    compile_time = time.perf_counter() - started
+
+    assert [previous(c) for c in rules] == [condition() for condition in compiled]
+    print(f"{count} rules, compiled in {compile_time * 1000:.0f} ms (evaluations per second)")
+    print(f"  asteval, parse every time: {evaluations_per_second(previous, rules):>10,.0f}")
+    print(f"  asteval, parsed once:      {evaluations_per_second(interpreter.run, parsed):>10,.0f}")
+    print(f"  compiled:                  {evaluations_per_second(lambda c: c(), compiled):>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
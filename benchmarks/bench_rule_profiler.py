@@ -0,0 +1,84 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Cost of the rule profiler: evaluating the conditions of 10k rules through
+RuleEngine._evaluate_rule_conditions with profiling off, on with the default sampling (one
+evaluation in 16 timed) and on timing every evaluation, and the top 10 slow rules report.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_rule_profiler.py [rules]
+"""
+
+import os
+import sys
+import time
+
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.models.entities import Rule
+from openscada_lite.modules.rule.manager.rule_manager import RuleEngine
+from openscada_lite.modules.rule.manager.rule_profiler import DEFAULT_SAMPLE, RuleProfiler
+
+TEMPLATES = (
+    "Plant{a}@TAG_{i} > 50 and Plant{b}@TAG_{j} == 'OPENED'",
+    "float(Plant{a}@TAG_{i}) < 10 or Plant{b}@TAG_{j} == TRUE",
+    "abs(Plant{a}@TAG_{i} - Plant{b}@TAG_{j}) * 2 >= 30",
+)
+
+
+def rules(count):
+    for i in range(count):
+        j = (i + 1) % count
+        condition = TEMPLATES[i % len(TEMPLATES)].format(a=i % 100, i=i, b=j % 100, j=j)
+        yield Rule(rule_id=f"rule_{i}", on_condition=condition)
+
+
+def evaluation_time(engine) -> float:
+    evaluate = engine._evaluate_rule_conditions
+    started = time.perf_counter()
+    for rule in engine.rules:
+        evaluate(rule, rule.rule_id)
+    return time.perf_counter() - started
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    Config.get_instance(os.path.join(os.path.dirname(__file__), "../tests/config/test_config.json"))
+    engine = RuleEngine.get_instance()
+    engine.rules = list(rules(count))
+    engine.build_tag_to_rules_index()
+    for i in range(count):
+        engine._update_tag_state(f"Plant{i % 100}@TAG_{i}", float(i % 100))
+
+    profilers = {"off": None, **{f"sample {n}": RuleProfiler(n) for n in (DEFAULT_SAMPLE, 1)}}
+    best = dict.fromkeys(profilers, float("inf"))
+    for _ in range(40):  # interleaved, so the three see the same machine noise
+        for name, profiler in profilers.items():
+            engine.profiler = profiler
+            best[name] = min(best[name], evaluation_time(engine))
+    print(f"{count} rule evaluations")
+    for name, seconds in best.items():
+        overhead = (seconds - best["off"]) / count * 1e9
+        print(
+            f"  profiling {name:>9}: {seconds * 1000:6.2f} ms (+{overhead:.0f} ns per evaluation)"
+        )
+    started = time.perf_counter()
+    report = profilers["sample 1"].report(top=10)
+    report_time = time.perf_counter() - started
+    print(f"  top 10 report over {report['rules']} rules: {report_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Changing a few rules of a 10k rule set: rebuilding the whole index (what a restart does, before
+the rule states are lost) and RuleEngine.reload_rules, which only rebuilds the changed rules.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_rule_reload.py [rules] [changed]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.models.entities import Rule
+from openscada_lite.modules.rule.manager.rule_manager import RuleEngine
+
+TEMPLATES = (
+    "Plant{a}@LEVEL_{i} > {limit}",
+    "Plant{a}@LEVEL_{i} < {limit}",
+    "Plant{a}@LEVEL_{i} > {limit} and Plant{a}@PUMP_{i} == 'OPENED'",
+    "abs(Plant{a}@LEVEL_{i} - Plant{a}@SETPOINT_{i}) > {limit}",
+)
+
+
+def rules(count, limit_of=lambda i: 80):
+    return [
+        Rule(
+            rule_id=f"rule_{i}",
+            on_condition=TEMPLATES[i % len(TEMPLATES)].format(
+                a=i % 100, i=i // 4, limit=limit_of(i)
+            ),
+            on_actions=["raise_alarm()"],
+        )
+        for i in range(count)
+    ]
+
+
+async def reload_time(count, changed):
+    RuleEngine.reset_instance()
+    engine = RuleEngine.get_instance()
+    engine.rules = rules(count)
+    started = time.perf_counter()
+    engine.build_tag_to_rules_index()
+    build = time.perf_counter() - started
+
+    step = max(1, count // changed)
+    new_rules = rules(count, lambda i: 90 if i % step == 0 else 80)
+    new_rules = new_rules[: count - changed] + rules(count + changed)[count:]
+    started = time.perf_counter()
+    summary = await engine.reload_rules(new_rules)
+    reload = time.perf_counter() - started
+    return build, reload, summary
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    Config.get_instance(os.path.join(os.path.dirname(__file__), "../tests/config/test_config.json"))
+    build, reload, summary = asyncio.run(reload_time(count, changed))
+    sizes = ", ".join(f"{len(ids)} {name}" for name, ids in summary.items())
+    print(f"{count} rules ({sizes})")
+    print(f"  full index build: {build * 1000:8.1f} ms")
+    print(f"  reload_rules:     {reload * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
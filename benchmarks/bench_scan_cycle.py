@@ -0,0 +1,106 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Scans of tag updates through the RuleEngine when each rule reads many tags of the scan (200
+rules over 50 tags each, 10k tags): every impacted rule evaluated at each tag update, and in
+scan_cycle mode, where the scan is applied first and each rule is evaluated once. The data flow
+tracking of on_tag_updates, the same in both modes, is left out.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_scan_cycle.py [rules] [tags_per_rule]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.common.models.entities import Rule
+from openscada_lite.modules.rule.manager.rule_manager import RuleEngine
+
+
+def rules(count, per_rule):
+    return [
+        Rule(
+            rule_id=f"unit_{r}_overload",
+            on_condition=" + ".join(f"Unit{r}@LOAD_{i}" for i in range(per_rule))
+            + f" > {per_rule * 55}",
+            on_actions=["raise_alarm()"],
+        )
+        for r in range(count)
+    ]
+
+
+async def scan_time(scan_cycle, count, per_rule, scans):
+    RuleEngine.reset_instance()
+    engine = RuleEngine.get_instance()
+    engine.scan_cycle = scan_cycle
+    engine.rules = rules(count, per_rule)
+    engine.build_tag_to_rules_index()
+    for msg in scans[0]:  # every tag starts at 0, so sums are defined from the first scan on
+        engine._update_tag_state(msg.datapoint_identifier, 0.0)
+    fired = []
+
+    async def record(action_str, identifier, track_id, active=True, rule_id=None):
+        fired.append(rule_id)
+
+    engine.execute_action = record
+    evaluations = 0
+    evaluate = engine._evaluate_rule_conditions
+
+    def count_evaluation(rule, rule_id):
+        nonlocal evaluations
+        evaluations += 1
+        return evaluate(rule, rule_id)
+
+    engine._evaluate_rule_conditions = count_evaluation
+    best = float("inf")
+    for scan in scans:
+        started = time.perf_counter()
+        if scan_cycle:
+            await engine._apply_scan(scan)
+        else:
+            for msg in scan:
+                await engine._apply_tag_update(msg)
+        best = min(best, time.perf_counter() - started)
+    return best, evaluations // len(scans), len(fired)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    per_rule = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    Config.get_instance(os.path.join(os.path.dirname(__file__), "../tests/config/test_config.json"))
+    tags = [f"Unit{r}@LOAD_{i}" for r in range(count) for i in range(per_rule)]
+    rng = random.Random(1)
+    scans = [
+        [TagUpdateMsg(datapoint_identifier=tag, value=rng.uniform(0, 100)) for tag in tags]
+        for _ in range(5)
+    ]
+
+    print(f"{count} rules over {per_rule} tags each, scans of {len(tags)} tag updates")
+    for name, scan_cycle in (("per tag", False), ("scan_cycle", True)):
+        seconds, evaluations, fired = asyncio.run(scan_time(scan_cycle, count, per_rule, scans))
+        print(
+            f"  {name:>10}: {seconds * 1000:7.1f} ms per scan, {evaluations:6} evaluations"
+            f" per scan, {fired:4} actions in {len(scans)} scans"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Per tag update cost of the hops after the datapoint service, with identifiers only (the
+previous code) and with the tag index stamped by the datapoint service: the rule engine
+(one rule per 10 tags) and the GIS service (one icon per 10 tags).
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_tag_index.py [tags]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.config.tag_registry import UNKNOWN_TAG, TagRegistry
+from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.modules.gis.model import GisModel
+from openscada_lite.modules.gis.service import GisService
+from openscada_lite.modules.rule.manager.rule_manager import RuleEngine
+
+
+def write_config(path, count):
+    drivers = [
+        {
+            "name": f"Plant{d}",
+            "driver_class": "TestDriver",
+            "datapoints": [{"name": f"TAG_{i}", "type": "level"} for i in range(d, count, 100)],
+        }
+        for d in range(100)
+    ]
+    tags = [f"Plant{i % 100}@TAG_{i}" for i in range(count)]
+    config = {
+        "dp_types": {"level": {"type": "float", "min": 0, "max": 100, "default": 0}},
+        "drivers": drivers,
+        # Conditions never hold, so only the lookups and evaluations are measured
+        "rules": [
+            {"rule_id": f"rule_{i}", "on_condition": f"{tag} > 1000", "on_actions": []}
+            for i, tag in enumerate(tags[::10])
+        ],
+        "gis_icons": [
+            {"id": f"icon_{i}", "latitude": 0, "longitude": 0, "icon": "a.png", "datapoint": tag}
+            for i, tag in enumerate(tags[5::10])
+        ],
+    }
+    with open(path, "w") as f:
+        json.dump(config, f)
+
+
+class PreviousRuleEngine(RuleEngine):
+    """The lookups and condition rewriting before tag indexes."""
+
+    async def _apply_tag_update(self, msg):
+        tag_id = msg.datapoint_identifier
+        self._update_tag_state(tag_id, msg.value)
+        impacted_rules = self.tag_to_rules.get(tag_id, [])
+        self._log_tag_update(tag_id, msg.value, impacted_rules)
+        for rule in impacted_rules:
+            await self._process_rule(rule, tag_id, msg.track_id)
+
+    def _evaluate_rule_conditions(self, rule, rule_id):
+        on_result = self.asteval(rule.on_condition.replace("@", "__"))
+        off_cond = getattr(rule, "off_condition", None)
+        has_off = bool(off_cond and off_cond.strip())
+        off_result = self.asteval(rule.off_condition.replace("@", "__")) if has_off else False
+        return on_result, has_off, off_result
+
+
+def previous_gis(service, msg):
+    """GisService.should_accept_update and process_msg before tag indexes: linear scans."""
+    if any(icon.get("datapoint") == msg.datapoint_identifier for icon in service.gis_icons_config):
+        for icon_cfg in service.gis_icons_config:
+            result = service._process_tag_update(msg, icon_cfg)
+            if result:
+                return result
+    return None
+
+
+def current_gis(service, msg):
+    if service.should_accept_update(msg):
+        return service.process_msg(msg)
+    return None
+
+
+def per_update_us(call, msgs) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for msg in msgs:
+            call(msg)
+        best = min(best, time.perf_counter() - started)
+    return best / len(msgs) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "system_config.json")
+        write_config(path, count)
+        config = Config.get_instance(path)
+        registry = TagRegistry.get_instance(config)
+        by_name = [TagUpdateMsg(datapoint_identifier=name, value=1.0) for name in registry.names]
+        by_index = [
+            TagUpdateMsg(datapoint_identifier=name, value=1.0, tag_index=i)
+            for i, name in enumerate(registry.names)
+        ]
+        assert by_name[0].tag_index == UNKNOWN_TAG
+        print(f"{count} tags, {count // 10} rules, {count // 10} GIS icons (us per tag update)")
+
+        loop = asyncio.new_event_loop()
+        bus = EventBus.get_instance()
+        previous = PreviousRuleEngine(bus)
+        RuleEngine.reset_instance()
+        engine = RuleEngine(bus)
+
+        def rule_scan(rule_engine, msgs):
+            async def scan():
+                best = float("inf")
+                for _ in range(3):
+                    started = time.perf_counter()
+                    for msg in msgs:
+                        await rule_engine._apply_tag_update(msg)
+                    best = min(best, time.perf_counter() - started)
+                return best / len(msgs) * 1e6
+
+            return loop.run_until_complete(scan())
+
+        print(
+            f"  rule engine: {rule_scan(previous, by_name):6.1f} previous  "
+            f"{rule_scan(engine, by_name):6.1f} identifiers  "
+            f"{rule_scan(engine, by_index):6.1f} tag indexes"
+        )
+
+        gis = GisService(bus, GisModel(), None)
+        sample = slice(0, count, max(1, count // 2000))  # the scans are slow
+        print(
+            f"  gis:         {per_update_us(lambda m: previous_gis(gis, m), by_name[sample]):6.1f}"
+            f" previous  {per_update_us(lambda m: current_gis(gis, m), by_name):6.1f} identifiers"
+            f"  {per_update_us(lambda m: current_gis(gis, m), by_index):6.1f} tag indexes"
+        )
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Scans of tag updates through the RuleEngine with 10k threshold rules (HH, H, L and LL alarms on
+2500 tags), the threshold rules evaluated one by one and together per tag.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_threshold_rules.py [tags]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.common.models.entities import Rule
+from openscada_lite.modules.rule.manager.rule_manager import RuleEngine
+
+LIMITS = (("HH", ">", 95), ("H", ">", 80), ("L", "<", 10), ("LL", "<", 5))
+
+
+def rules(tags):
+    return [
+        Rule(rule_id=f"{tag}_{name}", on_condition=f"{tag} {op} {limit}", on_actions=["a()"])
+        for tag in tags
+        for name, op, limit in LIMITS
+    ]
+
+
+async def noop(*args, **kwargs):
+    pass
+
+
+async def scan_time(index_threshold_rules, tags, scans) -> float:
+    RuleEngine.reset_instance()
+    engine = RuleEngine.get_instance()
+    engine.index_threshold_rules = index_threshold_rules
+    engine.rules = rules(tags)
+    engine.build_tag_to_rules_index()
+    engine.execute_action = noop
+
+    best = float("inf")
+    for scan in scans:
+        started = time.perf_counter()
+        for msg in scan:
+            await engine._apply_tag_update(msg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2500
+    Config.get_instance(os.path.join(os.path.dirname(__file__), "../tests/config/test_config.json"))
+    tags = [f"Plant{i % 100}@LEVEL_{i}" for i in range(count)]
+    rng = random.Random(1)
+    # Each scan moves every tag by a few percent, a few rules change state per scan
+    values = [rng.uniform(0, 100) for _ in tags]
+    scans = []
+    for _ in range(5):
+        values = [min(100, max(0, v + rng.uniform(-5, 5))) for v in values]
+        scans.append([TagUpdateMsg(datapoint_identifier=t, value=v) for t, v in zip(tags, values)])
+
+    print(f"{count} tags, {count * len(LIMITS)} threshold rules, ms per scan of every tag")
+    for name, indexed in (("one by one", False), ("per tag", True)):
+        print(f"  {name:>10}: {asyncio.run(scan_time(indexed, tags, scans)) * 1000:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Tens of thousands of armed rule timers (on_delay/off_delay): arming, cancelling and firing them
+with the shared TimerWheel, with one loop.call_later handle each and with one asyncio task each
+(asyncio.sleep then the callback). Memory is traced while the timers are armed.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_timer_wheel.py [timers]
+"""
+
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+
+from openscada_lite.common.timers.timer_wheel import TimerWheel
+
+
+async def fire(counter):
+    counter[0] += 1
+
+
+def wheel_arm(wheel):
+    return lambda delay, counter: wheel.schedule(delay, fire, counter)
+
+
+def call_later_arm(delay, counter):
+    return asyncio.get_running_loop().call_later(
+        delay, lambda: asyncio.ensure_future(fire(counter))
+    )
+
+
+def task_arm(delay, counter):
+    async def sleeper():
+        await asyncio.sleep(delay)
+        await fire(counter)
+
+    return asyncio.get_running_loop().create_task(sleeper())
+
+
+async def measure(arm, delays):
+    counter = [0]
+    tracemalloc.start()
+    started = time.perf_counter()
+    timers = [arm(delay, counter) for delay in delays]
+    armed = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Noisy tags: half the timers are cancelled before they fire
+    started = time.perf_counter()
+    for timer in timers[::2]:
+        timer.cancel()
+    cancelled = time.perf_counter() - started
+    await asyncio.sleep(max(delays) + 0.3)
+    return armed, cancelled, memory, counter[0]
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(1)
+    delays = [rng.uniform(0.1, 1.0) for _ in range(count)]
+    print(f"{count} timers due in 0.1-1 s, half of them cancelled")
+    for name, arm in (
+        ("TimerWheel", wheel_arm(TimerWheel(resolution=0.05))),
+        ("call_later", call_later_arm),
+        ("task each", task_arm),
+    ):
+        armed, cancelled, memory, fired = await measure(arm, delays)
+        print(
+            f"  {name:>10}: arm {armed / count * 1e6:5.2f} us,"
+            f" cancel {cancelled / count * 2e6:5.2f} us,"
+            f" {memory / count:5.0f} bytes per armed timer, {fired} fired"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
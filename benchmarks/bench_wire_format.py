@@ -0,0 +1,86 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Bytes on the wire and CPU per 10k tag updates sent by a live feed, for each wire format.
+
+Every update has its own datapoint, so the batch buffer keeps all of them. The CPU is that of
+to_dict() per message, the wire encoding per batch and the Socket.IO packet encoding, which
+python-socketio does once per emit whatever the number of clients in the room.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_wire_format.py [updates] [batch_size] [rounds]
+"""
+
+import datetime
+import sys
+import time
+
+from socketio import packet
+
+from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.common.utils.WireUtils import WIRE_FORMATS, encode_items
+
+
+def make_updates(count: int):
+    now = datetime.datetime.now()
+    return [
+        TagUpdateMsg(
+            datapoint_identifier=f"Plant{i % 50}@TAG_{i}",
+            value=float(i) / 7,
+            quality="good",
+            timestamp=now,
+        )
+        for i in range(count)
+    ]
+
+
+def run(updates, batch_size: int, wire_format: str):
+    """Bytes sent, CPU seconds in to_dict() and CPU seconds encoding the batches."""
+    wire_bytes = 0
+    to_dict_cpu = encode_cpu = 0.0
+    for start in range(0, len(updates), batch_size):
+        started = time.process_time()
+        items = [msg.to_dict() for msg in updates[start : start + batch_size]]
+        serialized = time.process_time()
+        payload = encode_items(items, wire_format)
+        encoded = packet.Packet(
+            packet.EVENT, data=["datapoint_tagupdatemsg", payload], namespace="/"
+        ).encode()
+        encode_cpu += time.process_time() - serialized
+        to_dict_cpu += serialized - started
+        wire_bytes += len(encoded.encode("utf-8"))
+    return wire_bytes, to_dict_cpu, encode_cpu
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    updates = make_updates(count)
+    print(f"{count} tag updates in batches of {batch_size}, best of {rounds}")
+    for wire_format in WIRE_FORMATS:
+        results = [run(updates, batch_size, wire_format) for _ in range(rounds)]
+        wire_bytes = results[0][0]
+        to_dict_cpu = min(result[1] for result in results)
+        encode_cpu = min(result[2] for result in results)
+        print(
+            f"  {wire_format:>8}: {wire_bytes / 1024:8.1f} KiB   "
+            f"to_dict {to_dict_cpu * 1000:6.1f} ms   encode {encode_cpu * 1000:6.1f} ms CPU"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -33,8 +33,9 @@ from fastapi.openapi.utils import get_openapi
 
 from openscada_lite.common.tracking.publisher import TrackingPublisher
 from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.bus.transport import BusHub
 from openscada_lite.common.config.config import Config
-from openscada_lite.modules.loader import module_loader
+from openscada_lite.modules.loader import get_worker_groups, module_loader
 from openscada_lite.web.config_editor.routes import config_router
 from openscada_lite.web.security_editor.routes import security_router
 from openscada_lite.web.scada.routes import scada_router
@@ -90,6 +91,7 @@ sio = socketio.AsyncServer(
 # -----------------------------------------------------------------------------
 event_bus = EventBus.get_instance()
 system_config = Config.get_instance().load_system_config()
+event_bus.configure(Config.get_instance().get_event_bus_config())
 publisher = TrackingPublisher.get_instance()
 
 
@@ -107,6 +109,19 @@ async def lifespan(app: FastAPI):
     loop = asyncio.get_running_loop()
     publisher.initialize(loop)
 
+    # Modules configured with "worker" run in their own processes, bridged to this bus
+    hub = None
+    worker_groups = get_worker_groups(system_config)
+    if worker_groups:
+        hub = BusHub(event_bus, worker_args=[f"--logging-config={logging_config_path}"])
+        await hub.start()
+        for group, modules in worker_groups.items():
+            logger.info(f"[LIFESPAN] Starting worker {group}: {modules}")
+            try:
+                await hub.spawn(group)
+            except Exception as e:
+                logger.exception("[LIFESPAN] Error starting worker %s: %s", group, e)
+
     try:
         await module_loader(system_config, sio, event_bus, app)
     except Exception as e:
@@ -117,6 +132,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown publisher gracefully
     publisher.shutdown()
+    if hub is not None:
+        await hub.stop()
     logger.info("[LIFESPAN] Shutdown complete")
 
 
@@ -1,4 +1,7 @@
 import re
+from typing import Any, Tuple
+
+from openscada_lite.common.actions.action import Action
 from openscada_lite.common.actions.action_map import ACTION_MAP
 
 
@@ -21,6 +24,33 @@ def parse_action(action_str: str):
     return action_name, params
 
 
+class BoundAction:
+    """An action string parsed once: its handler with the parameters already bound."""
+
+    __slots__ = ("name", "params", "handler")
+
+    def __init__(self, name: str, params: Tuple[Any, ...], handler: Action):
+        self.name = name
+        self.params = params
+        self.handler = handler
+
+    def __call__(self, identifier, track_id, rule_id=None):
+        return self.handler(identifier, self.params, track_id=track_id, rule_id=rule_id)
+
+
+def compile_action(action_str: str) -> BoundAction:
+    """
+    Parse an action string into its BoundAction, which its owner (a rule, a schedule) keeps
+    so firing it does not parse it again.
+    Raises ValueError for invalid action strings and unknown actions.
+    """
+    action_name, params = parse_action(action_str)
+    handler = ACTION_MAP.get(action_name)
+    if not handler:
+        raise ValueError(f"Unknown action: {action_name}")
+    return BoundAction(action_name, params, handler)
+
+
 async def execute_action(action_str, identifier, track_id, rule_id=None):
     """
     Execute an action by looking up its handler and calling it.
@@ -31,9 +61,4 @@ async def execute_action(action_str, identifier, track_id, rule_id=None):
         active (bool): Whether this is an 'on' or 'off' action.
         track_id (str): The track ID associated with the action.
     """
-    action_name, params = parse_action(action_str)
-    handler = ACTION_MAP.get(action_name)
-    if not handler:
-        raise ValueError(f"Unknown action: {action_name}")
-
-    await handler(identifier, params, track_id=track_id, rule_id=rule_id)
+    await compile_action(action_str)(identifier, track_id, rule_id)
@@ -16,10 +16,57 @@
 
 import asyncio
 from collections import defaultdict
+from contextvars import ContextVar
 import copy
-from typing import Any, Callable, Dict, List
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
-from openscada_lite.common.bus.event_types import EventType
+from openscada_lite.common.bus.event_types import EventPriority, EventType
+from openscada_lite.common.bus.instrumentation import BusInstrumentation
+from openscada_lite.common.bus.subscriber_queue import OverflowPolicy, SubscriberQueue
+from openscada_lite.common.bus.transport import (
+    DEFAULT_MAX_PENDING,
+    FRAME_EVENTS,
+    BusTransport,
+    encode_frame,
+)
+from openscada_lite.common.models.dtos import DTO
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Distinct ids a coalescing subscriber may have pending before the publisher waits
+COALESCE_QUEUE_SIZE = 10000
+
+# Default seconds a lower priority delivery waits for the high priority handlers in flight
+DEFAULT_PRIORITY_WAIT = 0.05
+
+# The high priority handler call being run, so whatever it publishes in turn is not held back
+# waiting for itself. Tasks it spawns inherit the call too, but only skip the lanes until it
+# returns: the call is looked up in the bus's set of calls in flight.
+_high_priority_call = ContextVar("high_priority_call", default=None)
+
+
+class DispatchMode(Enum):
+    """How the subscribers of a single event are run."""
+
+    SEQUENTIAL = "sequential"  # await each subscriber in subscription order
+    CONCURRENT = "concurrent"  # run all subscribers of the event at the same time
+
+
+@dataclass
+class Subscription:
+    callback: Callable[[Any], Any]
+    timeout: Optional[float] = None  # seconds, overrides the bus default
+    queue: Optional[SubscriberQueue] = None  # set when the subscriber is decoupled by a queue
+    batch_callback: Optional[Callable[[List[Any]], Any]] = None  # used by publish_many
+
+    @property
+    def name(self) -> str:
+        return getattr(self.callback, "__qualname__", repr(self.callback))
 
 
 class EventBus:
@@ -39,29 +86,386 @@ class EventBus:
         return cls._instance
 
     def __init__(self):
-        # Each event type has a list of subscriber callbacks
-        self._subscribers: Dict[EventType, List[Callable[[Any], Any]]] = defaultdict(list)
+        # Each event type has a list of subscriptions
+        self._subscribers: Dict[EventType, List[Subscription]] = defaultdict(list)
+        self._dispatch_mode = DispatchMode.SEQUENTIAL
+        self._subscriber_timeout: Optional[float] = None
+        self._copy_on_publish = True
+        # owner (module name) -> {"size": int, "overflow": str}
+        self._queue_config: Dict[str, dict] = {}
+        # Remote peers (worker processes or the main process) events are forwarded to
+        self._transports: List[BusTransport] = []
+        # Bulk frames a transport keeps for a peer that falls behind
+        self.transport_max_pending = DEFAULT_MAX_PENDING
+        # Priority lanes: lower priority deliveries wait, up to _priority_wait seconds, while
+        # high priority ones are running
+        self._priority_lanes = True
+        self._priority_wait = DEFAULT_PRIORITY_WAIT
+        self._high_calls = set()  # tokens of the high priority handler calls in flight
+        self._high_done: Optional[asyncio.Future] = None
+        # Set once a delivery waited _priority_wait for the calls in flight: the others stop
+        # waiting until no high priority call is left
+        self._high_overdue = False
+        # Publish rates and handler latencies, only kept while instrumentation is enabled
+        self._instrumentation: Optional[BusInstrumentation] = None
+
+    def configure(self, bus_config: dict):
+        """
+        Apply the "event_bus" section of the system config.
+
+        Keys:
+            dispatch_mode: "sequential" (default) or "concurrent".
+            subscriber_timeout: default timeout in seconds for every subscriber.
+            subscriber_queues: {owner: {"size": int, "overflow": "block"|"drop_oldest"|"coalesce"}}
+                gives the subscribers of an owner (module name) their own bounded queue.
+            copy_on_publish: true (default) hands every publish a shallow copy of the DTO; false
+                shares a read-only copy (dto.freeze()) by reference with all subscribers, and
+                DTOs already frozen without copying them.
+            priority_lanes: true (default) serves commands and alarms ahead of bulk telemetry
+                (see EventPriority); false handles every event type alike.
+            priority_wait: seconds (default 0.05) the other deliveries wait for the command and
+                alarm handlers in flight, so a slow one cannot stall the telemetry.
+            transport_max_pending: bulk telemetry frames (default 1000) kept for a worker
+                process that cannot keep up; the oldest are dropped beyond that. Commands,
+                alarms and the other events are never dropped.
+            instrumentation: true records publish rates, handler latency histograms, in-flight
+                counts and failures per event type and subscriber (see get_metrics).
+        """
+        bus_config = bus_config or {}
+        self._dispatch_mode = DispatchMode(bus_config.get("dispatch_mode", "sequential"))
+        self._subscriber_timeout = bus_config.get("subscriber_timeout")
+        self._queue_config = bus_config.get("subscriber_queues", {})
+        self._copy_on_publish = bus_config.get("copy_on_publish", True)
+        self._priority_lanes = bus_config.get("priority_lanes", True)
+        self._priority_wait = bus_config.get("priority_wait", DEFAULT_PRIORITY_WAIT)
+        self.transport_max_pending = bus_config.get("transport_max_pending", DEFAULT_MAX_PENDING)
+        if bus_config.get("instrumentation", False):
+            self.enable_instrumentation()
+        else:
+            self.disable_instrumentation()
+        logger.info(
+            f"[EventBus] dispatch_mode={self._dispatch_mode.value} "
+            f"subscriber_timeout={self._subscriber_timeout} "
+            f"copy_on_publish={self._copy_on_publish} "
+            f"priority_lanes={self._priority_lanes} "
+            f"instrumentation={self.instrumentation_enabled}"
+        )
+
+    @property
+    def dispatch_mode(self) -> DispatchMode:
+        return self._dispatch_mode
 
     def clear_subscribers(self):
         """Remove all subscribers (for test isolation)."""
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                if subscription.queue:
+                    subscription.queue.close()
         self._subscribers.clear()
 
-    def subscribe(self, event_type: EventType, callback: Callable[[Any], Any]):
+    def subscribe(
+        self,
+        event_type: EventType,
+        callback: Callable[[Any], Any],
+        timeout: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        owner: Optional[str] = None,
+        batch_callback: Optional[Callable[[List[Any]], Any]] = None,
+        coalesce: bool = False,
+    ):
         """
         Subscribe a callback to an event type.
         Callback must be async (awaitable).
+        An optional timeout (seconds) bounds how long the callback may run per event.
+        With queue_size the callback gets its own bounded queue and worker task, so publishers
+        only wait for it when the queue is full and the overflow policy is BLOCK.
+        The owner (module name) picks up queue settings from the "subscriber_queues" config;
+        for bound methods of services it defaults to the service's module_name.
+        An optional async batch_callback receives a whole publish_many batch in one call.
+        With coalesce the subscriber only sees the latest event per get_id(): superseded events
+        still waiting in its queue are replaced, and whatever is pending is handed to the
+        batch_callback at once. Meant for consumers of current state (animation, GIS), not for
+        rules or history.
         """
         if not asyncio.iscoroutinefunction(callback):
             raise ValueError("Subscriber callback must be async")
-        self._subscribers[event_type].append(callback)
+        if batch_callback is not None and not asyncio.iscoroutinefunction(batch_callback):
+            raise ValueError("Subscriber batch callback must be async")
+        if owner is None:
+            owner = getattr(getattr(callback, "__self__", None), "module_name", None)
+        if queue_size is None and owner in self._queue_config:
+            queue_size = self._queue_config[owner].get("size")
+            overflow = OverflowPolicy(self._queue_config[owner].get("overflow", overflow.value))
+        elif coalesce:
+            queue_size = queue_size or COALESCE_QUEUE_SIZE
+            overflow = OverflowPolicy.COALESCE
+        subscription = Subscription(
+            callback=callback, timeout=timeout, batch_callback=batch_callback
+        )
+        if queue_size:
+            batch_handler = None
+            if batch_callback and overflow is OverflowPolicy.COALESCE:
+                # A coalescing queue only holds current state, hand it over in one call
+                batch_handler = partial(
+                    self._invoke_isolated, event_type, subscription, callback=batch_callback
+                )
+            subscription.queue = SubscriberQueue(
+                f"{event_type.value}:{subscription.name}",
+                lambda data: self._invoke_isolated(event_type, subscription, data),
+                queue_size,
+                overflow,
+                batch_handler=batch_handler,
+            )
+        self._subscribers[event_type].append(subscription)
 
     def unsubscribe(self, event_type: EventType, callback: Callable[[Any], Any]):
         """Unsubscribe a callback from an event type."""
-        if callback in self._subscribers[event_type]:
-            self._subscribers[event_type].remove(callback)
+        for subscription in self._subscribers[event_type]:
+            if subscription.callback == callback:
+                self._subscribers[event_type].remove(subscription)
+                if subscription.queue:
+                    subscription.queue.close()
+                return
+
+    def subscribed_event_types(self) -> List[EventType]:
+        return [event_type for event_type, subs in self._subscribers.items() if subs]
+
+    def attach_transport(self, transport: BusTransport):
+        """Forward the events published on this bus to a remote peer."""
+        self._transports.append(transport)
+
+    def detach_transport(self, transport: BusTransport):
+        if transport in self._transports:
+            self._transports.remove(transport)
+
+    @property
+    def instrumentation_enabled(self) -> bool:
+        return self._instrumentation is not None
+
+    def enable_instrumentation(self):
+        if self._instrumentation is None:
+            self._instrumentation = BusInstrumentation()
+
+    def disable_instrumentation(self):
+        self._instrumentation = None
+
+    def get_metrics(self) -> dict:
+        """Instrumentation per event type and subscriber, plus the subscriber queue metrics."""
+        return {
+            "instrumentation": self.instrumentation_enabled,
+            "event_types": self._instrumentation.snapshot() if self._instrumentation else {},
+            "queues": self.get_queue_metrics(),
+        }
+
+    def get_queue_metrics(self) -> Dict[str, List[dict]]:
+        """Depth, drop, coalesce and lag metrics of every queued subscriber, by event type."""
+        return {
+            event_type.value: [s.queue.get_metrics() for s in subscriptions if s.queue]
+            for event_type, subscriptions in self._subscribers.items()
+            if any(s.queue for s in subscriptions)
+        }
+
+    async def drain(self):
+        """Wait until every subscriber queue is empty and idle."""
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in subscriptions:
+                if subscription.queue:
+                    await subscription.queue.join()
 
     async def publish(self, event_type: EventType, data: Any):
-        to_publish = copy.copy(data)
         """Publish an event to all subscribers asynchronously."""
-        for callback in self._subscribers[event_type]:
-            await callback(to_publish)
+        to_publish = self._prepare(data)
+        if self._instrumentation is not None:
+            self._instrumentation.record_publish(event_type)
+        self._forward(event_type, [to_publish])
+        await self._dispatch(event_type, to_publish)
+
+    async def _dispatch(self, event_type: EventType, to_publish: Any):
+        subscriptions = list(self._subscribers.get(event_type, ()))
+        inline = []
+        for subscription in subscriptions:
+            if subscription.queue:
+                await subscription.queue.put(to_publish)
+            else:
+                inline.append(subscription)
+        if self._dispatch_mode is DispatchMode.CONCURRENT and len(inline) > 1:
+            # Errors and timeouts are isolated per subscriber; ordering per subscriber is kept
+            # because publish only returns once every subscriber has handled the event.
+            await asyncio.gather(
+                *(self._invoke_isolated(event_type, s, to_publish) for s in inline)
+            )
+            return
+        for subscription in inline:
+            await self._invoke(event_type, subscription, to_publish)
+
+    async def publish_many(self, event_type: EventType, items: List[Any]):
+        """
+        Publish a batch of events of one type (e.g. a driver scan cycle) in a single dispatch.
+        Batch-aware subscribers get the whole list at once, the others one event at a time.
+        """
+        if not items:
+            return
+        batch = [self._prepare(data) for data in items]
+        if self._instrumentation is not None:
+            self._instrumentation.record_publish(event_type, len(batch))
+        self._forward(event_type, batch)
+        if self._priority_lanes and event_type.priority is EventPriority.BULK:
+            # Let a command or alarm that is waiting for the loop go first
+            await asyncio.sleep(0)
+        await self._dispatch_many(event_type, batch)
+
+    async def deliver_remote(self, event_type: EventType, items: List[Any], origin: BusTransport):
+        """
+        Dispatch events received from a transport to the local subscribers and forward them to
+        the other transports (never back to where they came from).
+        """
+        batch = [self._prepare(data) for data in items]
+        if self._instrumentation is not None:
+            self._instrumentation.record_publish(event_type, len(batch))
+        self._forward(event_type, batch, origin)
+        if len(batch) == 1:
+            await self._dispatch(event_type, batch[0])
+        else:
+            await self._dispatch_many(event_type, batch)
+
+    def _forward(
+        self, event_type: EventType, batch: List[Any], origin: Optional[BusTransport] = None
+    ):
+        frame = None
+        for transport in self._transports:
+            if transport is origin or not transport.wants(event_type):
+                continue
+            if frame is None:
+                # Encoded once for all peers, before any local subscriber can see the events
+                frame = encode_frame(FRAME_EVENTS, event_type.value, batch)
+            transport.send(frame, droppable=event_type.priority is EventPriority.BULK)
+
+    async def _dispatch_many(self, event_type: EventType, batch: List[Any]):
+        subscriptions = list(self._subscribers.get(event_type, ()))
+        if self._dispatch_mode is DispatchMode.CONCURRENT and len(subscriptions) > 1:
+            await asyncio.gather(
+                *(self._deliver_batch(event_type, s, batch, isolated=True) for s in subscriptions)
+            )
+            return
+        for subscription in subscriptions:
+            await self._deliver_batch(event_type, subscription, batch, isolated=False)
+
+    async def _deliver_batch(
+        self, event_type: EventType, subscription: Subscription, batch: List[Any], isolated: bool
+    ):
+        if subscription.queue:
+            for data in batch:
+                await subscription.queue.put(data)
+        elif subscription.batch_callback:
+            # Each subscriber gets its own list, the events themselves are shared
+            if isolated:
+                await self._invoke_isolated(
+                    event_type, subscription, list(batch), subscription.batch_callback
+                )
+            else:
+                await self._invoke(
+                    event_type, subscription, list(batch), subscription.batch_callback
+                )
+        else:
+            for data in batch:
+                if isolated:
+                    await self._invoke_isolated(event_type, subscription, data)
+                else:
+                    await self._invoke(event_type, subscription, data)
+
+    def _prepare(self, data: Any) -> Any:
+        """Give subscribers their own shallow copy, or a frozen DTO to share by reference."""
+        if self._copy_on_publish:
+            return copy.copy(data)
+        if isinstance(data, DTO):
+            return data.freeze()
+        return data
+
+    async def _invoke(
+        self,
+        event_type: EventType,
+        subscription: Subscription,
+        data: Any,
+        callback: Optional[Callable] = None,
+    ):
+        callback = callback or subscription.callback
+        timeout = (
+            subscription.timeout if subscription.timeout is not None else self._subscriber_timeout
+        )
+        if not self._priority_lanes or _high_priority_call.get() in self._high_calls:
+            await self._call(event_type, subscription, callback, data, timeout)
+        elif event_type.priority is EventPriority.HIGH:
+            await self._call_high_priority(event_type, subscription, callback, data, timeout)
+        else:
+            if self._high_calls and not self._high_overdue:
+                await self._wait_high_priority_done()
+            await self._call(event_type, subscription, callback, data, timeout)
+
+    async def _call(
+        self,
+        event_type: EventType,
+        subscription: Subscription,
+        callback: Callable,
+        data: Any,
+        timeout: Optional[float],
+    ):
+        call = callback(data) if timeout is None else asyncio.wait_for(callback(data), timeout)
+        if self._instrumentation is None:
+            await call
+        else:
+            events = len(data) if callback is subscription.batch_callback else 1
+            await self._instrumentation.measure(event_type, subscription.name, events, call)
+
+    async def _call_high_priority(
+        self,
+        event_type: EventType,
+        subscription: Subscription,
+        callback: Callable,
+        data: Any,
+        timeout: Optional[float],
+    ):
+        call = object()
+        self._high_calls.add(call)
+        token = _high_priority_call.set(call)
+        try:
+            await self._call(event_type, subscription, callback, data, timeout)
+        finally:
+            _high_priority_call.reset(token)
+            self._high_calls.discard(call)
+            if not self._high_calls:
+                self._high_overdue = False
+                if self._high_done is not None:
+                    if not self._high_done.done():
+                        self._high_done.set_result(None)
+                    self._high_done = None
+
+    async def _wait_high_priority_done(self):
+        """Wait for the high priority calls in flight to finish, at most _priority_wait."""
+        # Created on demand so the bus is not tied to the loop it was built on
+        if self._high_done is None:
+            self._high_done = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._high_done), self._priority_wait)
+        except asyncio.TimeoutError:
+            # A slow command (e.g. a driver connecting to a dead device) must not stall the
+            # telemetry: stop holding deliveries back until the calls in flight are done
+            self._high_overdue = True
+
+    async def _invoke_isolated(
+        self,
+        event_type: EventType,
+        subscription: Subscription,
+        data: Any,
+        callback: Optional[Callable] = None,
+    ):
+        try:
+            await self._invoke(event_type, subscription, data, callback)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"[EventBus] Subscriber {subscription.name} timed out on {event_type.value}"
+            )
+        except Exception:
+            logger.exception(
+                f"[EventBus] Subscriber {subscription.name} failed on {event_type.value}"
+            )
@@ -14,7 +14,7 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
-from enum import Enum, unique
+from enum import Enum, IntEnum, unique
 
 """
 Defines all event types used in the EventBus.
@@ -39,3 +39,31 @@ class EventType(Enum):
     CLIENT_ALERT = "client_alert"
     CLIENT_ALERT_FEEDBACK = "client_alert_feedback"
     USER_ACTION = "user_action"
+
+    @property
+    def priority(self) -> "EventPriority":
+        return EVENT_PRIORITIES.get(self, EventPriority.NORMAL)
+
+
+@unique
+class EventPriority(IntEnum):
+    """Scheduling class of an event type on the bus, lower values are served first."""
+
+    HIGH = 0  # commands and alarms
+    NORMAL = 1
+    BULK = 2  # telemetry and tracking floods
+
+
+EVENT_PRIORITIES = {
+    EventType.SEND_COMMAND: EventPriority.HIGH,
+    EventType.COMMAND_FEEDBACK: EventPriority.HIGH,
+    EventType.DRIVER_CONNECT_COMMAND: EventPriority.HIGH,
+    EventType.RAISE_ALARM: EventPriority.HIGH,
+    EventType.LOWER_ALARM: EventPriority.HIGH,
+    EventType.ACK_ALARM: EventPriority.HIGH,
+    EventType.ALARM_UPDATE: EventPriority.HIGH,
+    EventType.RAW_TAG_UPDATE: EventPriority.BULK,
+    EventType.TAG_UPDATE: EventPriority.BULK,
+    EventType.TRACKING_EVENT: EventPriority.BULK,
+    EventType.ANIMATION_EVENT: EventPriority.BULK,
+}
@@ -0,0 +1,156 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Per event type and per subscriber measurements of the EventBus.
+
+The bus only holds a BusInstrumentation while instrumentation is enabled; when it is off the
+hot path pays for a single None check per publish and per subscriber call.
+"""
+
+import asyncio
+from bisect import bisect_left
+import time
+from typing import Awaitable, Dict
+
+from openscada_lite.common.bus.event_types import EventType
+
+# Upper bounds (seconds) of the handler latency histogram buckets, a last bucket takes the rest
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+# Seconds over which publish rates are averaged
+RATE_WINDOW = 10
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> dict:
+        calls = sum(self.counts)
+        return {
+            "buckets": [
+                {"le": bound, "count": count}
+                for bound, count in zip(LATENCY_BUCKETS + ("inf",), self.counts)
+            ],
+            "mean": self.total / calls if calls else 0.0,
+            "max": self.max,
+        }
+
+
+class SubscriberStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.events = 0  # a batch callback handles several events per call
+        self.in_flight = 0
+        self.exceptions = 0
+        self.timeouts = 0
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> dict:
+        return {
+            "subscriber": self.name,
+            "calls": self.calls,
+            "events": self.events,
+            "in_flight": self.in_flight,
+            "exceptions": self.exceptions,
+            "timeouts": self.timeouts,
+            "latency": self.latency.to_dict(),
+        }
+
+
+class EventTypeStats:
+    def __init__(self):
+        self.published = 0
+        # Ring of per-second publish counts: slot -> [second, count]
+        self._rate_slots = [[0, 0] for _ in range(RATE_WINDOW)]
+        self.subscribers: Dict[str, SubscriberStats] = {}
+
+    def record_publish(self, count: int, now: float):
+        self.published += count
+        second = int(now)
+        slot = self._rate_slots[second % RATE_WINDOW]
+        if slot[0] != second:
+            slot[0] = second
+            slot[1] = 0
+        slot[1] += count
+
+    def rate(self, now: float) -> float:
+        """Events per second published over the last RATE_WINDOW seconds."""
+        oldest = int(now) - RATE_WINDOW
+        return sum(count for second, count in self._rate_slots if second > oldest) / RATE_WINDOW
+
+
+class BusInstrumentation:
+    def __init__(self):
+        self._event_types: Dict[EventType, EventTypeStats] = {}
+
+    def _stats(self, event_type: EventType) -> EventTypeStats:
+        stats = self._event_types.get(event_type)
+        if stats is None:
+            stats = self._event_types[event_type] = EventTypeStats()
+        return stats
+
+    def record_publish(self, event_type: EventType, count: int = 1):
+        self._stats(event_type).record_publish(count, time.monotonic())
+
+    def subscriber(self, event_type: EventType, name: str) -> SubscriberStats:
+        subscribers = self._stats(event_type).subscribers
+        stats = subscribers.get(name)
+        if stats is None:
+            stats = subscribers[name] = SubscriberStats(name)
+        return stats
+
+    async def measure(self, event_type: EventType, name: str, events: int, call: Awaitable):
+        """Await a subscriber call, recording its latency, in-flight count and failures."""
+        stats = self.subscriber(event_type, name)
+        stats.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await call
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise
+        except Exception:
+            stats.exceptions += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.calls += 1
+            stats.events += events
+            stats.latency.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        return {
+            event_type.value: {
+                "published": stats.published,
+                "rate": stats.rate(now),
+                "subscribers": [s.to_dict() for s in stats.subscribers.values()],
+            }
+            for event_type, stats in self._event_types.items()
+        }
+
+    def reset(self):
+        self._event_types.clear()
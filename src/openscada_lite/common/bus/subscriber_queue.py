@@ -0,0 +1,171 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""
+Bounded per-subscriber queue used by the EventBus to decouple publishers from slow consumers.
+
+Each queued subscriber owns one SubscriberQueue and one worker task that feeds the queued
+events to the subscriber callback in order.
+"""
+
+import asyncio
+from collections import OrderedDict
+from enum import Enum
+import itertools
+from typing import Any, Awaitable, Callable, List, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    """What a full subscriber queue does with a new event."""
+
+    BLOCK = "block"  # the publisher waits until the subscriber makes room
+    DROP_OLDEST = "drop_oldest"  # the oldest pending event is discarded
+    COALESCE = "coalesce"  # a pending event with the same get_id() is replaced in place
+
+
+class SubscriberQueue:
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        maxsize: int,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        batch_handler: Optional[Callable[[List[Any]], Awaitable[None]]] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("Subscriber queue size must be positive")
+        self.name = name
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._handler = handler
+        # When set, the worker hands everything pending to it in one call
+        self._batch_handler = batch_handler
+        # key -> (enqueue time, event); keys are unique sequence numbers unless coalescing
+        self._pending: "OrderedDict[Any, tuple[float, Any]]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._worker: Optional[asyncio.Task] = None
+
+        # --- metrics ---
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def _key(self, data: Any):
+        if self.overflow is OverflowPolicy.COALESCE and hasattr(data, "get_id"):
+            return (type(data), data.get_id())
+        return next(self._sequence)
+
+    async def put(self, data: Any):
+        """Queue an event for the subscriber, applying the overflow policy when full."""
+        key = self._key(data)
+        while True:
+            if key in self._pending:
+                # Last value wins, the event keeps the slot (and lag) of the superseded one
+                enqueued_at, _ = self._pending[key]
+                self._pending[key] = (enqueued_at, data)
+                self.coalesced += 1
+                return
+            if len(self._pending) < self.maxsize:
+                break
+            if self.overflow is OverflowPolicy.DROP_OLDEST:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+                break
+            self._not_full.clear()
+            await self._not_full.wait()
+
+        loop = asyncio.get_running_loop()
+        self._pending[key] = (loop.time(), data)
+        self.enqueued += 1
+        self._idle.clear()
+        self._not_empty.set()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run(), name=f"bus-queue:{self.name}")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                self._not_empty.clear()
+                self._idle.set()
+                await self._not_empty.wait()
+                continue
+            if self._batch_handler is not None and len(self._pending) > 1:
+                await self._run_batch(loop)
+                continue
+            _, (enqueued_at, data) = self._pending.popitem(last=False)
+            self._not_full.set()
+            self._record_lag(loop, enqueued_at)
+            try:
+                await self._handler(data)
+            except Exception:
+                logger.exception(f"[SubscriberQueue] {self.name} failed handling {data}")
+            self.processed += 1
+
+    async def _run_batch(self, loop):
+        pending = list(self._pending.values())
+        self._pending.clear()
+        self._not_full.set()
+        self._record_lag(loop, pending[0][0])
+        try:
+            await self._batch_handler([data for _, data in pending])
+        except Exception:
+            logger.exception(f"[SubscriberQueue] {self.name} failed handling a batch")
+        self.processed += len(pending)
+
+    def _record_lag(self, loop, enqueued_at: float):
+        self.last_lag = loop.time() - enqueued_at
+        self.max_lag = max(self.max_lag, self.last_lag)
+
+    async def join(self):
+        """Wait until every queued event has been handled (mainly for tests and shutdown)."""
+        await self._idle.wait()
+
+    def close(self):
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+        self._worker = None
+        self._pending.clear()
+        self._idle.set()
+
+    def get_metrics(self) -> dict:
+        return {
+            "subscriber": self.name,
+            "depth": self.depth,
+            "maxsize": self.maxsize,
+            "overflow": self.overflow.value,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
@@ -0,0 +1,289 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""
+Transports that extend the EventBus beyond the current process.
+
+The main process runs a BusHub listening on a Unix socket and spawns one worker process per
+worker group (see openscada_lite.worker). Every connection is a StreamTransport
+attached to the local EventBus: events published on one side are forwarded to the other side
+as length-prefixed pickle frames, one frame per publish or publish_many batch.
+
+Only the two sides of the same installation talk over the socket, which lives in a private
+(0700) temporary directory, so frames are trusted like any other in-process object.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+import os
+import pickle
+import shutil
+import struct
+import sys
+import tempfile
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from openscada_lite.common.bus.event_types import EventType
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+
+# Frame kinds
+FRAME_EVENTS = "events"  # (kind, event type value, [items])
+FRAME_INTEREST = "interest"  # (kind, peer name, [event type values])
+
+WORKER_MODULE = "openscada_lite.worker"
+
+# Droppable frames (bulk telemetry) kept for a peer that falls behind; the oldest go first
+DEFAULT_MAX_PENDING = 1000
+
+
+def encode_frame(kind: str, key: Any, payload: Any) -> bytes:
+    body = pickle.dumps((kind, key, payload), protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple:
+    header = await reader.readexactly(_HEADER.size)
+    (length,) = _HEADER.unpack(header)
+    return pickle.loads(await reader.readexactly(length))
+
+
+class BusTransport(ABC):
+    """A remote peer of the EventBus."""
+
+    name: str
+
+    @abstractmethod
+    def wants(self, event_type: EventType) -> bool:
+        """Whether events of this type must be forwarded to the peer."""
+
+    @abstractmethod
+    def send(self, frame: bytes, droppable: bool = False):
+        """
+        Queue an encoded frame for the peer, never blocks the publisher. Droppable frames may
+        be discarded, oldest first, while the peer is too slow to take them.
+        """
+
+    async def close(self):
+        pass
+
+
+class StreamTransport(BusTransport):
+    """
+    EventBus peer over an asyncio stream pair (Unix socket).
+
+    Outgoing frames go through an outbox drained by a writer task, so a publisher is never
+    blocked by the socket and two peers flooding each other cannot deadlock. Droppable frames
+    wait in their own queue of at most max_pending frames, dropping the oldest when it is full
+    (like a "drop_oldest" subscriber queue), and are written after the other frames.
+    """
+
+    def __init__(
+        self,
+        bus,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        name: str,
+        wants_all: bool = False,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        if max_pending <= 0:
+            raise ValueError("Transport max_pending must be positive")
+        self.bus = bus
+        self.name = name
+        self._reader = reader
+        self._writer = writer
+        self._wants_all = wants_all
+        self._interest: set = set()
+        self.max_pending = max_pending
+        self._outbox: Deque[bytes] = deque()  # never dropped: interest, commands, alarms...
+        self._droppable: Deque[bytes] = deque()
+        self._has_frames = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.ready = asyncio.Event()  # set when the peer has announced its interest
+        self.closed = asyncio.Event()
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._read_loop(), name=f"bus-transport-read:{self.name}"),
+            asyncio.create_task(self._write_loop(), name=f"bus-transport-write:{self.name}"),
+        ]
+
+    def wants(self, event_type: EventType) -> bool:
+        return self._wants_all or event_type in self._interest
+
+    def send(self, frame: bytes, droppable: bool = False):
+        if not droppable:
+            self._outbox.append(frame)
+        else:
+            if len(self._droppable) >= self.max_pending:
+                self._droppable.popleft()
+                self.frames_dropped += 1
+            self._droppable.append(frame)
+        self._has_frames.set()
+
+    def send_interest(self, event_types: Iterable[EventType]):
+        """Tell the peer which event types this side subscribes to."""
+        self.send(encode_frame(FRAME_INTEREST, self.name, [e.value for e in event_types]))
+
+    async def _read_loop(self):
+        try:
+            while True:
+                kind, key, payload = await read_frame(self._reader)
+                self.frames_received += 1
+                if kind == FRAME_EVENTS:
+                    await self.bus.deliver_remote(EventType(key), payload, self)
+                elif kind == FRAME_INTEREST:
+                    self.name = key
+                    self._interest = {EventType(value) for value in payload}
+                    self.ready.set()
+                    logger.info(f"[BusTransport] {key} subscribed to {sorted(payload)}")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.info(f"[BusTransport] {self.name} disconnected")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"[BusTransport] {self.name} failed reading frames")
+        finally:
+            self.bus.detach_transport(self)
+            self.closed.set()
+
+    async def _write_loop(self):
+        try:
+            while True:
+                if not self._outbox and not self._droppable:
+                    self._has_frames.clear()
+                    await self._has_frames.wait()
+                    continue
+                # Write whatever is waiting, droppable frames last, and drain once
+                while self._outbox or self._droppable:
+                    self._writer.write((self._outbox or self._droppable).popleft())
+                    self.frames_sent += 1
+                await self._writer.drain()
+        except ConnectionError:
+            logger.info(f"[BusTransport] {self.name} connection lost while writing")
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self._writer.close()
+        self.closed.set()
+
+    def get_metrics(self) -> dict:
+        return {
+            "peer": self.name,
+            "pending": len(self._outbox) + len(self._droppable),
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "frames_received": self.frames_received,
+        }
+
+
+class BusHub:
+    """
+    Main-process side of the multi-process bus: accepts worker connections on a Unix socket,
+    attaches them to the local EventBus and manages the worker processes.
+    """
+
+    def __init__(self, bus, worker_args: Optional[List[str]] = None):
+        if not hasattr(asyncio, "start_unix_server"):
+            raise RuntimeError("Worker processes need Unix socket support")
+        self.bus = bus
+        self.worker_args = worker_args or []
+        self.socket_path: Optional[str] = None
+        self._socket_dir: Optional[str] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._transports: Dict[str, StreamTransport] = {}
+        self._connected = asyncio.Condition()
+        self._processes: Dict[str, asyncio.subprocess.Process] = {}
+
+    async def start(self):
+        self._socket_dir = tempfile.mkdtemp(prefix="openscada-bus-")
+        self.socket_path = os.path.join(self._socket_dir, "bus.sock")
+        self._server = await asyncio.start_unix_server(self._on_connect, path=self.socket_path)
+        logger.info(f"[BusHub] Listening on {self.socket_path}")
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        transport = StreamTransport(
+            self.bus, reader, writer, name="worker", max_pending=self.bus.transport_max_pending
+        )
+        self.bus.attach_transport(transport)
+        transport.start()
+        await transport.ready.wait()
+        async with self._connected:
+            self._transports[transport.name] = transport
+            self._connected.notify_all()
+
+    async def spawn(self, group: str, timeout: float = 30.0):
+        """Start the worker process of a group and wait until it has subscribed."""
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            WORKER_MODULE,
+            "--group",
+            group,
+            "--socket",
+            self.socket_path,
+            *self.worker_args,
+        )
+        self._processes[group] = process
+        logger.info(f"[BusHub] Started worker {group} (pid {process.pid})")
+        async with self._connected:
+            await asyncio.wait_for(
+                self._connected.wait_for(lambda: group in self._transports), timeout
+            )
+
+    def get_metrics(self) -> List[dict]:
+        return [transport.get_metrics() for transport in self._transports.values()]
+
+    async def stop(self):
+        for group, process in self._processes.items():
+            if process.returncode is None:
+                process.terminate()
+                try:
+                    await asyncio.wait_for(process.wait(), 5.0)
+                except asyncio.TimeoutError:
+                    logger.warning(f"[BusHub] Worker {group} did not stop, killing it")
+                    process.kill()
+        for transport in self._transports.values():
+            await transport.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._socket_dir:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+        self._processes.clear()
+        self._transports.clear()
+
+
+async def connect_to_hub(bus, socket_path: str, name: str) -> StreamTransport:
+    """Worker side: attach the local EventBus to the hub of the main process."""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    # The hub fans out to the main process and the other workers, so it gets everything
+    transport = StreamTransport(
+        bus, reader, writer, name=name, wants_all=True, max_pending=bus.transport_max_pending
+    )
+    bus.attach_transport(transport)
+    transport.start()
+    return transport
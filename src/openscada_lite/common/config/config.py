@@ -18,7 +18,7 @@ import os
 import json
 from pathlib import Path
 import xml.etree.ElementTree as ET
-from openscada_lite.common.models.entities import Animation, AnimationEntry, Rule
+from openscada_lite.common.models.entities import Animation, AnimationEntry, DerivedTag, Rule
 import logging
 
 logger = logging.getLogger(__name__)
@@ -73,6 +73,10 @@ class Config:
         rules = self._config.get("rules", [])
         return [Rule(**r) for r in rules]
 
+    def get_derived_tags(self):
+        """Return the virtual datapoints computed by the rule engine from other tags."""
+        return [DerivedTag(**d) for d in self._config.get("derived_tags", [])]
+
     def get_datapoint_types_for_driver(self, driver_name: str, types: dict) -> dict:
         """
         Returns a dict {tag_name: dp_type_dict} for the given driver.
@@ -183,6 +187,12 @@ class Config:
                 return module.get("config", {})
         return {}
 
+    def get_event_bus_config(self) -> dict:
+        """
+        Returns the "event_bus" section of the system config, or an empty dict if not set.
+        """
+        return self._config.get("event_bus", {})
+
     def get_animations(self):
         animations_dict = self._config.get("animations", {})
         return {
@@ -0,0 +1,105 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Dense integer ids (tag indexes) for the configured datapoints.
+
+The registry is built once from Config.get_allowed_datapoint_identifiers, in config order, so
+every process loading the same config assigns the same indexes. The datapoint service stamps
+the index on each TagUpdateMsg and the modules downstream look it up in TagIndex tables
+(list indexing) instead of hashing "Driver@TAG" strings at every hop.
+"""
+
+import sys
+from typing import Any, Dict, Generic, List, TypeVar
+
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.models.dtos import UNKNOWN_TAG
+
+V = TypeVar("V")
+
+
+class TagRegistry:
+    _instance = None
+
+    def __init__(self, config: Config):
+        self._config = config
+        self.names: List[str] = []
+        self._indexes: Dict[str, int] = {}
+        for name in config.get_allowed_datapoint_identifiers():
+            if name not in self._indexes:
+                name = sys.intern(name)
+                self._indexes[name] = len(self.names)
+                self.names.append(name)
+
+    @classmethod
+    def get_instance(cls, config: Config = None) -> "TagRegistry":
+        """The registry of config (default Config.get_instance()), rebuilt if the config changed."""
+        if config is None:
+            config = Config.get_instance()
+        if cls._instance is None or cls._instance._config is not config:
+            cls._instance = cls(config)
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls):
+        """Reset the singleton instance (for testing)."""
+        cls._instance = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index_of(self, identifier: str) -> int:
+        """Tag index of a "Driver@TAG" identifier, UNKNOWN_TAG if it is not configured."""
+        return self._indexes.get(identifier, UNKNOWN_TAG)
+
+    def name_of(self, tag_index: int) -> str:
+        """The interned identifier of a tag index."""
+        return self.names[tag_index]
+
+
+class TagIndex(Generic[V]):
+    """
+    Values of a dict keyed by datapoint identifier, reachable by tag index in a dense list.
+    Messages without a valid tag index, or with the index of another tag, fall back to the dict.
+    """
+
+    __slots__ = ("by_name", "by_index", "default", "_size", "_registry")
+
+    def __init__(self, registry: TagRegistry, by_name: Dict[str, V], default: Any = None):
+        self.by_name = by_name
+        self.default = default
+        self.by_index: List[V] = [by_name.get(name, default) for name in registry.names]
+        self._size = len(self.by_index)
+        self._registry = registry
+
+    def get(self, tag_index: int, identifier: str) -> V:
+        if 0 <= tag_index < self._size and self._registry.names[tag_index] == identifier:
+            return self.by_index[tag_index]
+        return self.by_name.get(identifier, self.default)
+
+    def set(self, identifier: str, value: V):
+        """Set the value of one identifier, in the dict and at its tag index if it has one."""
+        self.by_name[identifier] = value
+        tag_index = self._registry.index_of(identifier)
+        if tag_index != UNKNOWN_TAG:
+            self.by_index[tag_index] = value
+
+    def remove(self, identifier: str):
+        """Remove the value of one identifier, which then gets the default."""
+        self.by_name.pop(identifier, None)
+        tag_index = self._registry.index_of(identifier)
+        if tag_index != UNKNOWN_TAG:
+            self.by_index[tag_index] = self.default
@@ -14,9 +14,12 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
-from dataclasses import dataclass, asdict, field
+import copy
+import itertools
+import os
+from dataclasses import FrozenInstanceError, dataclass, asdict, field, fields, is_dataclass
 from enum import Enum
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 import datetime
 import uuid
 
@@ -25,12 +28,40 @@ from openscada_lite.common.bus.event_types import EventType
 
 from abc import ABC, abstractmethod
 
+# tag_index of identifiers that are not in the TagRegistry
+UNKNOWN_TAG = -1
 
-@dataclass(kw_only=True)
+# track_ids are a random prefix per process and a counter, unique across processes and restarts
+# without reading os.urandom for every DTO like uuid4 does
+_track_id_prefix = uuid.uuid4().hex[:16]
+_track_id_counter = itertools.count(1)
+
+
+def new_track_id() -> str:
+    return f"{_track_id_prefix}-{next(_track_id_counter)}"
+
+
+def _new_track_id_prefix():
+    global _track_id_prefix, _track_id_counter
+    _track_id_prefix = uuid.uuid4().hex[:16]
+    _track_id_counter = itertools.count(1)
+
+
+# A forked worker (e.g. gunicorn) must not repeat the ids of its parent
+os.register_at_fork(after_in_child=_new_track_id_prefix)
+
+
+@dataclass(kw_only=True, slots=True)
 class DTO(ABC):
-    """Base class for Data Transfer Objects (DTOs) used in the system."""
+    """
+    Base class for Data Transfer Objects (DTOs) used in the system.
+    DTOs are slotted dataclasses: subclasses must use @dataclass(slots=True) too.
+    """
+
+    track_id: str = field(default_factory=new_track_id)
 
-    track_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # Set on the read-only subclasses freeze() makes: the DTO class they freeze
+    _mutable_class = None
 
     # The payload for each DTO
     def get_track_payload(self) -> str:
@@ -51,8 +82,96 @@ class DTO(ABC):
         pass
 
     def _default_to_dict(self):
-        d = asdict(self)
-        return make_json_serializable(d)
+        """
+        JSON-ready dict of the public fields, the same as make_json_serializable(asdict(self))
+        without the fields marked {"serialize": False}, in a single pass with a serializer
+        generated once per class.
+        """
+        serializer = _SERIALIZERS.get(type(self))
+        if serializer is None:
+            serializer = _SERIALIZERS[type(self)] = _build_serializer(type(self))
+        return serializer(self)
+
+    def freeze(self) -> "DTO":
+        """
+        A read-only copy of the DTO, which subscribers can share by reference; the DTO itself
+        stays modifiable and a frozen one is returned as it is. Copies of a frozen DTO
+        (copy.copy, dataclasses.replace(), pickling) are modifiable again.
+        """
+        cls = type(self)
+        if cls._mutable_class is not None:
+            return self
+        frozen = cls.__new__(_FROZEN_CLASSES.get(cls) or _frozen_class(cls))
+        for name in _slot_names(cls):
+            object.__setattr__(frozen, name, getattr(self, name))
+        return frozen
+
+    @property
+    def frozen(self) -> bool:
+        return self._mutable_class is not None
+
+    def __copy__(self):
+        cls = self._mutable_class or type(self)
+        clone = cls.__new__(cls)
+        for name in _slot_names(cls):
+            object.__setattr__(clone, name, getattr(self, name))
+        return clone
+
+
+# DTO class -> its read-only subclass, made by the first freeze()
+_FROZEN_CLASSES: Dict[type, type] = {}
+
+
+def _frozen_class(cls) -> type:
+    """
+    The read-only subclass of a DTO class: same slots and name, assignments raise
+    FrozenInstanceError. Building one (dataclasses.replace()) builds a modifiable cls instead,
+    and it pickles as cls. Only frozen DTOs pay for the checks.
+    """
+
+    def __new__(frozen_cls, *args, **kwargs):
+        return cls(*args, **kwargs)
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}' of frozen {cls.__name__}")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}' of frozen {cls.__name__}")
+
+    def __eq__(self, other):
+        if not isinstance(other, DTO) or (other._mutable_class or type(other)) is not cls:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _compared_names(cls))
+
+    def __reduce_ex__(self, protocol):
+        return _thawed, (cls, tuple(getattr(self, name) for name in _slot_names(cls)))
+
+    frozen_cls = type(
+        cls.__name__,
+        (cls,),
+        {
+            "__slots__": (),
+            "__qualname__": cls.__qualname__,
+            "__module__": cls.__module__,
+            "_mutable_class": cls,
+            "__new__": __new__,
+            "__setattr__": __setattr__,
+            "__delattr__": __delattr__,
+            "__eq__": __eq__,
+            "__hash__": cls.__hash__,
+            "__reduce_ex__": __reduce_ex__,
+        },
+    )
+    _FROZEN_CLASSES[cls] = frozen_cls
+    return frozen_cls
+
+
+def _thawed(cls, values: tuple) -> DTO:
+    """A modifiable cls with the field values of a frozen one (how frozen DTOs unpickle)."""
+    dto = cls.__new__(cls)
+    for name, value in zip(_slot_names(cls), values):
+        object.__setattr__(dto, name, value)
+    return dto
 
 
 def make_json_serializable(obj):
@@ -70,13 +189,84 @@ def make_json_serializable(obj):
         return obj
 
 
-@dataclass
+# Values sent as they are; anything else goes through _to_json_value
+_JSON_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+_SERIALIZERS: Dict[type, Callable[[Any], dict]] = {}
+
+_SLOT_NAMES: Dict[type, tuple] = {}
+
+
+def _slot_names(cls) -> tuple:
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        names = _SLOT_NAMES[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+_COMPARED_NAMES: Dict[type, tuple] = {}
+
+
+def _compared_names(cls) -> tuple:
+    names = _COMPARED_NAMES.get(cls)
+    if names is None:
+        names = _COMPARED_NAMES[cls] = tuple(f.name for f in fields(cls) if f.compare)
+    return names
+
+
+def _to_json_value(obj):
+    """A JSON-ready copy of a field value that is not a plain scalar."""
+    if type(obj) in _JSON_SCALARS:
+        return obj
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, dict):
+        return {k: _to_json_value(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_to_json_value(v) for v in obj]
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return make_json_serializable(asdict(obj))
+    return copy.deepcopy(obj)
+
+
+def _build_serializer(cls) -> Callable[[Any], dict]:
+    """
+    Generate cls's to_dict: one dict literal with a type check per field, so str, numbers,
+    bools and None are not walked or copied.
+    """
+    names = [
+        f.name
+        for f in fields(cls)
+        if not f.name.startswith("_") and f.metadata.get("serialize", True)
+    ]
+    lines = ["def to_dict(self):"]
+    lines += [f"    _{i} = self.{name}" for i, name in enumerate(names)]
+    lines.append("    return {")
+    lines += [
+        f"        {name!r}: _{i} if _{i}.__class__ in _scalars else _convert(_{i}),"
+        for i, name in enumerate(names)
+    ]
+    lines.append("    }")
+    namespace = {"_scalars": _JSON_SCALARS, "_convert": _to_json_value}
+    exec("\n".join(lines), namespace)
+    serializer = namespace["to_dict"]
+    serializer.__qualname__ = f"{cls.__qualname__}.to_dict"
+    return serializer
+
+
+@dataclass(slots=True)
 class TagUpdateMsg(DTO):
     datapoint_identifier: str
     value: Any
     quality: str = "good"
     timestamp: Optional[datetime.datetime] = None
     test: bool = False
+    # TagRegistry index of datapoint_identifier, set by the datapoint service; not serialized
+    tag_index: int = field(default=UNKNOWN_TAG, compare=False, metadata={"serialize": False})
 
     @classmethod
     def get_event_type(cls) -> EventType:
@@ -96,7 +286,7 @@ class TagUpdateMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RawTagUpdateMsg(DTO):
     datapoint_identifier: str
     value: Any
@@ -121,7 +311,7 @@ class RawTagUpdateMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SendCommandMsg(DTO):
     command_id: str
     datapoint_identifier: str
@@ -145,7 +335,7 @@ class SendCommandMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandFeedbackMsg(DTO):
     command_id: str
     datapoint_identifier: str
@@ -173,7 +363,7 @@ class CommandFeedbackMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RaiseAlarmMsg(DTO):
     datapoint_identifier: str
     rule_id: str
@@ -196,7 +386,7 @@ class RaiseAlarmMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class LowerAlarmMsg(DTO):
     datapoint_identifier: str
     rule_id: str
@@ -219,7 +409,7 @@ class LowerAlarmMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AckAlarmMsg(DTO):
     alarm_occurrence_id: str
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
@@ -241,7 +431,7 @@ class AckAlarmMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AlarmUpdateMsg(DTO):
     datapoint_identifier: str
     activation_time: datetime.datetime
@@ -284,7 +474,7 @@ class AlarmUpdateMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DriverConnectStatus(DTO):
     driver_name: str
     status: str
@@ -303,7 +493,7 @@ class DriverConnectStatus(DTO):
         return {"driver_name": self.driver_name, "status": self.status}
 
 
-@dataclass
+@dataclass(slots=True)
 class DriverConnectCommand(DTO):
     driver_name: str
     status: str  # e.g., "connect" or "disconnect"
@@ -322,7 +512,7 @@ class DriverConnectCommand(DTO):
         return {"driver_name": self.driver_name, "status": self.status}
 
 
-@dataclass
+@dataclass(slots=True)
 class StatusDTO:
     status: str
     reason: str
@@ -335,7 +525,7 @@ class StatusDTO:
         return self.status
 
 
-@dataclass
+@dataclass(slots=True)
 class DataFlowEventMsg(DTO):
     event_type: str
     source: str
@@ -364,7 +554,7 @@ class DataFlowEventMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AnimationUpdateMsg(DTO):
     svg_name: str
     element_id: str
@@ -394,7 +584,7 @@ class AnimationUpdateMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AnimationUpdateRequestMsg(DTO):
     datapoint_identifier: str
     quality: str
@@ -445,7 +635,7 @@ class AnimationUpdateRequestMsg(DTO):
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class ClientAlertMsg(DTO):
     message: str
     alert_type: str
@@ -472,7 +662,7 @@ class ClientAlertMsg(DTO):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ClientAlertFeedbackMsg(DTO):
     # track_id is inherited from DTO
     feedback: str  # e.g., "confirm" "cancel"
@@ -491,7 +681,7 @@ class ClientAlertFeedbackMsg(DTO):
         return {"feedback": self.feedback}
 
 
-@dataclass
+@dataclass(slots=True)
 class GisUpdateMsg(DTO):
     id: str
     latitude: float
@@ -25,6 +25,15 @@ class Rule:
     on_actions: List[str] = field(default_factory=list)
     off_condition: Optional[str] = None
     off_actions: List[str] = field(default_factory=list)
+    on_delay: float = 0  # seconds the rule must stay on before its on transition fires
+    off_delay: float = 0  # seconds the rule must stay off before its off transition fires
+    deadband: float = 0  # threshold rules: how far back past the limit the value turns them off
+
+
+@dataclass
+class DerivedTag:
+    name: str  # Driver@TAG, like any datapoint
+    expression: str  # over other tags, in the same syntax as rule conditions
 
 
 @dataclass
@@ -0,0 +1,242 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+A hierarchical timer wheel shared by everything that needs many pending timers (rule delays),
+driven by one asyncio task instead of one task (or loop.call_later handle) per timer.
+
+Time is counted in ticks of `resolution` seconds. Level 0 has a slot per tick for the next 256
+ticks; each higher level has 64 slots, each covering a whole rotation of the level below. A timer
+is put in the lowest level whose range holds its expiry; when a level's rotation completes, the
+next slot of the level above is cascaded down. Scheduling and cancelling are O(1) and a tick only
+touches the timers that expire on it, whatever the number of armed timers. Timers fire at the
+first tick at or after their due time, never before it.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_LEVEL0_BITS = 8
+_LEVEL_BITS = 6
+_LEVELS = 4  # 2**26 ticks: 77 days at 0.1 s ticks, later timers are cascaded down again
+
+
+class Timer:
+    """A scheduled callback, returned by TimerWheel.schedule."""
+
+    __slots__ = ("expires", "callback", "args", "_wheel", "_slot", "_level", "_seq")
+
+    def __init__(self, wheel: "TimerWheel", expires: int, callback, args, seq: int):
+        self.expires = expires  # tick
+        self.callback = callback
+        self.args = args
+        self._wheel = wheel
+        self._slot: Optional[Dict["Timer", None]] = None
+        self._level = 0
+        self._seq = seq
+
+    @property
+    def active(self) -> bool:
+        """True until the timer fires or is cancelled."""
+        return self._slot is not None
+
+    def cancel(self):
+        """Cancel the timer if it has not fired yet."""
+        if self._slot is not None:
+            del self._slot[self]
+            self._slot = None
+            self._wheel._counts[self._level] -= 1
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class TimerWheel:
+    _instance = None
+
+    def __init__(self, resolution: float = 0.1):
+        self.resolution = resolution
+        self._origin: Optional[float] = None
+        self._base = 0  # next tick to process
+        self._levels: List[List[Dict[Timer, None]]] = [
+            [{} for _ in range(1 << (_LEVEL0_BITS if level == 0 else _LEVEL_BITS))]
+            for level in range(_LEVELS)
+        ]
+        self._counts = [0] * _LEVELS  # armed timers per level
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._sleep: Optional[asyncio.Future] = None  # the driver task sleeping until _wake_tick
+        self._wake_tick = 0
+
+    @classmethod
+    def get_instance(cls) -> "TimerWheel":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls):
+        """Stop the driver task and drop the singleton (for testing)."""
+        if cls._instance is not None and cls._instance._task is not None:
+            cls._instance._task.cancel()
+        cls._instance = None
+
+    def __len__(self) -> int:
+        """Number of armed timers."""
+        return sum(self._counts)
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def schedule(
+        self, delay: float, callback: Callable[..., Any], *args, now: float = None
+    ) -> Timer:
+        """
+        Call callback(*args) in delay seconds (sync or async, awaited by the wheel's task).
+        now defaults to the event loop time; without a running loop the timers only fire
+        through run_due.
+        """
+        if now is None:
+            now = self._now()
+        if self._origin is None:
+            self._origin = now
+        # The first tick at or after the due time (less a rounding error)
+        expires = math.ceil((now + delay - self._origin) / self.resolution - 1e-9)
+        self._seq += 1
+        timer = Timer(self, max(expires, self._base), callback, args, self._seq)
+        self._insert(timer)
+        if self._sleep is not None and timer.expires < self._wake_tick:
+            _wake(self._sleep)
+        self._ensure_task()
+        return timer
+
+    def _insert(self, timer: Timer):
+        delta = timer.expires - self._base
+        if delta < (1 << _LEVEL0_BITS):
+            level = 0
+            slot = self._levels[0][timer.expires & ((1 << _LEVEL0_BITS) - 1)]
+        else:
+            level, shift = 1, _LEVEL0_BITS
+            while level < _LEVELS - 1 and delta >= 1 << (shift + _LEVEL_BITS):
+                level += 1
+                shift += _LEVEL_BITS
+            # Beyond the top level the timer goes to its furthest slot and is cascaded again
+            expires = min(timer.expires, self._base + (1 << (shift + _LEVEL_BITS)) - 1)
+            slot = self._levels[level][(expires >> shift) & ((1 << _LEVEL_BITS) - 1)]
+        slot[timer] = None
+        timer._slot = slot
+        timer._level = level
+        self._counts[level] += 1
+
+    def _cascade(self, level: int, index: int) -> int:
+        """Reinsert the timers of a slot of a higher level into the levels below it."""
+        slot = self._levels[level][index]
+        if slot:
+            self._levels[level][index] = {}
+            self._counts[level] -= len(slot)
+            for timer in slot:
+                self._insert(timer)
+        return index
+
+    def _next_event_tick(self) -> int:
+        """The next tick that expires or cascades timers (all ticks before it are empty)."""
+        if self._counts[0]:
+            return self._base
+        span, level = 1 << _LEVEL0_BITS, 1
+        while level < _LEVELS - 1 and not self._counts[level]:
+            span <<= _LEVEL_BITS
+            level += 1
+        return -(-self._base // span) * span
+
+    def _expire_until(self, tick: int) -> List[Timer]:
+        """Advance the wheel through tick, returning the timers that expired in due order."""
+        expired: List[Timer] = []
+        level0_mask = (1 << _LEVEL0_BITS) - 1
+        level_mask = (1 << _LEVEL_BITS) - 1
+        while self._base <= tick:
+            index = self._base & level0_mask
+            if index == 0:
+                level, shift = 1, _LEVEL0_BITS
+                while level < _LEVELS:
+                    if self._cascade(level, (self._base >> shift) & level_mask) != 0:
+                        break
+                    level += 1
+                    shift += _LEVEL_BITS
+            slot = self._levels[0][index]
+            if slot:
+                self._levels[0][index] = {}
+                self._counts[0] -= len(slot)
+                for timer in slot:
+                    timer._slot = None
+                expired.extend(slot)
+            self._base += 1
+            if not self._counts[0]:  # skip the ticks with nothing to expire or cascade
+                self._base = min(self._next_event_tick(), tick + 1)
+        if len(expired) > 1:
+            expired.sort(key=lambda timer: (timer.expires, timer._seq))
+        return expired
+
+    async def run_due(self, now: float = None) -> int:
+        """Fire the timers due at now (default: the event loop time). Returns how many fired."""
+        if now is None:
+            now = self._now()
+        if self._origin is None:
+            return 0
+        expired = self._expire_until(math.floor((now - self._origin) / self.resolution))
+        for timer in expired:
+            try:
+                result = timer.callback(*timer.args)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"[TimerWheel] Timer callback {timer.callback} failed: {e}")
+        return len(expired)
+
+    def _ensure_task(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        """
+        The single driver task: sleeps until the next tick with timers to expire or cascade,
+        woken earlier if a timer is scheduled before it.
+        """
+        loop = asyncio.get_running_loop()
+        while len(self):
+            self._wake_tick = self._next_event_tick()
+            delay = self._origin + self._wake_tick * self.resolution - loop.time()
+            if delay > 0:
+                self._sleep = loop.create_future()
+                # a little past the tick, so float rounding cannot wake it just before
+                handle = loop.call_later(delay + self.resolution * 1e-3, _wake, self._sleep)
+                try:
+                    await self._sleep
+                finally:
+                    handle.cancel()
+                    self._sleep = None
+            await self.run_due()
+        self._task = None
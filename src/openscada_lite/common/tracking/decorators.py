@@ -97,6 +97,22 @@ def publish_from_return_async(status: DataFlowStatus, source: Optional[str] = No
     return decorator
 
 
+def publish_from_batch_arg_async(status: DataFlowStatus, source: Optional[str] = None):
+    """Async from; first argument is a list of DTOs, each one is tracked."""
+
+    def decorator(func: AsyncFunc):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            result = await func(self, *args, **kwargs)
+            for dto in args[0] if args else ():
+                _publish(dto, source or self.__class__.__name__, status)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
 def publish_from_arg_sync(status: DataFlowStatus, source: Optional[str] = None):
     def decorator(func: SyncFunc):
         @wraps(func)
@@ -111,6 +127,22 @@ def publish_from_arg_sync(status: DataFlowStatus, source: Optional[str] = None):
     return decorator
 
 
+def publish_from_batch_arg_sync(status: DataFlowStatus, source: Optional[str] = None):
+    """Sync from; first argument is a list of DTOs, each one is tracked."""
+
+    def decorator(func: SyncFunc):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            result = func(self, *args, **kwargs)
+            for dto in args[0] if args else ():
+                _publish(dto, source or self.__class__.__name__, status)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
 def publish_from_return_sync(status: DataFlowStatus, source: Optional[str] = None):
     def decorator(func: SyncFunc):
         @wraps(func)
@@ -22,6 +22,8 @@ from openscada_lite.common.models.dtos import AckAlarmMsg, AlarmUpdateMsg, Statu
 
 
 class AlarmController(BaseController[AlarmUpdateMsg, AckAlarmMsg]):
+    urgent_live_feed = True
+
     def __init__(self, model: AlarmModel, socketio, module_name: str, router: APIRouter):
         super().__init__(model, socketio, AlarmUpdateMsg, AckAlarmMsg, module_name, router)
         self.model: AlarmModel = model
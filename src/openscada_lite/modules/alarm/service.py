@@ -14,7 +14,7 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
-import copy
+from dataclasses import replace
 from typing import Union
 from openscada_lite.common.tracking.tracking_types import DataFlowStatus
 from openscada_lite.common.tracking.decorators import publish_from_return_sync
@@ -76,13 +76,14 @@ class AlarmService(BaseService[Union[RaiseAlarmMsg, LowerAlarmMsg], AckAlarmMsg,
             msg_lower: LowerAlarmMsg = msg
             existing_alarm = Utils.get_latest_alarm(self.model, msg_lower.get_id())
             if existing_alarm:
-                existing_alarm.deactivation_time = msg_lower.timestamp
-                return existing_alarm
+                # Stored alarms are never mutated, so they can be published by reference
+                return replace(existing_alarm, deactivation_time=msg_lower.timestamp)
         raise ValueError("Unsupported message type for processing")
 
     async def handle_controller_message(self, data: AckAlarmMsg):
-        alarm = self.model.get(data.alarm_occurrence_id)
-        alarm.acknowledge_time = data.timestamp
+        alarm = replace(
+            self.model.get(data.alarm_occurrence_id), acknowledge_time=data.timestamp
+        )
         self.model.update(alarm)
         await self.event_bus.publish(alarm.get_event_type(), alarm)
         if self.controller:
@@ -90,5 +91,4 @@ class AlarmService(BaseService[Union[RaiseAlarmMsg, LowerAlarmMsg], AckAlarmMsg,
 
     # Publish alarm updates to the bus in case another service wants to listen
     async def on_model_accepted_bus_update(self, msg: AlarmUpdateMsg):
-        updated = copy.deepcopy(msg)
-        await self.event_bus.publish(EventType.ALARM_UPDATE, updated)
+        await self.event_bus.publish(EventType.ALARM_UPDATE, msg)
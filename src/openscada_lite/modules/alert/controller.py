@@ -21,6 +21,8 @@ from openscada_lite.common.models.dtos import ClientAlertFeedbackMsg, ClientAler
 
 
 class AlertController(BaseController[ClientAlertMsg, ClientAlertFeedbackMsg]):
+    urgent_live_feed = True
+
     def __init__(self, model, socketio, module_name: str, router: APIRouter):
         super().__init__(
             model, socketio, ClientAlertMsg, ClientAlertFeedbackMsg, module_name, router
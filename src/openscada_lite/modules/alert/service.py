@@ -15,6 +15,7 @@
 # -----------------------------------------------------------------------------
 
 # communications_service.py
+from dataclasses import replace
 from openscada_lite.modules.alert.controller import AlertController
 from openscada_lite.common.tracking.decorators import publish_from_arg_async
 from openscada_lite.common.tracking.tracking_types import DataFlowStatus
@@ -49,7 +50,7 @@ class AlertService(BaseService[ClientAlertMsg, ClientAlertFeedbackMsg, ClientAle
 
         # If it was stored (confirm_cancel), publish ClientAlertMsg with show=False
         if alert_msg and getattr(alert_msg, "alert_type", None) == "confirm_cancel":
-            hide_msg = ClientAlertMsg(**{**alert_msg.__dict__, "show": False})
+            hide_msg = replace(alert_msg, show=False)
             self.controller.publish(hide_msg)
             if getattr(data, "feedback", None) == "confirm":
                 # If command info present, send command to bus
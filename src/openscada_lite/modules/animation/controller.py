@@ -73,6 +73,10 @@ class AnimationController(BaseController[AnimationUpdateMsg, AnimationUpdateRequ
                 return FileResponse(file, media_type="text/plain")  # Ensure correct media type
             return JSONResponse(content={"error": "File not found"}, status_code=404)
 
+    def get_subscription_key(self, msg: AnimationUpdateMsg) -> str:
+        # Screens subscribe to the SVGs they show
+        return msg.svg_name
+
     def validate_request_data(self, data: AnimationUpdateRequestMsg) -> AnimationUpdateRequestMsg:
         # You could also return a StatusDTO if invalid
         return data
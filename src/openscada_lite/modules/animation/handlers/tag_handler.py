@@ -24,7 +24,7 @@ class TagHandler:
 
     def handle(self, msg, service):
         updates = []
-        mappings = service.datapoint_map.get(msg.datapoint_identifier, [])
+        mappings = service.tag_mappings(msg)
         if not mappings:
             return updates
 
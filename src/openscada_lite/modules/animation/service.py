@@ -27,6 +27,7 @@ from openscada_lite.common.models.dtos import (
     TagUpdateMsg,
 )
 from openscada_lite.common.config.config import Config
+from openscada_lite.common.config.tag_registry import TagIndex, TagRegistry
 from .handlers.tag_handler import TagHandler
 from .handlers.alarm_handler import AlarmHandler
 from .handlers.connection_handler import ConnectionHandler
@@ -49,6 +50,8 @@ class AnimationService(
 
     DURATION_DEFAULT = 0.5
 
+    coalesce_bus_updates = True
+
     def __init__(self, event_bus, model, controller):
         super().__init__(
             event_bus,
@@ -61,6 +64,7 @@ class AnimationService(
         config = Config.get_instance()
         self.animations = config.get_animations()
         self.datapoint_map = config.get_animation_datapoint_map()
+        self._tag_mappings = TagIndex(TagRegistry.get_instance(config), self.datapoint_map, [])
 
         # register handlers
         self.handlers = [
@@ -127,10 +131,14 @@ class AnimationService(
         for anim in animations:
             self.controller.publish(anim)
 
+    def tag_mappings(self, msg: TagUpdateMsg) -> list:
+        """The (svg_name, element_id, animation_type) mappings of the tag, by tag index."""
+        return self._tag_mappings.get(msg.tag_index, msg.datapoint_identifier)
+
     def should_accept_update(self, msg) -> bool:
         # Accept TagUpdateMsg if there's a configured animation for that datapoint
         if isinstance(msg, TagUpdateMsg):
-            return msg.datapoint_identifier in self.datapoint_map
+            return bool(self.tag_mappings(msg))
         return True
 
     def process_single_entry(self, entry: AnimationEntry, value, quality):
@@ -15,21 +15,30 @@
 # -----------------------------------------------------------------------------
 from abc import ABC, abstractmethod
 import asyncio
+from collections import defaultdict
+from fnmatch import fnmatchcase
+from functools import partial
+from itertools import count
 import threading
-from typing import Generic, TypeVar, Optional, Type, Union
+import time
+from typing import Any, Dict, Generic, List, Set, Tuple, TypeVar, Optional, Type, Union
+from weakref import WeakValueDictionary
 from fastapi import APIRouter, Request
 from socketio import AsyncServer
+from openscada_lite.common.config.config import Config
 from openscada_lite.modules.security.service import SecurityService
 from openscada_lite.modules.base.base_model import BaseModel
 from openscada_lite.modules.base.base_service import BaseService
 from openscada_lite.common.models.dtos import StatusDTO
 from openscada_lite.common.tracking.decorators import (
     publish_from_arg_sync,
+    publish_from_batch_arg_sync,
     publish_route_async,
 )
 from openscada_lite.common.tracking.tracking_types import DataFlowStatus
 from openscada_lite.common.utils.SecurityUtils import verify_jwt
 from openscada_lite.common.utils.ResponseUtils import make_response
+from openscada_lite.common.utils.WireUtils import WIRE_FORMATS, encode_items
 
 import logging
 
@@ -38,6 +47,13 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")  # Outgoing message type (to client)
 U = TypeVar("U")  # Request data type (from client)
 
+# Subscription keys whose matching filters are remembered before the index starts over
+MAX_INDEXED_KEYS = 100000
+
+# Live feed batching defaults, overridable per module with "live_feed" in the module config
+DEFAULT_MAX_BATCH = 1000  # buffered messages that trigger an immediate flush
+DEFAULT_IDLE_GAP = 0.1  # seconds without new messages after which the batch is sent
+
 
 class BaseController(ABC, Generic[T, U]):
     """
@@ -49,6 +65,19 @@ class BaseController(ABC, Generic[T, U]):
 
     service: Optional["BaseService[T, U]"]
 
+    # Messages of this controller are sent as soon as they are published (commands, alarms)
+    urgent_live_feed = False
+
+    # Only the latest message per get_id() is kept in a batch; event streams (tracking) opt out
+    dedup_live_feed = True
+
+    # Whether the module may run in a worker process. Its live feed and HTTP routes are only
+    # served by the main process, so only modules whose work goes out over the bus opt in.
+    runs_in_worker = False
+
+    # Every controller by base_event, for the live feed metrics
+    live_feeds: "WeakValueDictionary[str, BaseController]" = WeakValueDictionary()
+
     def __init__(
         self,
         model: BaseModel,
@@ -57,7 +86,7 @@ class BaseController(ABC, Generic[T, U]):
         u_cls: Optional[Type[U]],
         base_event: str,
         router: APIRouter,
-        batch_interval: float = 1.0,  # seconds
+        batch_interval: float = 1.0,  # seconds, longest a message waits in the batch
     ):
         self.model = model
         self.socketio = socketio
@@ -67,13 +96,59 @@ class BaseController(ABC, Generic[T, U]):
         self.room = f"{base_event}_room"
         self.service = None
         self.router = router
+        # Clients being sent their initial state; live batches wait until they are in the room
         self._initializing_clients = set()
 
         # --- Async batching ---
-        self._batch_buffer = []
+        # A batch is sent when it reaches max_batch messages, when its oldest message has
+        # waited max_delay, or when no message came for idle_gap; urgent feeds send at once.
+        feed_config = Config.get_instance().get_module_config(base_event).get("live_feed", {})
+        # buffer key (get_id(), or a sequence number without dedup) -> (subscription key, dict)
+        self._batch_buffer: Dict[Any, Tuple[Any, dict]] = {}
+        # Model version once the buffered messages are applied, sent after the batch so a
+        # reconnecting client resumes from it
+        self._batch_version: Optional[int] = None
         self._batch_lock = threading.Lock()
-        self._batch_interval = batch_interval
+        self._batch_interval = feed_config.get("max_delay", batch_interval)
+        self._max_batch = feed_config.get("max_batch", DEFAULT_MAX_BATCH)
+        self._idle_gap = feed_config.get("idle_gap", DEFAULT_IDLE_GAP)
+        self._urgent = feed_config.get("urgent", self.urgent_live_feed)
+        self._dedup = feed_config.get("dedup", self.dedup_live_feed)
+        self._sequence = count()
+        self._wire_format = feed_config.get("wire_format", "json")
+        if self._wire_format not in WIRE_FORMATS:
+            logger.warning(
+                f"[{base_event}] Unknown live feed wire_format {self._wire_format}, using json."
+            )
+            self._wire_format = "json"
+        # (epoch, version) and encoded payload of the last unfiltered initial state
+        self._encoded_state: Optional[Tuple[Tuple[str, int], Any]] = None
+        self._first_buffered_at: Optional[float] = None
+        self._last_buffered_at = 0.0
+        self._flush_reason: Optional[str] = None  # set when the batch must go out now
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._batch_task_started = False
+        self._feed_stats = {
+            "batches": 0,
+            "messages": 0,
+            "superseded": 0,  # replaced in the buffer by a newer message with the same id
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+            "last_delay": 0.0,
+            "max_delay": 0.0,
+            "total_delay": 0.0,
+            "flushes": {"size": 0, "deadline": 0, "idle": 0, "urgent": 0},
+        }
+        BaseController.live_feeds[base_event] = self
+
+        # --- Filtered subscriptions ---
+        # Clients that subscribe with a filter get their own emits instead of joining the room.
+        # sid -> filter (tuple of patterns) and filter -> sids sharing it
+        self._sid_filters: Dict[str, Tuple[str, ...]] = {}
+        self._filter_sids: Dict[Tuple[str, ...], Set[str]] = {}
+        # subscription key -> filters matching it, filled in as keys show up in batches
+        self._key_filters: Dict[Any, List[Tuple[str, ...]]] = {}
 
         # Register WebSocket events
         self.register_socketio()
@@ -93,57 +168,281 @@ class BaseController(ABC, Generic[T, U]):
     # ---------------------------------------------------------------------
     def register_socketio(self):
         @self.socketio.on(f"{self.base_event}_subscribe_live_feed")
-        async def _subscribe_handler(sid):
-            await self.handle_subscribe_live_feed(sid)
+        async def _subscribe_handler(sid, data=None):
+            await self.handle_subscribe_live_feed(sid, data)
 
-    async def handle_subscribe_live_feed(self, sid):
+    async def handle_subscribe_live_feed(self, sid, data: Optional[dict] = None):
+        """
+        Send the client the current state, then join it to the live feed room.
+        A reconnecting client can pass the {"epoch", "version"} of its last
+        {base_event}_state_version (sent after the initial state and after every live batch) to
+        only get what changed since, as {base_event}_resume_state: the items updated and the
+        last state of the items removed.
+        With a "filter" (list of fnmatch patterns, e.g. ["WaterTank@*"]) the client only gets
+        the messages whose get_subscription_key matches one of them.
+        """
         logger.debug(f"[{self.base_event}] ******* Client subscribed to live feed: {sid}")
         self._initializing_clients.add(sid)
-        all_msgs = self.model.get_all()
-        sorted_msgs = sorted(all_msgs.values(), key=lambda v: v.get_id())
-        logger.debug(
-            f"[{self.base_event}] Sending initial "
-            f"state to {self.base_event}, {len(sorted_msgs)} items."
-        )
-        await self.socketio.enter_room(sid, self.room)
+        try:
+            await self._send_live_feed_state(sid, data)
+        finally:
+            self._initializing_clients.discard(sid)
+            if not self._initializing_clients and self._batch_buffer:
+                self._wake_batch_worker()  # send what was published meanwhile
+
+    async def _send_live_feed_state(self, sid, data: Optional[dict]):
+        resume = data if isinstance(data, dict) else {}
+        live_filter = tuple(str(pattern) for pattern in resume.get("filter") or ())
+        predicate = partial(self._accepts, live_filter) if live_filter else None
+        version = self.model.version
+        changes = None
+        if resume.get("epoch") == self.model.epoch and isinstance(resume.get("version"), int):
+            changes = self.model.get_changes_since(resume["version"], predicate)
+        if changes is None:
+            version, payload = self._encoded_initial_state(predicate)
+            event = f"{self.base_event}_initial_state"
+        else:
+            updates, removed = changes
+            event = f"{self.base_event}_resume_state"
+            payload = {"updates": self.encode_items(updates), "removed": self.encode_items(removed)}
+        logger.debug(f"[{self.base_event}] Sending {event} to {sid} at version {version}.")
+        self._set_filter(sid, live_filter)
+        if live_filter:
+            await self.socketio.leave_room(sid, self.room)
+        else:
+            await self.socketio.enter_room(sid, self.room)
+        await self.socketio.emit(event, payload, to=sid)
+        await self._emit_state_version(version, to=sid)
+
+    async def _emit_state_version(self, version: int, **recipients):
         await self.socketio.emit(
-            f"{self.base_event}_initial_state",
-            [v.to_dict() for v in sorted_msgs],
-            room=self.room,
+            f"{self.base_event}_state_version",
+            {"epoch": self.model.epoch, "version": version},
+            **recipients,
         )
-        self._initializing_clients.discard(sid)
+
+    def encode_items(self, items: List[dict]) -> Any:
+        """The live feed payload for to_dict() items, in the configured wire format."""
+        return encode_items(items, self._wire_format)
+
+    def _encoded_initial_state(self, predicate) -> Tuple[int, Any]:
+        """Version and encoded state; the unfiltered one is encoded once per model version."""
+        version, state = self.model.get_state_dicts(predicate)
+        if predicate is not None:
+            return version, self.encode_items(state)
+        stamp = (self.model.epoch, version)
+        if self._encoded_state is None or self._encoded_state[0] != stamp:
+            self._encoded_state = (stamp, self.encode_items(state))
+        return version, self._encoded_state[1]
+
+    def get_subscription_key(self, msg: T) -> Any:
+        """
+        What live feed filters are matched against, the message id by default. Override for
+        coarser subscriptions (e.g. the SVG an animation belongs to).
+        """
+        return msg.get_id()
+
+    @staticmethod
+    def _matches(live_filter: Tuple[str, ...], key: Any) -> bool:
+        key = str(key)
+        return any(fnmatchcase(key, pattern) for pattern in live_filter)
+
+    def _accepts(self, live_filter: Tuple[str, ...], msg: T) -> bool:
+        return self._matches(live_filter, self.get_subscription_key(msg))
+
+    def _set_filter(self, sid: str, live_filter: Tuple[str, ...]):
+        previous = self._sid_filters.pop(sid, None)
+        if previous == live_filter:
+            if live_filter:
+                self._sid_filters[sid] = live_filter
+            return
+        if previous is not None:
+            self._filter_sids[previous].discard(sid)
+            if not self._filter_sids[previous]:
+                del self._filter_sids[previous]
+                self._key_filters.clear()
+        if live_filter:
+            self._sid_filters[sid] = live_filter
+            if live_filter not in self._filter_sids:
+                self._filter_sids[live_filter] = set()
+                self._key_filters.clear()
+            self._filter_sids[live_filter].add(sid)
+
+    def _filters_of(self, key: Any) -> List[Tuple[str, ...]]:
+        filters = self._key_filters.get(key)
+        if filters is None:
+            if len(self._key_filters) >= MAX_INDEXED_KEYS:
+                self._key_filters.clear()
+            filters = [f for f in self._filter_sids if self._matches(f, key)]
+            self._key_filters[key] = filters
+        return filters
+
+    def _forget_disconnected(self):
+        manager = self.socketio.manager
+        for sid in list(self._sid_filters):
+            if not manager.is_connected(sid, "/"):
+                self._set_filter(sid, ())
+
+    def _room_has_clients(self) -> bool:
+        return next(iter(self.socketio.manager.get_participants("/", self.room)), None) is not None
 
     @publish_from_arg_sync(status=DataFlowStatus.FORWARDED)
     def publish(self, msg: T):
         logger.debug(f"[{self.base_event}] Publishing message: {msg}")
         """Buffer messages to be sent in batch."""
-        if self._initializing_clients:
+        item = (self.get_subscription_key(msg), msg.to_dict())
+        with self._batch_lock:
+            self._buffer_item(msg, item)
+            buffered = len(self._batch_buffer)
+        self._on_buffered(buffered)
+
+    @publish_from_batch_arg_sync(status=DataFlowStatus.FORWARDED)
+    def publish_many(self, msgs: List[T]):
+        """Buffer a whole batch of messages to be sent with the next emit."""
+        if not msgs:
             return
+        items = [(msg, (self.get_subscription_key(msg), msg.to_dict())) for msg in msgs]
         with self._batch_lock:
-            self._batch_buffer.append(msg.to_dict())
+            for msg, item in items:
+                self._buffer_item(msg, item)
+            buffered = len(self._batch_buffer)
+        self._on_buffered(buffered)
+
+    def _buffer_item(self, msg: T, item: Tuple[Any, dict]):
+        """Add an item to the batch, replacing a buffered one of the same id. Hold _batch_lock."""
+        key = msg.get_id() if self._dedup else next(self._sequence)
+        if key in self._batch_buffer:
+            self._feed_stats["superseded"] += 1
+        self._batch_buffer[key] = item
+        self._batch_version = self.model.version
+
+    def _on_buffered(self, buffered: int):
         if not self._batch_task_started:
             self._start_batch_task()
+        now = time.monotonic()
+        self._last_buffered_at = now
+        if self._first_buffered_at is None:
+            self._first_buffered_at = now
+            self._wake_batch_worker()  # start timing the new batch
+        if self._flush_reason is None:
+            if self._urgent:
+                self._flush_reason = "urgent"
+                self._wake_batch_worker()
+            elif buffered >= self._max_batch:
+                self._flush_reason = "size"
+                self._wake_batch_worker()
+
+    def _wake_batch_worker(self):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
 
     def _start_batch_task(self):
         """Schedule async batch emitter in event loop."""
-        loop = asyncio.get_event_loop()
-        loop.create_task(self._batch_worker())
+        self._loop = asyncio.get_event_loop()
+        self._wake = asyncio.Event()
+        self._loop.create_task(self._batch_worker())
         self._batch_task_started = True
 
     async def _batch_worker(self):
         while True:
-            await asyncio.sleep(self._batch_interval)
-            buffer_copy = []
+            reason = await self._next_flush()
             with self._batch_lock:
-                if self._batch_buffer:
-                    buffer_copy = self._batch_buffer.copy()
-                    self._batch_buffer.clear()
+                buffer_copy = list(self._batch_buffer.values())
+                self._batch_buffer = {}
+                version = self._batch_version
+                self._batch_version = None
+                first_buffered_at = self._first_buffered_at
+                self._first_buffered_at = None
+                self._flush_reason = None
             if buffer_copy:
-                await self.socketio.emit(
-                    f"{self.base_event}_{self.t_cls.__name__.lower()}",
-                    buffer_copy,
-                    room=self.room,
-                )
+                self._record_batch(len(buffer_copy), time.monotonic() - first_buffered_at, reason)
+                await self._emit_batch(buffer_copy, version)
+
+    async def _next_flush(self) -> str:
+        """
+        Wait until the buffered batch is due and return why. A batch is held while clients are
+        being sent their initial state, which may predate it, until they have joined the room.
+        """
+        while True:
+            timeout = None
+            if self._initializing_clients:
+                pass  # woken by handle_subscribe_live_feed once they are all in
+            elif self._flush_reason is not None:
+                return self._flush_reason
+            elif self._first_buffered_at is not None:
+                now = time.monotonic()
+                deadline = self._first_buffered_at + self._batch_interval
+                idle_at = self._last_buffered_at + self._idle_gap
+                if now >= deadline:
+                    return "deadline"
+                if now >= idle_at:
+                    return "idle"
+                timeout = min(deadline, idle_at) - now
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _record_batch(self, size: int, delay: float, reason: str):
+        stats = self._feed_stats
+        stats["batches"] += 1
+        stats["messages"] += size
+        stats["last_batch_size"] = size
+        stats["max_batch_size"] = max(stats["max_batch_size"], size)
+        stats["last_delay"] = delay
+        stats["max_delay"] = max(stats["max_delay"], delay)
+        stats["total_delay"] += delay
+        stats["flushes"][reason] += 1
+
+    def get_feed_metrics(self) -> dict:
+        """Batch sizes, queueing delay (seconds the oldest message waited) and flush reasons."""
+        stats = dict(self._feed_stats, flushes=dict(self._feed_stats["flushes"]))
+        batches = stats["batches"]
+        stats["mean_batch_size"] = stats["messages"] / batches if batches else 0.0
+        stats["mean_delay"] = stats.pop("total_delay") / batches if batches else 0.0
+        stats["buffered"] = len(self._batch_buffer)
+        return stats
+
+    async def _emit_batch(self, batch: List[Tuple[Any, dict]], version: Optional[int] = None):
+        """
+        Emit a batch to the room, and to every filter only the items its clients asked for,
+        then the model version the clients are at (filtered clients too: what they asked for
+        is up to date).
+        """
+        event = f"{self.base_event}_{self.t_cls.__name__.lower()}"
+        if not self._filter_sids:
+            await self.socketio.emit(
+                event, self.encode_items([item for _, item in batch]), room=self.room
+            )
+            if version is not None:
+                await self._emit_state_version(version, room=self.room)
+            return
+        self._forget_disconnected()
+        if self._room_has_clients():
+            await self.socketio.emit(
+                event, self.encode_items([item for _, item in batch]), room=self.room
+            )
+            if version is not None:
+                await self._emit_state_version(version, room=self.room)
+        per_filter = defaultdict(list)
+        for key, item in batch:
+            for live_filter in self._filters_of(key):
+                per_filter[live_filter].append(item)
+        for live_filter, items in per_filter.items():
+            sids = self._filter_sids.get(live_filter)
+            if sids:
+                await self.socketio.emit(event, self.encode_items(items), to=sorted(sids))
+        if version is not None:
+            sids = sorted(sid for group in self._filter_sids.values() for sid in group)
+            if sids:
+                await self._emit_state_version(version, to=sids)
 
     # ---------------------------------------------------------------------
     # HTTP endpoints via APIRouter
@@ -14,14 +14,160 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
+from collections import OrderedDict
 import copy
-from typing import TypeVar, Generic, Dict, Optional
+from typing import Any, Callable, TypeVar, Generic, Dict, List, Optional, Tuple
 from abc import ABC
+import uuid
 
 from openscada_lite.common.models.dtos import DTO
 
 T = TypeVar("T", bound=DTO)
 
+_MISSING = object()
+
+
+class VersionedStore(OrderedDict):
+    """
+    Store of id -> DTO that numbers every change (insert, replace or removal), so readers can
+    ask what changed since a version instead of copying everything.
+    It also caches the serialized form of its items for the initial state of live feeds.
+    Changes must go through the store: a DTO modified in place is only seen again once it is
+    stored anew (as BaseModel.update does).
+    """
+
+    MAX_REMOVED = 10000  # removals remembered for get_changes_since
+
+    def __init__(self):
+        super().__init__()
+        # Identifies this store: versions of another store (e.g. before a restart) mean nothing
+        self.epoch = uuid.uuid4().hex
+        self.version = 0
+        # Oldest version get_changes_since can answer for
+        self.resumable_from = 0
+        # id -> version of its last change, oldest first; removed ids stay as tombstones
+        self._changes: "OrderedDict[Any, int]" = OrderedDict()
+        self._removed = 0
+        # id -> the item it held when it was removed, for as long as its tombstone is kept
+        self._tombstones: Dict[Any, Any] = {}
+        self._dicts: Dict[Any, dict] = {}
+        self._order: Optional[List[Any]] = None
+        self._state: Optional[Tuple[int, List[dict]]] = None
+
+    # The dict methods below are the only ways of changing the store, each one records it
+
+    def __setitem__(self, key, value):
+        is_new = not super().__contains__(key)
+        super().__setitem__(key, value)
+        self._record(key, is_new=is_new)
+
+    def __delitem__(self, key):
+        value = super().__getitem__(key)
+        super().__delitem__(key)
+        self._record(key, removed=value)
+
+    def pop(self, key, default=_MISSING):
+        if not super().__contains__(key):
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = super().pop(key)
+        self._record(key, removed=value)
+        return value
+
+    def popitem(self, last: bool = True):
+        key, value = super().popitem(last=last)
+        self._record(key, removed=value)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if not super().__contains__(key):
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        for key in list(self.keys()):
+            del self[key]
+
+    def _record(self, key, is_new: bool = False, removed: Any = _MISSING):
+        """Number a change of key; removed is the item a removal took out of the store."""
+        self.version += 1
+        if self._changes.pop(key, None) is not None and is_new:
+            self._removed -= 1  # a removed id is back, its tombstone goes
+            del self._tombstones[key]
+        self._changes[key] = self.version
+        self._dicts.pop(key, None)
+        self._state = None
+        if is_new or removed is not _MISSING:
+            self._order = None
+        if removed is not _MISSING:
+            self._tombstones[key] = removed
+            self._removed += 1
+            if self._removed > self.MAX_REMOVED:
+                self._forget_removed()
+
+    def _forget_removed(self):
+        # Drop the oldest half of the tombstones; older versions can no longer be resumed from
+        for key, version in list(self._changes.items()):
+            if self._removed <= self.MAX_REMOVED // 2:
+                break
+            if key not in self:
+                del self._changes[key]
+                del self._tombstones[key]
+                self._removed -= 1
+                self.resumable_from = version
+
+    def _dict(self, key) -> dict:
+        item = self._dicts.get(key)
+        if item is None:
+            item = self._dicts[key] = self[key].to_dict()
+        return item
+
+    def _id_of(self, key) -> Any:
+        """get_id() of the item stored under key, what the state is sorted by."""
+        return self[key].get_id()
+
+    def get_state_dicts(
+        self, predicate: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[int, List[dict]]:
+        """
+        The version and the to_dict() of every item sorted by id (only those predicate accepts,
+        when given). The full list is cached until a change.
+        """
+        if self._order is None:
+            self._order = sorted(self.keys(), key=self._id_of)
+        if predicate is not None:
+            return self.version, [self._dict(key) for key in self._order if predicate(self[key])]
+        if self._state is None:
+            self._state = (self.version, [self._dict(key) for key in self._order])
+        return self._state
+
+    def get_changes_since(
+        self, version: int, predicate: Optional[Callable[[Any], bool]] = None
+    ) -> Optional[Tuple[List[dict], List[dict]]]:
+        """
+        The to_dict() of the items changed after version (only those predicate accepts, when
+        given) and the last to_dict() of the items removed since, so clients can find them
+        under their own keys, or None when the version cannot be resumed from or a full state
+        is cheaper.
+        """
+        if version < self.resumable_from or version > self.version:
+            return None
+        changed = []
+        for key in reversed(self._changes):
+            if self._changes[key] <= version:
+                break
+            changed.append(key)
+            if len(changed) > len(self) // 2:
+                return None
+        updates, removed = [], []
+        for key in reversed(changed):
+            if key not in self:
+                removed.append(self._tombstones[key].to_dict())
+            elif predicate is None or predicate(self[key]):
+                updates.append(self._dict(key))
+        return updates, removed
+
 
 class BaseModel(ABC, Generic[T]):
     """
@@ -29,10 +175,10 @@ class BaseModel(ABC, Generic[T]):
     """
 
     def __init__(self):
-        self._store: Dict[str, T] = {}
+        self._store: VersionedStore = VersionedStore()
 
     def reset(self):
-        self._store: Dict[str, T] = {}
+        self._store.clear()
 
     def update(self, msg: T):
         """
@@ -48,6 +194,28 @@ class BaseModel(ABC, Generic[T]):
 
     def get_all(self) -> Dict[str, T]:
         """
-        Retrieve all messages.
+        Retrieve all messages, as shallow copies the caller may modify.
+        Live feeds use the cached get_state_dicts() instead.
         """
-        return copy.deepcopy(self._store)
+        return {key: copy.copy(msg) for key, msg in self._store.items()}
+
+    @property
+    def epoch(self) -> str:
+        return self._store.epoch
+
+    @property
+    def version(self) -> int:
+        """Number of changes made to the model, grows with every update or removal."""
+        return self._store.version
+
+    def get_state_dicts(
+        self, predicate: Optional[Callable[[T], bool]] = None
+    ) -> Tuple[int, List[dict]]:
+        """Serialized state sorted by id and the version it reflects (cached until a change)."""
+        return self._store.get_state_dicts(predicate)
+
+    def get_changes_since(
+        self, version: int, predicate: Optional[Callable[[T], bool]] = None
+    ) -> Optional[Tuple[List[dict], List[dict]]]:
+        """Serialized messages changed and removed after version, None if not available."""
+        return self._store.get_changes_since(version, predicate)
@@ -45,6 +45,10 @@ class BaseService(ABC, Generic[T, U, V]):
     and controller messages of type U.
     """
 
+    # Only the current state matters to this service: bus updates still waiting for it are
+    # replaced by newer ones with the same id (see EventBus.subscribe(coalesce=...)).
+    coalesce_bus_updates = False
+
     def __init__(
         self,
         event_bus: EventBus,
@@ -72,7 +76,17 @@ class BaseService(ABC, Generic[T, U, V]):
         if t_cls is not None:
             for t_cls in self.t_cls_list:
                 if t_cls is not None:
-                    self.event_bus.subscribe(t_cls.get_event_type(), self.handle_bus_message)
+                    self.event_bus.subscribe(
+                        t_cls.get_event_type(),
+                        self.handle_bus_message,
+                        batch_callback=self.handle_bus_messages,
+                        coalesce=self.coalesce_bus_updates,
+                    )
+
+    @property
+    def module_name(self) -> str:
+        """Name of the module folder, e.g. "tracking" for modules/tracking/service.py."""
+        return type(self).__module__.split(".")[-2]
 
     # @publish_from_arg_async(status=DataFlowStatus.RECEIVED)
     async def handle_bus_message(self, data: T):
@@ -98,6 +112,35 @@ class BaseService(ABC, Generic[T, U, V]):
             else:
                 logger.warning(f"No controller to publish {processed_msg} to view")
 
+    async def handle_bus_messages(self, batch: List[T]):
+        """
+        Handle a batch published with EventBus.publish_many in one pass: the model is updated
+        message by message, then the accepted messages are handed to
+        on_model_accepted_bus_updates and to the controller at once.
+        Services that override handle_bus_message keep their per-message behaviour.
+        """
+        if type(self).handle_bus_message is not BaseService.handle_bus_message:
+            for data in batch:
+                await self.handle_bus_message(data)
+            return
+        accepted = []
+        for data in batch:
+            if not self.should_accept_update(data):
+                continue
+            processed_msg = self.process_msg(data)
+            if processed_msg is None:
+                continue
+            for msg in processed_msg if isinstance(processed_msg, list) else [processed_msg]:
+                self.model.update(msg)
+                accepted.append(msg)
+        if not accepted:
+            return
+        await self.on_model_accepted_bus_updates(accepted)
+        if self.controller:
+            self.controller.publish_many(accepted)
+        else:
+            logger.warning(f"No controller to publish {len(accepted)} messages to view")
+
     @publish_from_arg_async(status=DataFlowStatus.RECEIVED)
     async def handle_controller_message(self, data: U):
         await self.event_bus.publish(self.u_cls.get_event_type(), data)
@@ -117,6 +160,14 @@ class BaseService(ABC, Generic[T, U, V]):
         """
         pass
 
+    async def on_model_accepted_bus_updates(self, msgs: List[V]):
+        """
+        Batch version of on_model_accepted_bus_update.
+        Override in subclass to handle the whole batch at once.
+        """
+        for msg in msgs:
+            await self.on_model_accepted_bus_update(msg)
+
     @abstractmethod
     def should_accept_update(self, msg: T) -> bool:
         """
@@ -21,6 +21,8 @@ from openscada_lite.common.models.dtos import CommandFeedbackMsg, SendCommandMsg
 
 
 class CommandController(BaseController[CommandFeedbackMsg, SendCommandMsg]):
+    urgent_live_feed = True
+
     def __init__(self, model, socketio, module_name: str, router: APIRouter):
         super().__init__(model, socketio, CommandFeedbackMsg, SendCommandMsg, module_name, router)
 
@@ -17,6 +17,7 @@
 import asyncio
 import json
 import datetime
+from dataclasses import replace
 from typing import Callable, List, Optional
 
 import paho.mqtt.client as mqtt
@@ -145,8 +146,9 @@ class MQTTTasmotaRelayDriver(DriverProtocol):
             relay_key = dp_name.replace("_CMD", "")
 
             desired_value = self._resolve_effective_value(relay_key, data.value)
-            # Mutate DTO so feedback reflects effective value consistently
-            data.value = desired_value
+            # Use a copy with the effective value so feedback reflects it consistently;
+            # the received DTO may be shared with other subscribers
+            data = replace(data, value=desired_value)
 
             # Simulate immediate feedback
             if self._feedback_listener:
@@ -198,8 +200,8 @@ class MQTTTasmotaRelayDriver(DriverProtocol):
         # Handle TOGGLE and casing via helper
         desired_value = self._resolve_effective_value(relay_key, data.value)
 
-        # Mutate the DTO so feedback reflects the effective value
-        data.value = desired_value
+        # Use a copy with the effective value so feedback reflects it
+        data = replace(data, value=desired_value)
 
         payload = desired_value
         if not isinstance(payload, str):
@@ -16,11 +16,15 @@
 import asyncio
 import datetime
 import inspect
+from dataclasses import replace
 from abc import ABC, abstractmethod
 from typing import Dict, List, Callable, Any, Optional
 
 from openscada_lite.common.config.config import Config
-from openscada_lite.common.tracking.decorators import publish_from_arg_async
+from openscada_lite.common.tracking.decorators import (
+    publish_from_arg_async,
+    publish_from_batch_arg_async,
+)
 from openscada_lite.common.tracking.tracking_types import DataFlowStatus
 from openscada_lite.common.models.dtos import (
     DriverConnectStatus,
@@ -41,6 +45,7 @@ class TestDriver(DriverProtocol, ABC):
         self._server_name = server_name
         self._tags: Dict[str, RawTagUpdateMsg] = {}
         self._value_callback: Callable[[RawTagUpdateMsg], Any] | None = None
+        self._values_callback: Callable[[List[RawTagUpdateMsg]], Any] | None = None
         self._communication_status_callback: Callable[[DriverConnectStatus], Any] | None = None
         self._command_feedback_callback: Callable[[CommandFeedbackMsg], Any] | None = None
         self._running = False
@@ -80,7 +85,7 @@ class TestDriver(DriverProtocol, ABC):
             tag.value = Config.get_instance().get_default_value(tag.datapoint_identifier)
             tag.timestamp = now
             tag.quality = "good"
-            await self._publish_value(tag)
+        await self._publish_all()
 
     # -------------------------
     # Subscriptions and listeners
@@ -98,6 +103,10 @@ class TestDriver(DriverProtocol, ABC):
     def register_value_listener(self, callback: Callable[[RawTagUpdateMsg], Any]):
         self._value_callback = callback
 
+    def register_values_listener(self, callback: Callable[[List[RawTagUpdateMsg]], Any]):
+        """Optional batch listener: a whole scan is delivered in a single call."""
+        self._values_callback = callback
+
     def register_communication_status_listener(
         self, callback: Callable[[DriverConnectStatus], Any]
     ):
@@ -252,8 +261,7 @@ class TestDriver(DriverProtocol, ABC):
         try:
             while self._running:
                 self._simulate_values()
-                for tag in self._tags.values():
-                    await self._publish_value(tag)
+                await self._publish_all()
                 logger.debug(f"[TEST] Published all tag values for {self._server_name}")
                 await asyncio.sleep(5)
                 logger.debug(f"[TEST] Simulation loop iteration complete for {self._server_name}")
@@ -275,11 +283,19 @@ class TestDriver(DriverProtocol, ABC):
 
     @publish_from_arg_async(status=DataFlowStatus.CREATED)
     async def _publish_value(self, tag: RawTagUpdateMsg):
-        await self._safe_invoke(self._value_callback, tag)
+        # Publish a snapshot: the driver keeps mutating its own tags between scans
+        await self._safe_invoke(self._value_callback, replace(tag))
 
     async def _publish_all(self):
-        for tag in self._tags.values():
-            await self._publish_value(tag)
+        if not self._values_callback:
+            for tag in self._tags.values():
+                await self._publish_value(tag)
+            return
+        await self._publish_values([replace(tag) for tag in self._tags.values()])
+
+    @publish_from_batch_arg_async(status=DataFlowStatus.CREATED)
+    async def _publish_values(self, tags: List[RawTagUpdateMsg]):
+        await self._safe_invoke(self._values_callback, tags)
 
     @abstractmethod
     async def _simulate_values(self):
@@ -14,7 +14,7 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
-from typing import Protocol
+from typing import List, Protocol
 from openscada_lite.common.models.dtos import (
     RawTagUpdateMsg,
     CommandFeedbackMsg,
@@ -24,5 +24,6 @@ from openscada_lite.common.models.dtos import (
 
 class CommunicationListener(Protocol):
     async def on_raw_tag_update(self, msg: RawTagUpdateMsg): ...
+    async def on_raw_tag_updates(self, msgs: List[RawTagUpdateMsg]): ...
     async def on_command_feedback(self, msg: CommandFeedbackMsg): ...
     async def on_driver_connect_status(self, msg: DriverConnectStatus): ...
@@ -14,7 +14,7 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
-from typing import Dict
+from typing import Dict, List
 from openscada_lite.modules.communication.drivers.test.test_driver import TestDriver
 from openscada_lite.modules.communication.manager.command_listener import (
     CommandListener,
@@ -23,7 +23,10 @@ from openscada_lite.modules.communication.manager.communication_listener import
     CommunicationListener,
 )
 from openscada_lite.common.tracking.tracking_types import DataFlowStatus
-from openscada_lite.common.tracking.decorators import publish_from_arg_async
+from openscada_lite.common.tracking.decorators import (
+    publish_from_arg_async,
+    publish_from_batch_arg_async,
+)
 from openscada_lite.common.models.dtos import (
     DriverConnectCommand,
     CommandFeedbackMsg,
@@ -37,6 +40,7 @@ from openscada_lite.common.models.entities import Datapoint
 from openscada_lite.modules.communication.drivers.driver_protocol import DriverProtocol
 from openscada_lite.modules.communication.drivers.server_protocol import ServerProtocol
 from openscada_lite.common.config.config import Config
+from openscada_lite.common.config.tag_registry import TagIndex, TagRegistry
 import datetime
 import logging
 from collections import defaultdict
@@ -101,9 +105,19 @@ class ConnectorManager:
                 full_id = f"{cfg['name']}@{dp.name}"
                 self.datapoint_to_drivers[full_id].add(driver_instance)
 
+        # Only server drivers are forwarded tag updates, look them up by tag index
+        server_drivers = {
+            full_id: [driver for driver in drivers if isinstance(driver, ServerProtocol)]
+            for full_id, drivers in self.datapoint_to_drivers.items()
+        }
+        self._server_drivers = TagIndex(TagRegistry.get_instance(self.config), server_drivers, [])
+
     async def init_drivers(self):
         for driver in self.driver_instances.values():
             driver.register_value_listener(self.emit_value)
+            # Optional batch hook: drivers that publish whole scans at once
+            if hasattr(driver, "register_values_listener"):
+                driver.register_values_listener(self.emit_values)
             driver.register_command_feedback(self.emit_command_feedback)
             driver.register_communication_status_listener(self.emit_communication_status)
             await self.emit_communication_status(
@@ -112,9 +126,8 @@ class ConnectorManager:
 
     async def forward_tag_update(self, msg: TagUpdateMsg):
         # Notify only drivers interested in this datapoint
-        for driver in self.datapoint_to_drivers.get(msg.datapoint_identifier, []):
-            if isinstance(driver, ServerProtocol):
-                await driver.handle_tag_update(msg)
+        for driver in self._server_drivers.get(msg.tag_index, msg.datapoint_identifier):
+            await driver.handle_tag_update(msg)
 
     def register_listener(self, listener: CommunicationListener):
         self.listener = listener
@@ -149,6 +162,10 @@ class ConnectorManager:
     async def emit_value(self, data: RawTagUpdateMsg):
         await self.listener.on_raw_tag_update(data) if self.listener else None
 
+    @publish_from_batch_arg_async(status=DataFlowStatus.RECEIVED)
+    async def emit_values(self, data: List[RawTagUpdateMsg]):
+        await self.listener.on_raw_tag_updates(data) if self.listener else None
+
     @publish_from_arg_async(status=DataFlowStatus.RECEIVED)
     async def emit_command_feedback(self, data: CommandFeedbackMsg):
         await self.listener.on_command_feedback(data) if self.listener else None
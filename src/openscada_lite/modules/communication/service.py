@@ -15,7 +15,7 @@
 # -----------------------------------------------------------------------------
 
 # communications_service.py
-from typing import Union
+from typing import List, Union
 from openscada_lite.common.tracking.decorators import publish_from_arg_async
 from openscada_lite.common.tracking.tracking_types import DataFlowStatus
 from openscada_lite.common.bus.event_types import EventType
@@ -72,6 +72,9 @@ class CommunicationService(
     async def on_raw_tag_update(self, msg: RawTagUpdateMsg):
         await self.event_bus.publish(EventType.RAW_TAG_UPDATE, msg)
 
+    async def on_raw_tag_updates(self, msgs: List[RawTagUpdateMsg]):
+        await self.event_bus.publish_many(EventType.RAW_TAG_UPDATE, msgs)
+
     async def on_command_feedback(self, msg: CommandFeedbackMsg):
         await self.event_bus.publish(EventType.COMMAND_FEEDBACK, msg)
 
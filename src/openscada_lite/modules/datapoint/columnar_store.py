@@ -0,0 +1,328 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Column store for DatapointModel with very large tag counts.
+
+Instead of one TagUpdateMsg per tag, each tag is a row of preallocated `array` columns
+(value, quality code, timestamp, test flag) plus its id and track_id. TagUpdateMsg objects
+are only built when an item is read (model.get, get_all); the live feed state is serialized
+straight from the columns. snapshot() copies the columns at once and bulk_update() writes
+many tags without building a DTO per tag. The version of each row's last change is a column
+too, so only removed tags are remembered one by one.
+"""
+
+from array import array
+from collections import OrderedDict
+import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from openscada_lite.common.models.dtos import TagUpdateMsg, new_track_id
+from openscada_lite.modules.base.base_model import VersionedStore
+
+# Kinds of the value column: what the number stored for the row stands for
+FLOAT, INT, BOOL, NONE, OBJECT = range(5)
+
+# Timestamps are stored as microseconds since this naive epoch
+EPOCH = datetime.datetime(1970, 1, 1)
+NO_TIMESTAMP = -(2**63)
+
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_NAN = float("nan")
+_EXACT_INT = 2**53  # larger ints do not survive a float column
+_MISSING = object()
+
+
+class TagColumns(NamedTuple):
+    """Copy of the columns at a version. Row i holds tag ids[i]; ids[i] is None for a free row."""
+
+    version: int
+    ids: List[Optional[str]]
+    values: array  # "d", NaN unless the kind is FLOAT, INT or BOOL
+    kinds: array  # "b", FLOAT, INT, BOOL, NONE or OBJECT
+    qualities: array  # "H", index into quality_names
+    quality_names: List[str]
+    timestamps: array  # "q", microseconds since EPOCH, NO_TIMESTAMP if None or not naive
+
+
+class ColumnarTagStore(VersionedStore):
+    """
+    VersionedStore of datapoint id -> TagUpdateMsg kept in columns; the underlying dict maps
+    each id to its row. Values that are not numbers, bools or None, and timestamps that are not
+    naive datetimes, are kept aside per row.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._ids: List[Optional[str]] = []
+        self._track_ids: List[Optional[str]] = []
+        self._values = array("d")
+        self._kinds = array("b")
+        self._qualities = array("H")
+        self._timestamps = array("q")
+        self._tests = array("b")
+        self._versions = array("q")  # version of the row's last change
+        # removed id -> (version of its removal, its last to_dict()), oldest first
+        self._tombstones: "OrderedDict[str, Tuple[int, dict]]" = OrderedDict()
+        self._objects: Dict[int, Any] = {}  # row -> value of kind OBJECT
+        self._other_timestamps: Dict[int, Any] = {}  # row -> timestamp not stored as micros
+        self._quality_names: List[str] = []
+        self._quality_codes: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        # Last timestamp serialized, updates often share theirs: (micros, isoformat)
+        self._last_iso: Tuple[int, Optional[str]] = (NO_TIMESTAMP, None)
+
+    # --- writes ---
+
+    def __setitem__(self, key, msg: TagUpdateMsg):
+        row = self._row_for(key)
+        self._write_value(row, msg.value)
+        self._qualities[row] = self._quality_code(msg.quality)
+        self._write_timestamp(row, msg.timestamp)
+        self._tests[row] = msg.test
+        self._track_ids[row] = msg.track_id
+        super().__setitem__(key, row)
+
+    def bulk_update(
+        self,
+        keys: Iterable[str],
+        values: Iterable[Any],
+        quality: str = "good",
+        timestamp: Optional[datetime.datetime] = None,
+    ):
+        """Store a value for each key, all with the same quality and timestamp."""
+        quality_code = self._quality_code(quality)
+        for key, value in zip(keys, values):
+            row = self._row_for(key)
+            self._write_value(row, value)
+            self._qualities[row] = quality_code
+            self._write_timestamp(row, timestamp)
+            self._tests[row] = False
+            self._track_ids[row] = new_track_id()
+            super().__setitem__(key, row)
+
+    def __delitem__(self, key):
+        row = dict.__getitem__(self, key)
+        super().__delitem__(key)
+        self._free(row)
+
+    def pop(self, key, default=_MISSING):
+        if key not in self:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        msg = self[key]
+        del self[key]
+        return msg
+
+    def popitem(self, last: bool = True):
+        if not self:
+            raise KeyError("popitem(): store is empty")
+        key = next(reversed(self)) if last else next(iter(self))
+        return key, self.pop(key)
+
+    def _row_for(self, key: str) -> int:
+        row = dict.get(self, key)
+        if row is not None:
+            return row
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._ids[row] = key
+            return row
+        self._ids.append(key)
+        self._track_ids.append(None)
+        self._values.append(_NAN)
+        self._kinds.append(NONE)
+        self._qualities.append(0)
+        self._timestamps.append(NO_TIMESTAMP)
+        self._tests.append(0)
+        self._versions.append(0)
+        return len(self._ids) - 1
+
+    def _free(self, row: int):
+        self._ids[row] = None
+        self._track_ids[row] = None
+        self._objects.pop(row, None)
+        self._other_timestamps.pop(row, None)
+        self._free_rows.append(row)
+
+    def _write_value(self, row: int, value: Any):
+        cls = value.__class__
+        if cls is float:
+            self._values[row] = value
+            self._kinds[row] = FLOAT
+        elif cls is bool:
+            self._values[row] = value
+            self._kinds[row] = BOOL
+        elif cls is int and -_EXACT_INT < value < _EXACT_INT:
+            self._values[row] = value
+            self._kinds[row] = INT
+        elif value is None:
+            self._values[row] = _NAN
+            self._kinds[row] = NONE
+        else:
+            self._values[row] = _NAN
+            self._kinds[row] = OBJECT
+            self._objects[row] = value
+            return
+        if self._objects:
+            self._objects.pop(row, None)
+
+    def _write_timestamp(self, row: int, timestamp: Any):
+        if timestamp.__class__ is datetime.datetime and timestamp.tzinfo is None:
+            self._timestamps[row] = (timestamp - EPOCH) // _MICROSECOND
+            if self._other_timestamps:
+                self._other_timestamps.pop(row, None)
+            return
+        self._timestamps[row] = NO_TIMESTAMP
+        if timestamp is None:
+            self._other_timestamps.pop(row, None)
+        else:
+            self._other_timestamps[row] = timestamp
+
+    def _record(self, key, is_new: bool = False, removed: Any = _MISSING):
+        """Number a change of key; removed is the row a removal took, not freed yet."""
+        self.version += 1
+        item = self._dicts.pop(key, None)
+        self._state = None
+        if is_new or removed is not _MISSING:
+            self._order = None
+        if removed is not _MISSING:
+            if item is None:
+                item = self._row_dict(key, removed)
+            self._tombstones[key] = (self.version, item)
+            if len(self._tombstones) > self.MAX_REMOVED:
+                # Drop the oldest half; older versions can no longer be resumed from
+                while len(self._tombstones) > self.MAX_REMOVED // 2:
+                    _, (self.resumable_from, _) = self._tombstones.popitem(last=False)
+            return
+        if is_new and self._tombstones:
+            self._tombstones.pop(key, None)
+        self._versions[dict.__getitem__(self, key)] = self.version
+
+    def _quality_code(self, quality: str) -> int:
+        code = self._quality_codes.get(quality)
+        if code is None:
+            code = self._quality_codes[quality] = len(self._quality_names)
+            self._quality_names.append(quality)
+        return code
+
+    # --- reads ---
+
+    def __getitem__(self, key) -> TagUpdateMsg:
+        return self._materialize(dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        row = dict.get(self, key)
+        return default if row is None else self._materialize(row)
+
+    def values(self) -> List[TagUpdateMsg]:
+        return [self._materialize(row) for row in OrderedDict.values(self)]
+
+    def items(self) -> List[Tuple[str, TagUpdateMsg]]:
+        return [(key, self._materialize(row)) for key, row in OrderedDict.items(self)]
+
+    def timestamp_of(self, key) -> Any:
+        """Timestamp of a tag without building its TagUpdateMsg, None if it is not stored."""
+        row = dict.get(self, key)
+        return None if row is None else self._timestamp(row)
+
+    def snapshot(self) -> TagColumns:
+        return TagColumns(
+            version=self.version,
+            ids=list(self._ids),
+            values=array("d", self._values),
+            kinds=array("b", self._kinds),
+            qualities=array("H", self._qualities),
+            quality_names=list(self._quality_names),
+            timestamps=array("q", self._timestamps),
+        )
+
+    def _value(self, row: int) -> Any:
+        kind = self._kinds[row]
+        if kind == FLOAT:
+            return self._values[row]
+        if kind == INT:
+            return int(self._values[row])
+        if kind == BOOL:
+            return bool(self._values[row])
+        if kind == NONE:
+            return None
+        return self._objects[row]
+
+    def _timestamp(self, row: int) -> Any:
+        micros = self._timestamps[row]
+        if micros == NO_TIMESTAMP:
+            return self._other_timestamps.get(row)
+        return EPOCH + datetime.timedelta(microseconds=micros)
+
+    def _materialize(self, row: int) -> TagUpdateMsg:
+        return TagUpdateMsg(
+            datapoint_identifier=self._ids[row],
+            value=self._value(row),
+            quality=self._quality_names[self._qualities[row]],
+            timestamp=self._timestamp(row),
+            test=bool(self._tests[row]),
+            track_id=self._track_ids[row],
+        )
+
+    def _dict(self, key) -> dict:
+        item = self._dicts.get(key)
+        if item is None:
+            item = self._dicts[key] = self._row_dict(key, dict.__getitem__(self, key))
+        return item
+
+    def _row_dict(self, key, row: int) -> dict:
+        if self._kinds[row] == OBJECT or row in self._other_timestamps:
+            return self._materialize(row).to_dict()
+        micros = self._timestamps[row]
+        if micros == NO_TIMESTAMP:  # timestamp None, the others are kept aside
+            iso = None
+        else:
+            if micros != self._last_iso[0]:
+                self._last_iso = (
+                    micros,
+                    (EPOCH + datetime.timedelta(microseconds=micros)).isoformat(),
+                )
+            iso = self._last_iso[1]
+        return {
+            "track_id": self._track_ids[row],
+            "datapoint_identifier": key,
+            "value": self._values[row] if self._kinds[row] == FLOAT else self._value(row),
+            "quality": self._quality_names[self._qualities[row]],
+            "timestamp": iso,
+            "test": self._tests[row] == 1,
+        }
+
+    def _id_of(self, key) -> Any:
+        return key
+
+    def get_changes_since(
+        self, version: int, predicate: Optional[Callable[[Any], bool]] = None
+    ) -> Optional[Tuple[List[dict], List[dict]]]:
+        if version < self.resumable_from or version > self.version:
+            return None
+        versions, ids = self._versions, self._ids
+        changed = [row for row in range(len(ids)) if versions[row] > version and ids[row]]
+        if len(changed) > len(self) // 2:
+            return None
+        changed.sort(key=versions.__getitem__)
+        updates = [
+            self._dict(ids[row])
+            for row in changed
+            if predicate is None or predicate(self._materialize(row))
+        ]
+        removed = [item for at, item in self._tombstones.values() if at > version]
+        return updates, removed
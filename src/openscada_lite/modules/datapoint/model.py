@@ -16,19 +16,27 @@
 
 # communications_model.py
 import datetime
+import itertools
+from typing import Any, Iterable, Optional
 from openscada_lite.common.models.dtos import TagUpdateMsg
 from openscada_lite.common.config.config import Config
+from openscada_lite.common.config.tag_registry import TagRegistry
 from openscada_lite.modules.base.base_model import BaseModel
+from openscada_lite.modules.datapoint.columnar_store import ColumnarTagStore, TagColumns
 
 
 class DatapointModel(BaseModel[TagUpdateMsg]):
     """
-    Stores the current state of all datapoints as TagUpdateMsg objects.
+    Stores the current state of all datapoints as TagUpdateMsg objects, or in columns with
+    "store": "columnar" in the datapoint module config (for very large tag counts).
     """
 
     def __init__(self):
         super().__init__()
-        self._allowed_tags = set(Config.get_instance().get_allowed_datapoint_identifiers())
+        config = Config.get_instance()
+        if config.get_module_config("datapoint").get("store") == "columnar":
+            self._store = ColumnarTagStore()
+        self.tag_registry = TagRegistry.get_instance(config)
         self.initial_load()
 
     def initial_load(self):
@@ -36,10 +44,47 @@ class DatapointModel(BaseModel[TagUpdateMsg]):
         Initializes all allowed tags with value=None, quality='unknown', and current timestamp.
         """
         now = datetime.datetime.now()
-        for tag_id in self._allowed_tags:
+        if isinstance(self._store, ColumnarTagStore):
+            self._store.bulk_update(
+                self.tag_registry.names, itertools.repeat(None), quality="unknown", timestamp=now
+            )
+            return
+        for tag_id in self.tag_registry.names:
             self._store[tag_id] = TagUpdateMsg(
                 datapoint_identifier=tag_id,
                 value=None,
                 quality="unknown",
                 timestamp=now,
             )
+
+    def get_timestamp(self, tag_id: str) -> Optional[Any]:
+        """Timestamp of the stored tag, None if it has none or is not stored."""
+        if isinstance(self._store, ColumnarTagStore):
+            return self._store.timestamp_of(tag_id)
+        msg = self._store.get(tag_id)
+        return msg.timestamp if msg else None
+
+    def bulk_update(
+        self,
+        tag_ids: Iterable[str],
+        values: Iterable[Any],
+        quality: str = "good",
+        timestamp: Optional[datetime.datetime] = None,
+    ):
+        """Store a value for each tag, all with the same quality and timestamp."""
+        if isinstance(self._store, ColumnarTagStore):
+            self._store.bulk_update(tag_ids, values, quality, timestamp)
+            return
+        for tag_id, value in zip(tag_ids, values):
+            self._store[tag_id] = TagUpdateMsg(
+                datapoint_identifier=tag_id, value=value, quality=quality, timestamp=timestamp
+            )
+
+    def snapshot(self) -> TagColumns:
+        """All tags as columns (values, qualities, timestamps), copied in one go when columnar."""
+        if isinstance(self._store, ColumnarTagStore):
+            return self._store.snapshot()
+        columns = ColumnarTagStore()
+        for tag_id, msg in self._store.items():
+            columns[tag_id] = msg
+        return columns.snapshot()._replace(version=self.version)
@@ -15,13 +15,14 @@
 # -----------------------------------------------------------------------------
 
 # datapoint_service.py
+from typing import List
 
 from openscada_lite.common.tracking.tracking_types import DataFlowStatus
 from openscada_lite.common.tracking.decorators import publish_from_return_sync
 from openscada_lite.modules.datapoint.utils import Utils
 from openscada_lite.common.bus.event_types import EventType
 from openscada_lite.modules.base.base_service import BaseService
-from openscada_lite.common.models.dtos import RawTagUpdateMsg, TagUpdateMsg
+from openscada_lite.common.models.dtos import UNKNOWN_TAG, RawTagUpdateMsg, TagUpdateMsg
 
 
 class DatapointService(BaseService[RawTagUpdateMsg, RawTagUpdateMsg, TagUpdateMsg]):
@@ -34,14 +35,25 @@ class DatapointService(BaseService[RawTagUpdateMsg, RawTagUpdateMsg, TagUpdateMs
         # Custom logic here
         await self.event_bus.publish(EventType.TAG_UPDATE, msg)
 
+    async def on_model_accepted_bus_updates(self, msgs: List[TagUpdateMsg]):
+        await self.event_bus.publish_many(EventType.TAG_UPDATE, msgs)
+
     @publish_from_return_sync(status=DataFlowStatus.CREATED)
     def process_msg(self, msg: RawTagUpdateMsg) -> TagUpdateMsg:
+        # Resolve the tag index once here, the modules downstream look it up by index.
+        # The registry's interned identifier also makes their string compares identity checks.
+        registry = self.model.tag_registry
+        identifier = msg.datapoint_identifier
+        tag_index = registry.index_of(identifier)
+        if tag_index != UNKNOWN_TAG:
+            identifier = registry.names[tag_index]
         return TagUpdateMsg(
-            datapoint_identifier=msg.datapoint_identifier,
+            datapoint_identifier=identifier,
             value=msg.value,
             quality=msg.quality,
             timestamp=msg.timestamp,
             track_id=msg.track_id,
+            tag_index=tag_index,
         )
 
     def should_accept_update(self, tag: RawTagUpdateMsg) -> bool:
@@ -19,17 +19,17 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from openscada_lite.modules.datapoint.model import DatapointModel
 
-from openscada_lite.common.models.dtos import RawTagUpdateMsg
+from openscada_lite.common.models.dtos import UNKNOWN_TAG, RawTagUpdateMsg
 
 
 class Utils:
     @staticmethod
     def is_valid(model: "DatapointModel", tag: RawTagUpdateMsg) -> bool:  # Use string for type hint
         # Example validation logic
-        if tag.datapoint_identifier not in model._allowed_tags:
+        if model.tag_registry.index_of(tag.datapoint_identifier) == UNKNOWN_TAG:
             return False
-        old_tag = model._store.get(tag.datapoint_identifier)
-        if old_tag and tag.timestamp is not None and old_tag.timestamp is not None:
-            if tag.timestamp < old_tag.timestamp:
+        old_timestamp = model.get_timestamp(tag.datapoint_identifier)
+        if tag.timestamp is not None and old_timestamp is not None:
+            if tag.timestamp < old_timestamp:
                 return False
         return True
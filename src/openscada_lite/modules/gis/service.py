@@ -14,6 +14,7 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 from openscada_lite.common.config.config import Config
+from openscada_lite.common.config.tag_registry import TagIndex, TagRegistry
 from openscada_lite.modules.base.base_service import BaseService
 from openscada_lite.common.models.dtos import AlarmUpdateMsg, GisUpdateMsg, TagUpdateMsg
 from typing import Union
@@ -24,6 +25,8 @@ logger = logging.getLogger(__name__)
 
 
 class GisService(BaseService[Union[TagUpdateMsg, AlarmUpdateMsg], None, GisUpdateMsg]):
+    coalesce_bus_updates = True
+
     def __init__(self, event_bus, model, controller):
         super().__init__(
             event_bus,
@@ -33,9 +36,20 @@ class GisService(BaseService[Union[TagUpdateMsg, AlarmUpdateMsg], None, GisUpdat
             None,
             GisUpdateMsg,
         )
-        self.gis_icons_config = Config.get_instance().get_gis_icons()
+        config = Config.get_instance()
+        self.gis_icons_config = config.get_gis_icons()
         self.model = model
 
+        # Icons of each datapoint (also by tag index) and of each rule, in config order
+        icons_by_datapoint = {}
+        self._icons_by_rule = {}
+        for icon_cfg in self.gis_icons_config:
+            if icon_cfg.get("datapoint") is not None:
+                icons_by_datapoint.setdefault(icon_cfg["datapoint"], []).append(icon_cfg)
+            if icon_cfg.get("rule_id") is not None:
+                self._icons_by_rule.setdefault(icon_cfg["rule_id"], []).append(icon_cfg)
+        self._icons_by_tag = TagIndex(TagRegistry.get_instance(config), icons_by_datapoint, [])
+
         # Initialize model with default icons
         for icon_cfg in self.gis_icons_config:
             gis_msg = GisUpdateMsg(
@@ -54,12 +68,13 @@ class GisService(BaseService[Union[TagUpdateMsg, AlarmUpdateMsg], None, GisUpdat
 
     def process_msg(self, msg: TagUpdateMsg | AlarmUpdateMsg) -> GisUpdateMsg | None:
         logger.debug(f"=================================GisService processing message: {msg}")
-        for icon_cfg in self.gis_icons_config:
-            if isinstance(msg, TagUpdateMsg):
+        if isinstance(msg, TagUpdateMsg):
+            for icon_cfg in self._icons_by_tag.get(msg.tag_index, msg.datapoint_identifier):
                 result = self._process_tag_update(msg, icon_cfg)
                 if result:
                     return result
-            elif isinstance(msg, AlarmUpdateMsg):
+        elif isinstance(msg, AlarmUpdateMsg):
+            for icon_cfg in self._icons_by_rule.get(getattr(msg, "rule_id", None), []):
                 result = self._process_alarm_update(msg, icon_cfg)
                 if result:
                     return result
@@ -112,11 +127,5 @@ class GisService(BaseService[Union[TagUpdateMsg, AlarmUpdateMsg], None, GisUpdat
 
     def should_accept_update(self, tag: Union[TagUpdateMsg, AlarmUpdateMsg]) -> bool:
         if isinstance(tag, AlarmUpdateMsg):
-            return any(
-                icon.get("rule_id") == getattr(tag, "rule_id", None)
-                for icon in self.gis_icons_config
-            )
-        else:
-            return any(
-                icon.get("datapoint") == tag.datapoint_identifier for icon in self.gis_icons_config
-            )
+            return getattr(tag, "rule_id", None) in self._icons_by_rule
+        return bool(self._icons_by_tag.get(tag.tag_index, tag.datapoint_identifier))
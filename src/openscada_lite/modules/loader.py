@@ -2,6 +2,7 @@
 # Dynamic Module Loader
 # -----------------------------------------------------------------------------
 import importlib
+from typing import Dict, List, Optional
 from openscada_lite.modules.security.controller import SecurityController
 from openscada_lite.modules.security.model import SecurityModel
 from openscada_lite.modules.security.service import SecurityService
@@ -11,15 +12,61 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-async def module_loader(config: dict, socketio_obj, event_bus, app) -> dict:
+def _module_name(module_entry) -> str:
+    if isinstance(module_entry, dict):
+        return module_entry.get("name", "")
+    return str(module_entry)
+
+
+def get_worker_group(module_entry) -> Optional[str]:
+    """
+    Worker process a module runs in, from its "worker" key: a group name, or true for a
+    worker of its own. None means the main process.
+    """
+    if not isinstance(module_entry, dict) or not module_entry.get("worker"):
+        return None
+    worker = module_entry["worker"]
+    return _module_name(module_entry) if worker is True else str(worker)
+
+
+def get_worker_groups(config: dict) -> Dict[str, List[str]]:
+    """
+    Modules of each worker group. Raises ValueError for a module that cannot run in a worker
+    (see BaseController.runs_in_worker): its live feed and routes would not be served.
+    """
+    groups: Dict[str, List[str]] = {}
     for module_entry in config.get("modules", []):
-        if isinstance(module_entry, dict):
-            module_name = module_entry.get("name", "")
-        else:
-            module_name = str(module_entry)
+        group = get_worker_group(module_entry)
+        if group is None:
+            continue
+        module_name = _module_name(module_entry)
+        if not _controller_class(module_name).runs_in_worker:
+            raise ValueError(
+                f"Module {module_name} cannot run in worker {group}: its live feed and HTTP "
+                "routes are only served by the main process"
+            )
+        groups.setdefault(group, []).append(module_name)
+    return groups
+
+
+def _controller_class(module_name: str) -> type:
+    module = importlib.import_module(f"openscada_lite.modules.{module_name}.controller")
+    return getattr(module, f"{module_name.capitalize()}Controller")
+
+
+async def module_loader(
+    config: dict, socketio_obj, event_bus, app, worker_group: Optional[str] = None
+) -> dict:
+    """
+    Load the modules of the main process, or only those of worker_group inside a worker.
+    """
+    for module_entry in config.get("modules", []):
+        module_name = _module_name(module_entry)
 
         if module_name == "security":
             continue  # Security module is loaded separately
+        if get_worker_group(module_entry) != worker_group:
+            continue
 
         base_path = f"openscada_lite.modules.{module_name}"
         class_prefix = module_name.capitalize()
@@ -28,10 +75,7 @@ async def module_loader(config: dict, socketio_obj, event_bus, app) -> dict:
 
         model_cls = getattr(importlib.import_module(f"{base_path}.model"), f"{class_prefix}Model")
         logger.debug(f"[INIT] Model class loaded: {module_name}")
-        controller_cls = getattr(
-            importlib.import_module(f"{base_path}.controller"),
-            f"{class_prefix}Controller",
-        )
+        controller_cls = _controller_class(module_name)
         logger.debug(f"[INIT] Controller class loaded: {module_name}")
         service_cls = getattr(
             importlib.import_module(f"{base_path}.service"), f"{class_prefix}Service"
@@ -48,6 +92,9 @@ async def module_loader(config: dict, socketio_obj, event_bus, app) -> dict:
             logger.debug(f"[INIT] async_init: {module_name}")
             await service.async_init()
 
+    if worker_group is not None:
+        return  # Security (and the HTTP API it guards) lives in the main process
+
     logger.info("[INIT] Loading Security module")
     # Security module is always loaded regardless of config
     security_model = SecurityModel()
@@ -0,0 +1,39 @@
+# -----------------------------------------------------------------------------
+# Metrics Controller
+# -----------------------------------------------------------------------------
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from openscada_lite.modules.base.base_controller import BaseController
+
+
+class MetricsController(BaseController):
+    """Serves the EventBus instrumentation and live feed metrics over HTTP and Socket.IO."""
+
+    def __init__(self, model, socketio, module_name: str, router: APIRouter):
+        super().__init__(model, socketio, None, None, module_name, router)
+
+    def validate_request_data(self, data):
+        return data
+
+    def register_local_routes(self, router: APIRouter):
+        @router.get("/metrics/bus", tags=[self.base_event], operation_id="getBusMetrics")
+        async def get_bus_metrics():
+            return JSONResponse(content=self.service.get_bus_metrics())
+
+        @router.get(
+            "/metrics/live_feeds", tags=[self.base_event], operation_id="getLiveFeedMetrics"
+        )
+        async def get_live_feed_metrics():
+            return JSONResponse(content=self.service.get_live_feed_metrics())
+
+    async def handle_subscribe_live_feed(self, sid):
+        await self.socketio.enter_room(sid, self.room)
+        await self.socketio.emit(
+            f"{self.base_event}_initial_state", self.service.get_bus_metrics(), to=sid
+        )
+
+    async def publish_bus_metrics(self, metrics: dict):
+        await self.socketio.emit(f"{self.base_event}_bus_metrics", metrics, room=self.room)
+
+    async def publish_live_feed_metrics(self, metrics: dict):
+        await self.socketio.emit(f"{self.base_event}_live_feed_metrics", metrics, room=self.room)
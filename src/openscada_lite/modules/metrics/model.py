@@ -0,0 +1,8 @@
+# -----------------------------------------------------------------------------
+# Metrics Model
+# -----------------------------------------------------------------------------
+from openscada_lite.modules.base.base_model import BaseModel
+
+
+class MetricsModel(BaseModel):
+    pass
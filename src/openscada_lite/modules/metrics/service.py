@@ -0,0 +1,54 @@
+# -----------------------------------------------------------------------------
+# Metrics Service
+# -----------------------------------------------------------------------------
+import asyncio
+
+from openscada_lite.common.config.config import Config
+from openscada_lite.modules.base.base_controller import BaseController
+from openscada_lite.modules.base.base_service import BaseService
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEED_INTERVAL = 2.0  # seconds
+
+
+class MetricsService(BaseService[None, None, None]):
+    """
+    Turns on the EventBus instrumentation and pushes a snapshot of it to the live feed
+    every "interval" seconds (module config).
+    """
+
+    def __init__(self, event_bus, model, controller):
+        super().__init__(event_bus, model, controller, None, None, None)
+        module_config = Config.get_instance().get_module_config("metrics")
+        self.interval = module_config.get("interval", DEFAULT_FEED_INTERVAL)
+        self._feed_task = None
+        event_bus.enable_instrumentation()
+
+    def should_accept_update(self, msg):
+        return False
+
+    def get_bus_metrics(self) -> dict:
+        return self.event_bus.get_metrics()
+
+    def get_live_feed_metrics(self) -> dict:
+        """Batching metrics of every module live feed, by module."""
+        return {
+            name: controller.get_feed_metrics()
+            for name, controller in sorted(BaseController.live_feeds.items())
+            if controller.t_cls is not None
+        }
+
+    async def async_init(self):
+        self._feed_task = asyncio.create_task(self._feed_loop())
+
+    async def _feed_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.controller.publish_bus_metrics(self.get_bus_metrics())
+                await self.controller.publish_live_feed_metrics(self.get_live_feed_metrics())
+            except Exception:
+                logger.exception("[METRICS] Failed to publish bus metrics")
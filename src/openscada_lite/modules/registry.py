@@ -7,6 +7,7 @@ MODULES = [
     "datapoint",
     "frontend",
     "gis",
+    "metrics",
     "rule",
     "security",
     "stream",
@@ -16,13 +16,25 @@
 
 # communications_controller.py
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from openscada_lite.modules.base.base_controller import BaseController
 
 
 class RuleController(BaseController[None, None]):
+    # Rules act through commands and alarms on the bus; only /rule/profile is lost in a worker
+    runs_in_worker = True
+
     def __init__(self, model, socketio, module_name: str, router: APIRouter):
         super().__init__(model, socketio, None, None, module_name, router)
 
     def validate_request_data(self, data):
         # No validation needed (no U type)
         return data
+
+    def register_local_routes(self, router: APIRouter):
+        @router.get("/rule/profile", tags=[self.base_event], operation_id="getRuleProfile")
+        async def get_rule_profile(top: int = 10, order: str = "total_time"):
+            try:
+                return JSONResponse(content=self.service.get_rule_profile(top, order))
+            except ValueError as e:
+                return JSONResponse(content={"error": str(e)}, status_code=400)
@@ -0,0 +1,132 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Compiles rule conditions once instead of having asteval parse them on every evaluation.
+
+A condition that only uses the expression subset below (names, constants, calls of names,
+operators, comparisons, boolean logic, conditional expressions, containers and subscripts) is
+compiled to Python bytecode and evaluated against the asteval symbol table, with no builtins:
+names resolve to the same symbols (datapoint values, enum values, asteval's safe functions) and
++, *, ** and << use asteval's size checked operators. Anything else (attributes, comprehensions,
+lambdas, dunder names) is run by the asteval interpreter from the tree parsed once.
+"""
+
+import ast
+import logging
+from typing import Any, Callable, Optional
+
+from asteval import Interpreter
+from asteval.astutils import OPERATORS
+
+logger = logging.getLogger(__name__)
+
+# A compiled condition: no arguments, returns the condition's value or raises
+Condition = Callable[[], Any]
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.IfExp,
+    ast.Call,
+    ast.keyword,
+    ast.Name,
+    ast.Constant,
+    ast.Tuple,
+    ast.List,
+    ast.Set,
+    ast.Dict,
+    ast.Subscript,
+    ast.Slice,
+    ast.Load,
+    ast.boolop,
+    ast.operator,
+    ast.unaryop,
+    ast.cmpop,
+)
+
+# Operators asteval checks for oversized results
+_SAFE_OPERATORS = {
+    ast.Add: "_safe_add",
+    ast.Mult: "_safe_mult",
+    ast.Pow: "_safe_pow",
+    ast.LShift: "_safe_lshift",
+}
+
+_GLOBALS = {"__builtins__": {}}
+_GLOBALS.update({name: OPERATORS[op] for op, name in _SAFE_OPERATORS.items()})
+
+
+class _SafeOperators(ast.NodeTransformer):
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        name = _SAFE_OPERATORS.get(type(node.op))
+        if name is None:
+            return node
+        call = ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=[node.left, node.right])
+        call.keywords = []
+        return ast.copy_location(call, node)
+
+
+def _compilable(tree: ast.AST) -> bool:
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            return False
+        if isinstance(node, ast.Name) and node.id.startswith("_"):
+            return False
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            return False
+        if isinstance(node, ast.keyword) and node.arg is None:
+            return False
+    return True
+
+
+class ConditionCompiler:
+    def __init__(self, interpreter: Interpreter):
+        self.interpreter = interpreter
+
+    def compile(self, condition: str) -> Optional[Condition]:
+        """
+        Compile a condition in asteval syntax (datapoint names already rewritten to
+        Driver__TAG). Returns None, after logging why, if it does not parse.
+        """
+        try:
+            tree = ast.parse(condition.strip(), mode="eval")
+        except SyntaxError as e:
+            logger.error(f"[RuleEngine] Invalid condition {condition!r}: {e}")
+            return None
+
+        symtable = self.interpreter.symtable
+        if _compilable(tree):
+            code = compile(
+                ast.fix_missing_locations(_SafeOperators().visit(tree)), condition, "eval"
+            )
+            return lambda: eval(code, _GLOBALS, symtable)  # NOSONAR
+
+        logger.debug(f"[RuleEngine] Condition {condition!r} is interpreted by asteval")
+        body = tree.body
+        interpreter = self.interpreter
+
+        def interpret():
+            interpreter.error = []
+            result = interpreter.run(body, expr=condition)
+            if interpreter.error:
+                raise interpreter.error[0].exc(interpreter.error[0].msg)
+            return result
+
+        return interpret
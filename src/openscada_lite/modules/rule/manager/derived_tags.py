@@ -0,0 +1,167 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Derived (virtual) tags: datapoints computed by the rule engine from expressions over other tags.
+
+The derived tags form a dependency DAG, checked for cycles when it is built. A tag update only
+recomputes the derived tags that depend on it, in topological order, and stops at the derived
+tags whose value and quality did not change.
+"""
+
+import heapq
+import logging
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from openscada_lite.common.models.entities import DerivedTag
+from openscada_lite.modules.rule.manager.condition_compiler import ConditionCompiler
+
+TAG_PATTERN = re.compile(r"\w+@\w+")  # NOSONAR
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+# A recomputed derived tag: (name, value, quality)
+DerivedUpdate = Tuple[str, object, str]
+
+
+class DerivedTagGraph:
+    def __init__(
+        self,
+        derived_tags: Iterable[DerivedTag],
+        compiler: ConditionCompiler,
+        safe_key: Callable[[str], str],
+        datapoints: Iterable[str] = (),
+    ):
+        """
+        Build the graph, raising ValueError for invalid names, derived tags that are also
+        datapoints or defined twice, and dependency cycles.
+        """
+        self._symtable = compiler.interpreter.symtable
+        self.inputs: Dict[str, List[str]] = {}
+        self._expressions = {}
+        self._safe_keys: Dict[str, str] = {}
+        datapoints = set(datapoints)
+        for derived in derived_tags:
+            name = derived.name
+            if not TAG_PATTERN.fullmatch(name):
+                raise ValueError(f"Derived tag '{name}' is not a Driver@TAG identifier")
+            if name in datapoints:
+                raise ValueError(f"Derived tag '{name}' is also a driver datapoint")
+            if name in self.inputs:
+                raise ValueError(f"Derived tag '{name}' is defined more than once")
+            self.inputs[name] = list(dict.fromkeys(TAG_PATTERN.findall(derived.expression)))
+            self._expressions[name] = compiler.compile(derived.expression.replace("@", "__"))
+            self._safe_keys[name] = safe_key(name)
+
+        # tag -> the derived tags computed from it
+        self.dependents: Dict[str, List[str]] = {}
+        for name, inputs in self.inputs.items():
+            for tag in inputs:
+                self.dependents.setdefault(tag, []).append(name)
+        self.order = self._topological_order()
+        self.values: Dict[str, object] = {}
+        self.qualities: Dict[str, str] = {}
+
+    def _topological_order(self) -> Dict[str, int]:
+        """
+        Position of each derived tag after all the derived tags it depends on (Kahn), in config
+        order where the dependencies allow it.
+        """
+        position = {name: i for i, name in enumerate(self.inputs)}
+        pending = {
+            name: sum(1 for tag in inputs if tag in self.inputs)
+            for name, inputs in self.inputs.items()
+        }
+        ready = [(position[name], name) for name, count in pending.items() if count == 0]
+        heapq.heapify(ready)
+        order = {}
+        while ready:
+            _, name = heapq.heappop(ready)
+            order[name] = len(order)
+            for dependent in self.dependents.get(name, ()):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    heapq.heappush(ready, (position[dependent], dependent))
+        if len(order) != len(self.inputs):
+            cycle = sorted(name for name in self.inputs if name not in order)
+            raise ValueError(f"Derived tags depend on each other in a cycle: {cycle}")
+        return order
+
+    def is_derived(self, tag: str) -> bool:
+        return tag in self.inputs
+
+    def update(self, tag: str, quality: str) -> List[DerivedUpdate]:
+        """
+        Recompute the derived tags depending on tag, whose new value is already in the symbol
+        table, in topological order. Returns the derived tags that changed.
+        """
+        return self.update_many(((tag, quality),))
+
+    def update_many(self, updates: Iterable[Tuple[str, str]]) -> List[DerivedUpdate]:
+        """
+        update for several (tag, quality) at once, as in a scan cycle: each derived tag that
+        depends on them is recomputed once, from the values of all of them.
+        """
+        order = self.order
+        queue = []
+        queued = set()
+        for tag, quality in updates:
+            dependents = self.dependents.get(tag)
+            if not dependents:
+                continue
+            self.qualities[tag] = quality
+            for name in dependents:
+                if name not in queued:
+                    queued.add(name)
+                    queue.append((order[name], name))
+        if not queue:
+            return []
+        heapq.heapify(queue)
+        changed = []
+        while queue:
+            _, name = heapq.heappop(queue)
+            queued.discard(name)
+            value, quality = self._evaluate(name)
+            old = self.values.get(name, _UNSET)
+            if (old is value or old == value) and self.qualities.get(name) == quality:
+                continue
+            self.values[name] = value
+            self.qualities[name] = quality
+            self._symtable[self._safe_keys[name]] = value
+            changed.append((name, value, quality))
+            for dependent in self.dependents.get(name, ()):
+                if dependent not in queued:
+                    queued.add(dependent)
+                    heapq.heappush(queue, (order[dependent], dependent))
+        return changed
+
+    def _evaluate(self, name: str) -> Tuple[Optional[object], str]:
+        """Value and quality of a derived tag: the first input quality that is not good."""
+        quality = "good"
+        for tag in self.inputs[name]:
+            input_quality = self.qualities.get(tag, "unknown")
+            if input_quality != "good":
+                quality = input_quality
+                break
+        expression = self._expressions[name]
+        try:
+            if expression is not None:
+                return expression(), quality
+        except Exception as e:
+            logger.error(f"[RuleEngine] Error evaluating derived tag {name}: {e}")
+        return None, "bad" if quality == "good" else quality
@@ -22,21 +22,39 @@ based on tag updates. It supports rules with on/off conditions and actions, and
 the lifecycle state for each rule.
 """
 
-import re
+import asyncio
+import datetime
+import operator
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List
 from asteval import Interpreter
-from openscada_lite.common.actions.action_map import ACTION_MAP
-from openscada_lite.common.tracking.decorators import publish_from_arg_async
-from openscada_lite.common.actions.action import Action
+from openscada_lite.common.actions.action_utils import compile_action
+from openscada_lite.common.tracking.decorators import (
+    publish_from_arg_async,
+    publish_from_batch_arg_async,
+)
 from openscada_lite.common.tracking.tracking_types import DataFlowStatus
 from openscada_lite.common.bus.event_types import EventType
 from openscada_lite.common.config.config import Config
+from openscada_lite.common.config.tag_registry import TagIndex, TagRegistry
 from openscada_lite.common.bus.event_bus import EventBus
 from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.common.models.entities import Rule
+from openscada_lite.common.timers.timer_wheel import Timer, TimerWheel
+from openscada_lite.modules.rule.manager.condition_compiler import ConditionCompiler
+from openscada_lite.modules.rule.manager.derived_tags import TAG_PATTERN, DerivedTagGraph
+from openscada_lite.modules.rule.manager.rule_profiler import DEFAULT_SAMPLE, RuleProfiler
+from openscada_lite.modules.rule.manager.threshold_rules import TagThresholds, parse_threshold
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+_COMPARISONS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+_NO_ACTIONS = {}
+
 
 class RuleEngine:
     """
@@ -46,10 +64,18 @@ class RuleEngine:
       on/off lifecycle (actions are only triggered on state transitions).
     - If a rule has no off_condition, its on_actions are executed every time
       the on_condition is true (no latching).
+    - With "scan_cycle": true in the rule module config, the tag updates of one scan (a
+      publish_many batch, or the single updates received in one event loop tick) are all
+      applied first, then each rule they impact is evaluated once against the final values.
+    - Unless "profile": false is set in the rule module config, per rule evaluation counts and
+      sampled times, transitions and errors are kept in a RuleProfiler (see rule_profiler).
     """
 
     _instance = None
 
+    # Evaluate the threshold rules of a tag (e.g. Tank@LEVEL > 80) together, see threshold_rules
+    index_threshold_rules = True
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is not None:
             raise RuntimeError("Use RuleManager.get_instance() instead of direct instantiation.")
@@ -58,6 +84,9 @@ class RuleEngine:
 
     @classmethod
     def reset_instance(cls):
+        if cls._instance is not None:
+            for timer in cls._instance._pending_transitions.values():
+                timer.cancel()
         cls._instance = None
 
     @classmethod
@@ -90,9 +119,35 @@ class RuleEngine:
         self.asteval.symtable["TRUE"] = True
         self.asteval.symtable["FALSE"] = False
         self.rules = []
+        self.derived_tags = []
         self.datapoint_state = {}
         self.tag_to_rules = {}  # tag_id -> [rules]
+        self.tag_registry = TagRegistry.get_instance(config)
+        self.condition_compiler = ConditionCompiler(self.asteval)
+        # Built with the index: the rules of each tag evaluated one by one and its threshold
+        # rules (by tag index too), the compiled conditions
+        # (rule_id -> (rule, on_condition, has_off, off_condition)) and the rule positions
+        self._rules_by_tag = TagIndex(self.tag_registry, self.tag_to_rules, [])
+        self._thresholds_by_tag = TagIndex(self.tag_registry, {})
+        self._rule_order = {}
+        self._safe_keys = TagIndex(self.tag_registry, {})
+        self._conditions = {}
+        self._threshold_rules = {}  # id(rule) -> (tag, operator, constant), None if not one
+        self._deadbands = {}  # rule_id -> (symbol, comparison, limit) the rule stays on while true
+        self._actions = {}  # rule_id -> {action string: BoundAction} of its on and off actions
+        self.timer_wheel = TimerWheel.get_instance()
+        self._pending_transitions: Dict[str, Timer] = {}  # rule_id -> on/off_delay timer
+        self.derived_graph = DerivedTagGraph([], self.condition_compiler, self._safe_key)
         self.rule_states = {}  # rule_id -> bool (True=active, False=inactive)
+        module_config = config.get_module_config("rule")
+        self.scan_cycle = bool(module_config.get("scan_cycle", False))
+        self.profiler = (
+            RuleProfiler(module_config.get("profile_sample", DEFAULT_SAMPLE))
+            if module_config.get("profile", True)
+            else None
+        )
+        self._scan_pending: List[TagUpdateMsg] = []  # single updates waiting for the tick's end
+        self._scan_tasks = set()  # running flushes, referenced until they are done
         self.load_rules()
         self.build_tag_to_rules_index()
         self.subscribe_to_eventbus()
@@ -107,60 +162,416 @@ class RuleEngine:
         """
         config = Config.get_instance()
         self.rules = config.get_rules() or []
+        self.derived_tags = config.get_derived_tags()
 
     def build_tag_to_rules_index(self):
         """
         Build mapping from tags (like Train@var) to rules that depend on them.
         This ensures both on/off conditions are considered.
+        Also builds the dependency graph of the derived tags (ValueError if it has a cycle).
         """
         self.tag_to_rules.clear()
-        tag_pattern = re.compile(r"\w+@\w+")  # NOSONAR
         all_tags = set()
         for rule in self.rules:
-            conditions = [rule.on_condition]
-            if getattr(rule, "off_condition", None):
-                conditions.append(rule.off_condition)
-
-            for condition in conditions:
-                for tag in tag_pattern.findall(condition or ""):
-                    self.tag_to_rules.setdefault(tag, []).append(rule)
-                    all_tags.add(tag)
+            for tag in self._rule_tags(rule):
+                self.tag_to_rules.setdefault(tag, []).append(rule)
+                all_tags.add(tag)
+        for derived in self.derived_tags:
+            all_tags.add(derived.name)
+            all_tags.update(TAG_PATTERN.findall(derived.expression))
         # Initialize all tags in asteval symtable
         for tag in all_tags:
             safe_key = self._safe_key(tag)
             if safe_key not in self.asteval.symtable:
                 self.asteval.symtable[safe_key] = None
 
+        self._safe_keys = TagIndex(
+            self.tag_registry,
+            {tag: self._safe_key(tag) for tag in all_tags.union(self.tag_registry.names)},
+        )
+        self._conditions = {rule.rule_id: self._compile_conditions(rule) for rule in self.rules}
+        self._threshold_rules = {id(rule): self._parse_threshold_rule(rule) for rule in self.rules}
+        self._deadbands = {}
+        for rule in self.rules:
+            self._parse_deadband(rule)
+        self._rule_order = {id(rule): order for order, rule in enumerate(self.rules)}
+        self._actions = {}
+        self._compile_actions(self.rules)
+        self._build_threshold_index()
+        self.derived_graph = DerivedTagGraph(
+            self.derived_tags, self.condition_compiler, self._safe_key, self.tag_registry.names
+        )
+
+    def _rule_tags(self, rule) -> List[str]:
+        """The tags read by the rule's conditions, each once, in order of first occurrence."""
+        tags = TAG_PATTERN.findall(rule.on_condition or "")
+        if getattr(rule, "off_condition", None):
+            tags += TAG_PATTERN.findall(rule.off_condition)
+        return list(dict.fromkeys(tags))
+
+    def _parse_threshold_rule(self, rule):
+        """(tag, operator, constant) of a threshold rule, None for rules evaluated one by one."""
+        if not self.index_threshold_rules or getattr(rule, "deadband", 0):
+            return None  # rules with a deadband are evaluated one by one
+        off_cond = getattr(rule, "off_condition", None)
+        tags = set(TAG_PATTERN.findall(rule.on_condition or ""))
+        if len(tags) != 1 or (off_cond and off_cond.strip()):
+            return None
+        tag = tags.pop()
+        threshold = parse_threshold(rule.on_condition.replace("@", "__"))
+        if threshold is None or threshold[0] != self._safe_key(tag):
+            return None
+        return (tag,) + threshold[1:]
+
+    def _parse_deadband(self, rule):
+        """
+        Keep the deadband of a threshold rule as the comparison that holds it on: Tank@LEVEL > 80
+        with a deadband of 5 stays on while Tank@LEVEL > 75. Other rules cannot have one.
+        """
+        self._deadbands.pop(rule.rule_id, None)
+        deadband = getattr(rule, "deadband", 0)
+        if not deadband:
+            return
+        off_cond = getattr(rule, "off_condition", None)
+        threshold = parse_threshold((rule.on_condition or "").replace("@", "__"))
+        if (off_cond and off_cond.strip()) or threshold is None or threshold[1] == "==":
+            logger.warning(
+                f"[RuleEngine] Deadband of rule {rule.rule_id} ignored: only rules like "
+                "Tank@LEVEL > 80, with no off_condition, can have one"
+            )
+            return
+        name, op, limit = threshold
+        limit = limit - deadband if op in (">", ">=") else limit + deadband
+        self._deadbands[rule.rule_id] = (name, _COMPARISONS[op], limit)
+
+    def _build_threshold_index(self):
+        """Split the rules of each tag into threshold rules and rules evaluated one by one."""
+        scalar_rules = {}
+        thresholds = {}
+        for tag, rules in self.tag_to_rules.items():
+            scalar_rules[tag], tag_thresholds = self._split_tag_rules(tag, rules)
+            if tag_thresholds is not None:
+                thresholds[tag] = tag_thresholds
+        self._rules_by_tag = TagIndex(self.tag_registry, scalar_rules, [])
+        self._thresholds_by_tag = TagIndex(self.tag_registry, thresholds)
+
+    def _split_tag_rules(self, tag, rules):
+        """The rules of a tag evaluated one by one, and its TagThresholds (None if it has none)."""
+        scalar = []
+        entries = []
+        for rule in rules:
+            threshold = self._threshold_rules.get(id(rule))
+            if threshold is not None and threshold[0] == tag:
+                entries.append(threshold[1:] + (self._rule_order[id(rule)], rule))
+            else:
+                scalar.append(rule)
+        return scalar, TagThresholds(entries) if entries else None
+
+    async def reload_rules(self, rules: List[Rule]) -> Dict[str, List[str]]:
+        """
+        Replace the rules without restarting, rebuilding the index only for what changed.
+
+        Rules are matched by rule_id. Unchanged rules keep their compiled conditions and state,
+        and only the tags read by added, changed or removed rules get their rule lists and
+        threshold rules rebuilt. Changed rules keep their state too: changed and added rules
+        are evaluated against the current values, so they fire the transitions the new
+        conditions imply (e.g. an alarm whose new threshold is no longer exceeded is lowered).
+        Removed rules that were active have their alarm lowered.
+
+        Returns the rule_ids {"added": [...], "changed": [...], "removed": [...]}.
+        Raises ValueError, before changing anything, if two rules have the same rule_id.
+        """
+        duplicates = sorted(
+            rule_id
+            for rule_id, count in Counter(rule.rule_id for rule in rules).items()
+            if count > 1
+        )
+        if duplicates:
+            raise ValueError(f"Duplicate rule_id in the new rules: {duplicates}")
+        started = time.perf_counter()
+        old_rules = {rule.rule_id: rule for rule in self.rules}
+        new_rules = {rule.rule_id: rule for rule in rules}
+        added = [rule.rule_id for rule in rules if rule.rule_id not in old_rules]
+        changed = [
+            rule.rule_id
+            for rule in rules
+            if rule.rule_id in old_rules and old_rules[rule.rule_id] != rule
+        ]
+        removed = [rule.rule_id for rule in self.rules if rule.rule_id not in new_rules]
+        summary = {"added": added, "changed": changed, "removed": removed}
+        if self.profiler is not None:
+            self.profiler.forget(changed + removed)
+        if len(old_rules) != len(self.rules):  # not matchable by rule_id, rebuild everything
+            self.rules = list(rules)
+            self.build_tag_to_rules_index()
+            return summary
+
+        rebuilt = set(added).union(changed)
+        dropped = set(changed).union(removed)
+        kept_before = [rule.rule_id for rule in self.rules if rule.rule_id not in dropped]
+        self.rules = [
+            rule if rule.rule_id in rebuilt else old_rules[rule.rule_id] for rule in rules
+        ]
+        kept_after = [rule.rule_id for rule in self.rules if rule.rule_id not in rebuilt]
+        self._rule_order = {id(rule): order for order, rule in enumerate(self.rules)}
+        for rule_id in dropped:
+            self._conditions.pop(rule_id, None)
+            self._threshold_rules.pop(id(old_rules[rule_id]), None)
+            self._deadbands.pop(rule_id, None)
+            self._actions.pop(rule_id, None)
+            timer = self._pending_transitions.pop(rule_id, None)
+            if timer is not None:  # changed rules are evaluated again below
+                timer.cancel()
+        rebuilt_rules = [rule for rule in self.rules if rule.rule_id in rebuilt]
+        for rule in rebuilt_rules:
+            self._conditions[rule.rule_id] = self._compile_conditions(rule)
+            self._threshold_rules[id(rule)] = self._parse_threshold_rule(rule)
+            self._parse_deadband(rule)
+        self._compile_actions(rebuilt_rules)
+
+        additions: Dict[str, list] = {}
+        for rule in rebuilt_rules:
+            for tag in self._rule_tags(rule):
+                additions.setdefault(tag, []).append(rule)
+        affected = set(additions)
+        for rule_id in dropped:
+            affected.update(self._rule_tags(old_rules[rule_id]))
+        if kept_before != kept_after:  # unchanged rules moved, every tag's order may change
+            affected.update(self.tag_to_rules)
+        for tag in affected:
+            self._reindex_tag(tag, dropped, additions.get(tag, []))
+
+        track_id = str(uuid.uuid4())
+        for rule_id in removed:
+            if self.rule_states.pop(rule_id, False):
+                rule = old_rules[rule_id]
+                tags = self._rule_tags(rule)
+                await self._handle_alarm_lowering(
+                    rule, tags[0] if tags else rule_id, track_id, rule_id
+                )
+        for rule in rebuilt_rules:
+            tags = self._rule_tags(rule)
+            if tags and all(tag in self.datapoint_state for tag in tags):
+                await self._process_rule(rule, tags[0], track_id)
+        logger.info(
+            f"[RuleEngine] Reloaded rules in {(time.perf_counter() - started) * 1000:.1f} ms: "
+            f"{len(added)} added, {len(changed)} changed, {len(removed)} removed, "
+            f"{len(affected)} tags reindexed"
+        )
+        return summary
+
+    def _reindex_tag(self, tag, dropped, additions):
+        """Rebuild the rule lists and threshold rules of one tag after a reload."""
+        rules = [rule for rule in self.tag_to_rules.get(tag, ()) if rule.rule_id not in dropped]
+        rules.extend(additions)
+        rules.sort(key=lambda rule: self._rule_order[id(rule)])
+        if not rules:
+            self.tag_to_rules.pop(tag, None)
+            self._rules_by_tag.remove(tag)
+            self._thresholds_by_tag.remove(tag)
+            return
+        self.tag_to_rules[tag] = rules
+        safe_key = self._safe_key(tag)
+        if safe_key not in self.asteval.symtable:
+            self.asteval.symtable[safe_key] = None
+        if tag not in self._safe_keys.by_name:
+            self._safe_keys.set(tag, safe_key)
+        scalar, thresholds = self._split_tag_rules(tag, rules)
+        self._rules_by_tag.set(tag, scalar)
+        if thresholds is None:
+            self._thresholds_by_tag.remove(tag)
+            return
+        # Start from the tag's current value, the state its unchanged rules are in
+        thresholds.edges(self.asteval.symtable[safe_key])
+        self._thresholds_by_tag.set(tag, thresholds)
+
+    def _compile_conditions(self, rule):
+        """
+        Parse and compile the rule's conditions once. A condition that does not compile is
+        None and evaluates to None, as asteval returns for invalid expressions.
+        """
+        on_condition = self.condition_compiler.compile(rule.on_condition.replace("@", "__"))
+        off_cond = getattr(rule, "off_condition", None)
+        has_off = bool(off_cond and off_cond.strip())
+        off_condition = (
+            self.condition_compiler.compile(off_cond.replace("@", "__")) if has_off else None
+        )
+        return rule, on_condition, has_off, off_condition
+
+    def _run_condition(self, condition, rule_id):
+        if condition is None:
+            return None
+        try:
+            return condition()
+        except Exception as e:
+            logger.error(f"[RuleEngine] Error evaluating rule {rule_id}: {e}")
+            if self.profiler is not None:
+                self.profiler.record_error(rule_id)
+            return None
+
     def subscribe_to_eventbus(self):
         """
         Subscribe the rule engine to tag update events on the event bus.
         """
-        self.event_bus.subscribe(EventType.TAG_UPDATE, self.on_tag_update)
+        self.event_bus.subscribe(
+            EventType.TAG_UPDATE,
+            self.on_tag_update,
+            owner="rule",
+            batch_callback=self.on_tag_updates,
+        )
 
     @publish_from_arg_async(status=DataFlowStatus.RECEIVED)
     async def on_tag_update(self, msg: TagUpdateMsg):
         """
         Callback for tag update events. Evaluates rules impacted by the tag and executes actions.
         """
-        tag_id = msg.datapoint_identifier
-        value = msg.value
-        self._update_tag_state(tag_id, value)
+        if self.scan_cycle:
+            self._queue_scan_update(msg)
+            return
+        await self._apply_tag_update(msg)
+
+    @publish_from_batch_arg_async(status=DataFlowStatus.RECEIVED)
+    async def on_tag_updates(self, msgs: List[TagUpdateMsg]):
+        """
+        Batch callback for tag updates published with publish_many.
+        Handles the whole scan in one pass, in arrival order.
+        """
+        if self.scan_cycle:
+            pending, self._scan_pending = self._scan_pending, []
+            await self._apply_scan(pending + list(msgs))
+            return
+        for msg in msgs:
+            await self._apply_tag_update(msg)
+
+    def _queue_scan_update(self, msg: TagUpdateMsg):
+        """Keep a single update for the scan evaluated once the current event loop tick ends."""
+        self._scan_pending.append(msg)
+        if len(self._scan_pending) == 1:
+            task = asyncio.create_task(self._flush_scan())
+            self._scan_tasks.add(task)
+            task.add_done_callback(self._scan_tasks.discard)
+
+    async def _flush_scan(self):
+        pending, self._scan_pending = self._scan_pending, []
+        if not pending:
+            return
+        try:
+            await self._apply_scan(pending)
+        except Exception as e:
+            logger.error(f"[RuleEngine] Error evaluating scan of {len(pending)} tag updates: {e}")
+
+    async def _apply_scan(self, msgs: List[TagUpdateMsg]):
+        """
+        Apply the tag updates of a scan to the symbol table, then evaluate each rule they impact
+        once, in config order. A rule's actions get the last of its tags updated in the scan.
+        Threshold edges are taken from the final value of each tag, so states a scan went
+        through on its way are not seen, and edges are relative to the previous scan.
+        """
+        latest = {}  # tag_id -> (last update in the scan, its symbol value), by last arrival
+        for msg in msgs:
+            tag_id = msg.datapoint_identifier
+            safe_key = self._safe_keys.get(msg.tag_index, tag_id)
+            symbol = self._update_tag_state(tag_id, msg.value, safe_key)
+            latest.pop(tag_id, None)
+            latest[tag_id] = (msg, symbol)
+        if not latest:
+            return
+
+        derived = self.derived_graph.update_many(
+            (tag_id, msg.quality)
+            for tag_id, (msg, _) in latest.items()
+            if not self.derived_graph.is_derived(tag_id)
+        )
+        if derived:
+            await self._publish_derived_tags(derived, msgs[-1])
+
+        rule_order = self._rule_order
+        items = {}  # id(rule) -> (position, rule, None, msg), evaluated once per scan
+        edges = []
+        for tag_id, (msg, symbol) in latest.items():
+            for rule in self._rules_by_tag.get(msg.tag_index, tag_id):
+                items[id(rule)] = (rule_order.get(id(rule), -1), rule, None, msg)
+            thresholds = self._thresholds_by_tag.get(msg.tag_index, tag_id)
+            if thresholds is not None:
+                edges.extend(edge + (msg,) for edge in thresholds.edges(symbol))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"[RuleEngine] Scan of {len(msgs)} updates on {len(latest)} tags: "
+                f"{len(items)} rules, threshold edges {edges}"
+            )
 
-        impacted_rules = self.tag_to_rules.get(tag_id, [])
-        self._log_tag_update(tag_id, value, impacted_rules)
+        scan = list(items.values()) + edges
+        scan.sort(key=lambda item: item[0])
+        for _, rule, active, msg in scan:
+            tag_id = msg.datapoint_identifier
+            if active is None:
+                await self._process_rule(rule, tag_id, msg.track_id)
+            else:
+                await self._handle_on_only_rule(rule, rule.rule_id, active, tag_id, msg.track_id)
 
+    async def _apply_tag_update(self, msg: TagUpdateMsg):
+        tag_id = msg.datapoint_identifier
+        value = msg.value
+        safe_key = self._safe_keys.get(msg.tag_index, tag_id)
+        symbol = self._update_tag_state(tag_id, value, safe_key)
+        if not self.derived_graph.is_derived(tag_id):
+            # Derived tags come back through the bus once computed, with nothing left to update
+            derived = self.derived_graph.update(tag_id, msg.quality)
+            if derived:
+                await self._publish_derived_tags(derived, msg)
+
+        impacted_rules = self._rules_by_tag.get(msg.tag_index, tag_id)
+        thresholds = self._thresholds_by_tag.get(msg.tag_index, tag_id)
+        edges = thresholds.edges(symbol) if thresholds is not None else None
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_tag_update(tag_id, value, impacted_rules)
+            logger.debug(f"[RuleEngine] Threshold rule edges: {edges}")
+
+        if edges:
+            await self._process_rules_and_edges(impacted_rules, edges, tag_id, msg.track_id)
+            return
         for rule in impacted_rules:
             await self._process_rule(rule, tag_id, msg.track_id)
 
-    def _update_tag_state(self, tag_id, value):
-        """Update the datapoint state and asteval symbol table."""
+    async def _publish_derived_tags(self, derived, source: TagUpdateMsg):
+        """Publish the recomputed derived tags, in the source update's flow and at its time."""
+        timestamp = source.timestamp or datetime.datetime.now()
+        await self.event_bus.publish_many(
+            EventType.TAG_UPDATE,
+            [
+                TagUpdateMsg(
+                    datapoint_identifier=name,
+                    value=value,
+                    quality=quality,
+                    timestamp=timestamp,
+                    test=source.test,
+                    track_id=source.track_id,
+                )
+                for name, value, quality in derived
+            ],
+        )
+
+    async def _process_rules_and_edges(self, impacted_rules, edges, tag_id, track_id):
+        """Process the tag's other rules and its threshold rules' edges in config order."""
+        items = [(self._rule_order.get(id(rule), -1), rule, None) for rule in impacted_rules]
+        items.extend(edges)
+        items.sort(key=lambda item: item[0])
+        for _, rule, active in items:
+            if active is None:
+                await self._process_rule(rule, tag_id, track_id)
+            else:
+                await self._handle_on_only_rule(rule, rule.rule_id, active, tag_id, track_id)
+
+    def _update_tag_state(self, tag_id, value, safe_key=None):
+        """Update the datapoint state and asteval symbol table, return the symbol's value."""
         self.datapoint_state[tag_id] = value
-        safe_key = self._safe_key(tag_id)
+        if safe_key is None:
+            safe_key = self._safe_key(tag_id)
 
         if isinstance(value, str) and value.upper() in ("TRUE", "FALSE"):
-            self.asteval.symtable[safe_key] = value.upper() == "TRUE"
-        else:
-            self.asteval.symtable[safe_key] = value
+            value = value.upper() == "TRUE"
+        self.asteval.symtable[safe_key] = value
+        return value
 
     def _log_tag_update(self, tag_id, value, impacted_rules):
         """Log tag update information."""
@@ -189,53 +600,102 @@ class RuleEngine:
 
     def _evaluate_rule_conditions(self, rule, rule_id):
         """Evaluate on and off conditions for a rule."""
+        profiler = self.profiler
+        stats = started = None
+        if profiler is not None:  # counted, and timed once in profiler.sample evaluations
+            stats = profiler.rules.get(rule_id) or profiler.stats(rule_id)
+            if not stats.evaluations % profiler.sample:
+                started = time.perf_counter()
         try:
-            on_result = self.asteval(rule.on_condition.replace("@", "__"))
-            logger.debug(f"[RuleEngine] Evaluated on_condition for rule {rule_id}: {on_result}")
-
-            if self.asteval.error:
-                logger.error(f"asteval errors: {self.asteval.error}")
+            conditions = self._conditions.get(rule_id)
+            if conditions is None or conditions[0] is not rule:
+                conditions = self._compile_conditions(rule)
+            _, on_condition, has_off, off_condition = conditions
+            on_result = self._run_condition(on_condition, rule_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[RuleEngine] Evaluated on_condition for rule {rule_id}: {on_result}")
 
-            off_cond = getattr(rule, "off_condition", None)
-            has_off = bool(off_cond and off_cond.strip())
             off_result = False
 
             if has_off:
-                off_result = self.asteval(rule.off_condition.replace("@", "__"))
+                off_result = self._run_condition(off_condition, rule_id)
 
             return on_result, has_off, off_result
         except Exception as e:
             logger.error(f"[RuleEngine] Error evaluating rule {rule_id}: {e}")
+            if profiler is not None:
+                profiler.record_error(rule_id)
             return None
+        finally:
+            if stats is not None:
+                stats.evaluations += 1
+                if started is not None:
+                    stats.record_time(time.perf_counter() - started)
 
     async def _handle_on_off_rule(self, rule, rule_id, on_result, off_result, tag_id, track_id):
         """Handle rules with both on and off conditions."""
         on_active = self.rule_states.get(rule_id, False)
-
-        if not on_active and on_result:
-            self.rule_states[rule_id] = True
-            await self._execute_actions(
-                getattr(rule, "on_actions", []), tag_id, track_id, True, rule_id
-            )
-        elif on_active and off_result:
-            self.rule_states[rule_id] = False
-            await self._execute_actions(
-                getattr(rule, "off_actions", []), tag_id, track_id, False, rule_id
-            )
+        target = not off_result if on_active else bool(on_result)
+        await self._set_rule_state(rule, rule_id, on_active, target, tag_id, track_id)
 
     async def _handle_on_only_rule(self, rule, rule_id, on_result, tag_id, track_id):
         """Handle rules with only on condition (rising edge detection)."""
         prev_active = self.rule_states.get(rule_id, False)
+        target = bool(on_result)
+        if prev_active and not target and not self._released(rule_id):
+            target = True  # still within the deadband
+        await self._set_rule_state(rule, rule_id, prev_active, target, tag_id, track_id)
 
-        if not prev_active and on_result:
-            self.rule_states[rule_id] = True
+    async def _set_rule_state(self, rule, rule_id, active, target, tag_id, track_id):
+        """
+        Move a rule towards its target state: at once, or through a timer on the shared wheel
+        when the rule has an on_delay/off_delay. The timer is cancelled if the rule goes back to
+        its current state before it fires.
+        """
+        pending = self._pending_transitions.get(rule_id)
+        if target == active:
+            if pending is not None:
+                pending.cancel()
+                del self._pending_transitions[rule_id]
+            return
+        delay = getattr(rule, "on_delay", 0) if target else getattr(rule, "off_delay", 0)
+        if not delay:
+            await self._apply_transition(rule, rule_id, target, tag_id, track_id)
+        elif pending is None:
+            self._pending_transitions[rule_id] = self.timer_wheel.schedule(
+                delay, self._apply_transition, rule, rule_id, target, tag_id, track_id
+            )
+
+    async def _apply_transition(self, rule, rule_id, active, tag_id, track_id):
+        """Set the rule's state and run the actions of the transition."""
+        self._pending_transitions.pop(rule_id, None)
+        self.rule_states[rule_id] = active
+        if self.profiler is not None:
+            self.profiler.record_transition(rule_id, active)
+        if active:
             await self._execute_actions(
                 getattr(rule, "on_actions", []), tag_id, track_id, True, rule_id
             )
-        elif prev_active and not on_result:
-            self.rule_states[rule_id] = False
+            return
+        off_cond = getattr(rule, "off_condition", None)
+        if off_cond and off_cond.strip():
+            await self._execute_actions(
+                getattr(rule, "off_actions", []), tag_id, track_id, False, rule_id
+            )
+        else:
             await self._handle_alarm_lowering(rule, tag_id, track_id, rule_id)
 
+    def _released(self, rule_id) -> bool:
+        """Whether an active threshold rule with a deadband is past it, and can turn off."""
+        deadband = self._deadbands.get(rule_id)
+        if deadband is None:
+            return True
+        name, holds, limit = deadband
+        try:
+            return not holds(self.asteval.symtable.get(name), limit)
+        except TypeError:  # not a number any more
+            return True
+
     async def _handle_alarm_lowering(self, rule, tag_id, track_id, rule_id):
         """Automatically lower alarm if raise_alarm was in on_actions."""
         if any("raise_alarm" in action for action in getattr(rule, "on_actions", [])):
@@ -258,16 +718,28 @@ class RuleEngine:
         Returns:
             tuple: (action_name, params)
         """
-        match = re.match(r"(\w+)\((.*)\)", action_str, re.DOTALL)
-        if not match:
-            raise ValueError(f"Invalid action string: {action_str}")
-        action_name, params_str = match.groups()
-        params = eval(f"({params_str},)") if params_str else ()
-        return action_name, params
+        bound = compile_action(action_str)
+        return bound.name, bound.params
+
+    def _compile_actions(self, rules):
+        """
+        Parse the actions of the rules once and keep them per rule, so firing a rule does not
+        parse them again. Invalid actions are logged here and raise when the rule fires.
+        """
+        for rule in rules:
+            bound = self._actions[rule.rule_id] = {}
+            for action in [
+                *(getattr(rule, "on_actions", None) or []),
+                *(getattr(rule, "off_actions", None) or []),
+            ]:
+                try:
+                    bound[action] = compile_action(action)
+                except Exception as e:
+                    logger.error(f"[RuleEngine] Invalid action {action!r} in {rule.rule_id}: {e}")
 
     async def execute_action(self, action_str, identifier, track_id, active=True, rule_id=None):
         """
-        Execute an action by looking up its handler and calling it.
+        Execute an action by calling its precompiled handler, kept per rule_id when it loaded.
 
         Args:
             action_str (str): The action string to execute.
@@ -275,10 +747,7 @@ class RuleEngine:
             active (bool): Whether this is an 'on' or 'off' action.
             track_id (str): The track ID associated with the action.
         """
-        action_name, params = self.parse_action(action_str)
-        handler: Action = ACTION_MAP.get(action_name)
-        if handler:
-            # Pass self (engine), identifier, params tuple
-            await handler(identifier, params, track_id=track_id, rule_id=rule_id)
-        else:
-            raise ValueError(f"Unknown action: {action_name}")
+        bound = self._actions.get(rule_id, _NO_ACTIONS).get(action_str)
+        if bound is None:  # not an action of a loaded rule (lower_alarm(), invalid ones)
+            bound = compile_action(action_str)
+        await bound(identifier, track_id, rule_id)
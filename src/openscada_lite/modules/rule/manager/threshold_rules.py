@@ -0,0 +1,145 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""
+Threshold rules (an on_condition like Tank@LEVEL > 80 and no off_condition) evaluated together
+per tag instead of one by one.
+
+The thresholds of a tag are kept sorted per operator, so the rules a value makes true are a
+prefix (> and >=) or a suffix (< and <=) of each sorted array, found with one bisect. The rules
+that changed state are the ones between the previous and the new boundary: an update costs one
+bisect per operator plus the edges, however many thresholds the tag has. == rules are grouped by
+their constant.
+"""
+
+import ast
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+# An edge of a rule: (rule position in the config, rule, True if it became active)
+Edge = Tuple[int, Any, bool]
+
+_OPERATORS = {ast.Gt: ">", ast.GtE: ">=", ast.Lt: "<", ast.LtE: "<=", ast.Eq: "=="}
+# The operator seen from the other side: 80 < Tank@LEVEL is Tank@LEVEL > 80
+_SWAPPED = {">": "<", ">=": "<=", "<": ">", "<=": ">=", "==": "=="}
+
+# Values an ordered comparison with a number is defined for
+_NUMBERS = (int, float, bool)
+
+_NO_MATCH = object()
+
+
+def parse_threshold(condition: str) -> Optional[Tuple[str, str, Any]]:
+    """
+    (name, operator, constant) of a condition in asteval syntax that compares one name with a
+    constant, None for any other condition. Ordered comparisons need a number constant.
+    """
+    try:
+        node = ast.parse(condition.strip(), mode="eval").body
+    except SyntaxError:
+        return None
+    if not isinstance(node, ast.Compare) or len(node.ops) != 1:
+        return None
+    op = _OPERATORS.get(type(node.ops[0]))
+    left, right = node.left, node.comparators[0]
+    if isinstance(right, ast.Name) and isinstance(left, ast.Constant):
+        left, right, op = right, left, _SWAPPED.get(op)
+    if op is None or not isinstance(left, ast.Name) or not isinstance(right, ast.Constant):
+        return None
+    constant = right.value
+    if op == "==":
+        return left.id, op, constant
+    if type(constant) not in (int, float):
+        return None
+    return left.id, op, constant
+
+
+class _OrderedGroup:
+    """The rules of one tag and one ordered operator, by ascending threshold."""
+
+    __slots__ = ("op", "thresholds", "rules", "prefix", "boundary")
+
+    def __init__(self, op: str, entries: List[Tuple[Any, int, Any]]):
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        self.op = op
+        self.thresholds = [threshold for threshold, _, _ in entries]
+        self.rules = [(order, rule) for _, order, rule in entries]
+        # Active rules are rules[:boundary] for > and >=, rules[boundary:] for < and <=
+        self.prefix = op in (">", ">=")
+        self.boundary = 0 if self.prefix else len(self.rules)
+
+    def _boundary(self, value) -> int:
+        if type(value) not in _NUMBERS or value != value:  # not comparable, or NaN
+            return 0 if self.prefix else len(self.rules)
+        if self.op == ">":  # threshold < value
+            return bisect_left(self.thresholds, value)
+        if self.op == ">=":  # threshold <= value
+            return bisect_right(self.thresholds, value)
+        if self.op == "<":  # threshold > value
+            return bisect_right(self.thresholds, value)
+        return bisect_left(self.thresholds, value)  # <=: threshold >= value
+
+    def edges(self, value, out: List[Edge]):
+        new = self._boundary(value)
+        old = self.boundary
+        if new == old:
+            return
+        self.boundary = new
+        rising = new > old if self.prefix else new < old
+        for order, rule in self.rules[min(old, new) : max(old, new)]:
+            out.append((order, rule, rising))
+
+
+class TagThresholds:
+    """The threshold rules of one tag and the state they were left in by its last value."""
+
+    __slots__ = ("_groups", "_equal", "_match")
+
+    def __init__(self, rules: List[Tuple[str, Any, int, Any]]):
+        """rules: (operator, constant, rule position in the config, rule)"""
+        by_op: Dict[str, list] = {}
+        self._equal: Dict[Any, List[Tuple[int, Any]]] = {}
+        for op, constant, order, rule in rules:
+            if op == "==":
+                self._equal.setdefault(constant, []).append((order, rule))
+            else:
+                by_op.setdefault(op, []).append((constant, order, rule))
+        self._groups = [_OrderedGroup(op, entries) for op, entries in by_op.items()]
+        self._match = _NO_MATCH  # the == constant matched by the last value
+
+    def edges(self, value) -> List[Edge]:
+        """The rules that became active or inactive with the new value, in config order."""
+        out: List[Edge] = []
+        for group in self._groups:
+            group.edges(value, out)
+        if self._equal:
+            self._equal_edges(value, out)
+        if len(out) > 1:
+            out.sort(key=lambda edge: edge[0])
+        return out
+
+    def _equal_edges(self, value, out: List[Edge]):
+        try:
+            match = value if value in self._equal else _NO_MATCH
+        except TypeError:  # unhashable values equal no constant
+            match = _NO_MATCH
+        old = self._match
+        if match is old or (match is not _NO_MATCH and old is not _NO_MATCH and match == old):
+            return
+        self._match = match
+        if old is not _NO_MATCH:
+            out.extend((order, rule, False) for order, rule in self._equal[old])
+        if match is not _NO_MATCH:
+            out.extend((order, rule, True) for order, rule in self._equal[match])
@@ -24,12 +24,17 @@ from openscada_lite.modules.rule.manager.rule_manager import RuleEngine
 
 class RuleService(BaseService[TagUpdateMsg, None, None]):
     def __init__(self, event_bus, model: RuleModel, controller: RuleController):
-        super().__init__(event_bus, model, controller, TagUpdateMsg, None, None)
+        # No bus subscription here: RuleEngine subscribes itself to tag updates, feeding it
+        # from this service too would evaluate every update twice.
+        super().__init__(event_bus, model, controller, None, None, None)
         self.engine = RuleEngine.get_instance(event_bus)
 
     def should_accept_update(self, msg: TagUpdateMsg) -> bool:
         return True
 
-    async def handle_bus_message(self, msg: TagUpdateMsg):
-        # Delegate to RuleEngine's on_tag_update
-        await self.engine.on_tag_update(msg)
+    def get_rule_profile(self, top: int = 10, order: str = "total_time") -> dict:
+        """The rule profiler's totals and top rules by order (see RuleProfiler.report)."""
+        profiler = self.engine.profiler
+        if profiler is None:
+            return {"profiling": False}
+        return {"profiling": True, **profiler.report(top, order)}
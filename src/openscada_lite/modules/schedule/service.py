@@ -19,7 +19,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 import uuid
 
-from openscada_lite.common.actions.action_utils import execute_action
+from openscada_lite.common.actions.action_utils import compile_action, execute_action
 from openscada_lite.common.config.config import Config
 from openscada_lite.modules.base.base_service import BaseService
 import logging
@@ -31,6 +31,7 @@ class ScheduleService(BaseService[None, None, None]):
     def __init__(self, event_bus, model, controller):
         super().__init__(event_bus, model, controller, None, None, None)
         self.scheduler = AsyncIOScheduler()
+        self._actions = {}  # schedule_id -> {action string: BoundAction}, replaced on register
         self.config = Config.get_instance()
         self.schedules = Config.get_instance().get_module_config("schedule").get("schedules", [])
         logger.debug(f"Loaded schedules: {self.schedules}")
@@ -39,6 +40,12 @@ class ScheduleService(BaseService[None, None, None]):
         self.scheduler.start()
 
     def _register_schedule(self, sched_cfg):
+        bound = self._actions[sched_cfg["schedule_id"]] = {}
+        for action in sched_cfg.get("actions", []):
+            try:
+                bound[action] = compile_action(action)  # parsed once here, not at every run
+            except Exception as e:
+                logger.error(f"Invalid action {action!r} in {sched_cfg['schedule_id']}: {e}")
         trigger = CronTrigger.from_crontab(sched_cfg["cron"])
         self.scheduler.add_job(
             self._execute_schedule,
@@ -51,13 +58,19 @@ class ScheduleService(BaseService[None, None, None]):
 
     async def _execute_schedule(self, sched_cfg):
         track_id = str(uuid.uuid4())
+        schedule_id = sched_cfg["schedule_id"]
+        bound = self._actions.get(schedule_id, {})
 
         for action in sched_cfg.get("actions", []):
+            if action in bound:
+                await bound[action]("SCHEDULER", track_id, schedule_id)
+                continue
+            # Not registered, or invalid: parsed now, raising for invalid ones
             await execute_action(
                 action_str=action,
                 identifier="SCHEDULER",
                 track_id=track_id,
-                rule_id=sched_cfg["schedule_id"],
+                rule_id=schedule_id,
             )
 
     def should_accept_update(self, msg: None) -> bool:
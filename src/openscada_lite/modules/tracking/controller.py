@@ -19,6 +19,9 @@ from openscada_lite.common.models.dtos import DataFlowEventMsg, StatusDTO
 
 
 class TrackingController(BaseController[DataFlowEventMsg, None]):
+    # Every data flow event is shown, not just the last one per id
+    dedup_live_feed = False
+
     def __init__(self, model, socketio, module_name: str, router: APIRouter):
         # No incoming requests, so use None as dummy u_cls
         super().__init__(model, socketio, DataFlowEventMsg, None, module_name, router)
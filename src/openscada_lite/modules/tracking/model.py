@@ -14,7 +14,6 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
-from collections import OrderedDict
 from openscada_lite.common.models.dtos import DataFlowEventMsg
 from openscada_lite.modules.base.base_model import BaseModel
 
@@ -23,8 +22,8 @@ class TrackingModel(BaseModel[DataFlowEventMsg]):
     MAX_ENTRIES = 100
 
     def __init__(self):
-        # Use OrderedDict to maintain insertion order for rotation
-        self._store = OrderedDict()
+        # The store keeps insertion order, the oldest entries are rotated out
+        super().__init__()
 
     def update(self, msg: DataFlowEventMsg):
         """
@@ -1,12 +1,34 @@
 import { useEffect, useRef, useState } from "react";
 
-// Live feed hook: only for real-time updates
-export function useLiveFeed(endpoint, updateMsgType, getKey) {
+// Items of a live feed payload: a list of objects, a single object, or the columnar
+// {columns, rows} wire format of modules configured with "wire_format": "columnar".
+function decodeItems(payload) {
+  if (payload && Array.isArray(payload.columns) && Array.isArray(payload.rows)) {
+    const { columns, rows } = payload;
+    return rows.map(row => {
+      const item = {};
+      columns.forEach((column, i) => { item[column] = row[i]; });
+      return item;
+    });
+  }
+  return Array.isArray(payload) ? payload : payload ? [payload] : [];
+}
+
+// Live feed hook: only for real-time updates.
+// An optional filter (list of patterns such as ["WaterTank@*"]) limits the feed to the
+// datapoints, SVGs or GIS icons the view actually shows.
+export function useLiveFeed(endpoint, updateMsgType, getKey, filter) {
   const [items, setItems] = useState({});
   const socketRef = useRef(null);
+  // {epoch, version} of the state we hold, sent after the initial state and after every live
+  // batch, so a reconnect only asks for what changed since
+  const stateVersionRef = useRef(null);
+  const filterKey = filter ? JSON.stringify(filter) : "";
 
   useEffect(() => {
     let socket;
+    // A new subscription (e.g. another filter) cannot resume from the previous state
+    stateVersionRef.current = null;
     function setupSocket() {
       socket = globalThis.io({
         path: "/socket.io/",
@@ -17,12 +39,34 @@ export function useLiveFeed(endpoint, updateMsgType, getKey) {
       socketRef.current = socket;
 
       socket.on("connect", () => {
-        socket.emit(`${endpoint}_subscribe_live_feed`);
+        const subscription = { ...stateVersionRef.current };
+        if (filterKey) subscription.filter = JSON.parse(filterKey);
+        socket.emit(`${endpoint}_subscribe_live_feed`, subscription);
+      });
+
+      socket.on(`${endpoint}_state_version`, (stateVersion) => {
+        stateVersionRef.current = stateVersion;
+      });
+
+      socket.on(`${endpoint}_resume_state`, ({ updates = [], removed = [] }) => {
+        setItems(prev => {
+          const copy = { ...prev };
+          // Removed items come as their last state, so they are found under our own keys
+          decodeItems(removed).forEach(item => {
+            const key = getKey(item);
+            if (key) delete copy[key];
+          });
+          decodeItems(updates).forEach(item => {
+            const key = getKey(item);
+            if (key) copy[key] = item;
+          });
+          return copy;
+        });
       });
 
-      socket.on(`${endpoint}_initial_state`, (list) => {
-        console.log(`[${endpoint}] Received initial state with ${Array.isArray(list) ? list.length : 0} items.`); 
-        const arr = Array.isArray(list) ? list : list ? [list] : [];
+      socket.on(`${endpoint}_initial_state`, (payload) => {
+        const arr = decodeItems(payload);
+        console.log(`[${endpoint}] Received initial state with ${arr.length} items.`);
         const map = {};
         arr.forEach(item => {
           const key = getKey(item);
@@ -32,7 +76,7 @@ export function useLiveFeed(endpoint, updateMsgType, getKey) {
       });
 
       socket.on(`${endpoint}_${updateMsgType.toLowerCase()}`, (itemOrList) => {
-        const arr = Array.isArray(itemOrList) ? itemOrList : [itemOrList];
+        const arr = decodeItems(itemOrList);
         setItems(prev => {
           const copy = { ...prev };
           arr.forEach(item => {
@@ -57,7 +101,7 @@ export function useLiveFeed(endpoint, updateMsgType, getKey) {
         script.remove();
       };
     }
-  }, [endpoint, updateMsgType, getKey]);
+  }, [endpoint, updateMsgType, getKey, filterKey]);
 
   return [items, setItems];
 }
@@ -665,6 +665,71 @@ export class Api<
         ...params,
       }),
   };
+  metrics = {
+    /**
+     * No description
+     *
+     * @tags metrics
+     * @name GetBusMetrics
+     * @summary Get Bus Metrics
+     * @request GET:/metrics/bus
+     */
+    getBusMetrics: (params: RequestParams = {}) =>
+      this.request<any, any>({
+        path: `/metrics/bus`,
+        method: "GET",
+        format: "json",
+        ...params,
+      }),
+
+    /**
+     * No description
+     *
+     * @tags metrics
+     * @name GetLiveFeedMetrics
+     * @summary Get Live Feed Metrics
+     * @request GET:/metrics/live_feeds
+     */
+    getLiveFeedMetrics: (params: RequestParams = {}) =>
+      this.request<any, any>({
+        path: `/metrics/live_feeds`,
+        method: "GET",
+        format: "json",
+        ...params,
+      }),
+  };
+  rule = {
+    /**
+     * No description
+     *
+     * @tags rule
+     * @name GetRuleProfile
+     * @summary Get Rule Profile
+     * @request GET:/rule/profile
+     */
+    getRuleProfile: (
+      query?: {
+        /**
+         * Top
+         * @default 10
+         */
+        top?: number;
+        /**
+         * Order
+         * @default "total_time"
+         */
+        order?: string;
+      },
+      params: RequestParams = {},
+    ) =>
+      this.request<any, HTTPValidationError>({
+        path: `/rule/profile`,
+        method: "GET",
+        query: query,
+        format: "json",
+        ...params,
+      }),
+  };
   streams = {
     /**
      * No description
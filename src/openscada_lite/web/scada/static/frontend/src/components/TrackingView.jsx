@@ -1,9 +1,48 @@
 import React, { useState, useMemo, useEffect } from "react";
 import { useLiveFeed } from "liveFeed";
+import { Api } from "generatedApi";
 import { useUserAction } from "../contexts/UserActionContext"; // <-- import
 
 
 const MAX_EVENTS = 100;
+const SLOW_RULES = 10;
+const PROFILE_REFRESH_MS = 5000;
+
+function formatMs(seconds) {
+  return ((seconds || 0) * 1000).toFixed(3);
+}
+
+/**
+ * Polls the rule engine profiler for the rules with the most evaluation time
+ */
+function useRuleProfile() {
+  const [profile, setProfile] = useState(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    const api = new Api();
+
+    async function loadProfile() {
+      try {
+        const res = await api.rule.getRuleProfile({ top: SLOW_RULES });
+        if (!cancelled && res?.data) {
+          setProfile(res.data);
+        }
+      } catch (err) {
+        console.error("Failed to fetch rule profile:", err);
+      }
+    }
+
+    loadProfile();
+    const timer = setInterval(loadProfile, PROFILE_REFRESH_MS);
+    return () => {
+      cancelled = true;
+      clearInterval(timer);
+    };
+  }, []);
+
+  return profile;
+}
 
 function eventKey(event) {
   return (
@@ -18,6 +57,7 @@ function eventKey(event) {
 export default function TrackingView() {
   const [eventsObj] = useLiveFeed("tracking", "datafloweventmsg", eventKey);
   const {setPayload } = useUserAction(); // <-- get setter
+  const ruleProfile = useRuleProfile();
 
   const [trackIdFilter, setTrackIdFilter] = useState("");
   const [eventTypeFilter, setEventTypeFilter] = useState("");
@@ -151,6 +191,43 @@ export default function TrackingView() {
           )}
         </tbody>
       </table>
+
+      {/* 🐢 Slow Rules */}
+      {ruleProfile?.profiling && (
+        <>
+          <h2>Slow Rules</h2>
+          <p>
+            {ruleProfile.rules} rules, {ruleProfile.evaluations} evaluations,{" "}
+            {formatMs(ruleProfile.total_time)} ms evaluating, {ruleProfile.errors} errors
+          </p>
+          <table id="slow-rules-table" style={{ width: "100%", borderCollapse: "collapse" }}>
+            <thead>
+              <tr style={{ background: "#f8f8f8" }}>
+                <th>Rule</th>
+                <th>Evaluations</th>
+                <th>Total (ms)</th>
+                <th>Mean (ms)</th>
+                <th>Max (ms)</th>
+                <th>Activations</th>
+                <th>Errors</th>
+              </tr>
+            </thead>
+            <tbody>
+              {ruleProfile.top.map((rule) => (
+                <tr key={rule.rule_id} style={{ borderBottom: "1px solid #ddd" }}>
+                  <td>{rule.rule_id}</td>
+                  <td>{rule.evaluations}</td>
+                  <td>{formatMs(rule.total_time)}</td>
+                  <td>{formatMs(rule.mean_time)}</td>
+                  <td>{formatMs(rule.max_time)}</td>
+                  <td>{rule.activations}</td>
+                  <td>{rule.errors}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </>
+      )}
     </div>
   );
 }
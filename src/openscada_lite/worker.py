@@ -0,0 +1,82 @@
+# -----------------------------------------------------------------------------
+# Copyright 2025 Daniel&Hector Fernandez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""
+Worker process entry point, started by the BusHub of the main process:
+
+    python -m openscada_lite.worker --group rules --socket /tmp/openscada-bus-xxx/bus.sock
+
+Loads the modules configured with "worker": "<group>" on its own EventBus, connected to the
+main process bus. Their controllers are headless: the HTTP and Socket.IO API is only served by
+the main process, so only modules whose controller sets runs_in_worker can be configured here.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import logging.config
+
+import socketio
+from fastapi import FastAPI
+
+from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.bus.transport import connect_to_hub
+from openscada_lite.common.config.config import Config
+from openscada_lite.common.tracking.publisher import TrackingPublisher
+from openscada_lite.modules.loader import module_loader
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker(group: str, socket_path: str):
+    event_bus = EventBus.get_instance()
+    system_config = Config.get_instance().load_system_config()
+    event_bus.configure(Config.get_instance().get_event_bus_config())
+
+    publisher = TrackingPublisher.get_instance()
+    publisher.initialize(asyncio.get_running_loop())
+
+    hub = await connect_to_hub(event_bus, socket_path, group)
+    await module_loader(system_config, socketio.AsyncServer(), event_bus, FastAPI(), group)
+    hub.send_interest(event_bus.subscribed_event_types())
+    publisher.enable()
+    logger.info(f"[WORKER] {group} ready")
+
+    # The main process owns the worker: exit when it goes away
+    await hub.closed.wait()
+    publisher.shutdown()
+    logger.info(f"[WORKER] {group} stopped")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="OpenSCADA-Lite module worker")
+    parser.add_argument("--group", required=True, help="Worker group to load")
+    parser.add_argument("--socket", required=True, help="Unix socket of the main process bus")
+    parser.add_argument("--logging-config", help="Logging config file")
+    parsed = parser.parse_args(args)
+
+    if parsed.logging_config:
+        with open(parsed.logging_config, "r") as f:
+            logging.config.dictConfig(json.load(f))
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    asyncio.run(run_worker(parsed.group, parsed.socket))
+
+
+if __name__ == "__main__":
+    main()
@@ -250,3 +250,36 @@ async def test_alarm_active_inactive_ack():
     assert alarm_update1.isFinished() is False
     assert alarm_update2.isFinished() is False
     assert alarm_update3.isFinished() is True
+
+
+@pytest.mark.asyncio
+async def test_alarm_lifecycle_with_zero_copy_bus():
+    bus = EventBus.get_instance()
+    bus.configure({"copy_on_publish": False})
+    model = AlarmModel()
+    service = AlarmService(bus, model, controller=None)
+
+    updates = []
+
+    async def capture(data):
+        updates.append(data)
+
+    bus.subscribe(EventType.ALARM_UPDATE, capture)
+
+    await bus.publish(
+        EventType.RAISE_ALARM,
+        RaiseAlarmMsg(datapoint_identifier="tag1", timestamp=datetime.now(), rule_id="rule1"),
+    )
+    await bus.publish(
+        EventType.LOWER_ALARM,
+        LowerAlarmMsg(datapoint_identifier="tag1", rule_id="rule1"),
+    )
+    await service.handle_controller_message(
+        AckAlarmMsg(alarm_occurrence_id=updates[0].get_id())
+    )
+
+    # Published alarms are shared by reference and were never modified afterwards
+    assert updates[0].deactivation_time is None
+    assert updates[1].deactivation_time is not None
+    assert updates[2].isFinished()
+    assert model.get_all() == {}
@@ -15,7 +15,7 @@ class DummyEventBus:
     async def publish(self, event_type, data):
         pass  # Test does not require actual publishing
 
-    def subscribe(self, event_type, handler):
+    def subscribe(self, event_type, handler, **kwargs):
         pass  # To implement if needed by the test
 
 
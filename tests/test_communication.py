@@ -58,7 +58,7 @@ def dummy_event_bus():
         def publish(self, event_type, data):
             self.published.append((event_type, data))
 
-        def subscribe(self, event_type, handler):
+        def subscribe(self, event_type, handler, **kwargs):
             pass  # To implement if needed by the test
 
     return DummyEventBus()
@@ -286,6 +286,9 @@ async def test_emit_communication_status(monkeypatch):
         def get_types(self):
             return {}
 
+        def get_allowed_datapoint_identifiers(self):
+            return []
+
     monkeypatch.setattr(
         "openscada_lite.common.config.config.Config.get_instance", lambda: DummyConfig()
     )
@@ -0,0 +1,68 @@
+import pytest
+from asteval import Interpreter
+
+from openscada_lite.modules.rule.manager.condition_compiler import ConditionCompiler
+
+
+@pytest.fixture
+def interpreter():
+    interpreter = Interpreter()
+    interpreter.symtable.update(
+        {
+            "TRUE": True,
+            "OPENED": "OPENED",
+            "WaterTank__TANK": 42.5,
+            "WaterTank__PUMP": "OPENED",
+            "WaterTank__DOOR": None,
+        }
+    )
+    return interpreter
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        "WaterTank__TANK > 40",
+        "10 < WaterTank__TANK <= 50",
+        "float(WaterTank__TANK) < 10 or WaterTank__PUMP == OPENED",
+        "not WaterTank__DOOR and WaterTank__PUMP in ('OPENED', 'CLOSED')",
+        "abs(WaterTank__TANK - 50) * 2 ** 2 >= 30 if TRUE else False",
+        "round(WaterTank__TANK, ndigits=0) == 42",
+        "[WaterTank__TANK, 1][0] + sqrt(16) > 46",
+        "WaterTank__PUMP.lower() == 'opened'",  # attribute: interpreted by asteval
+        "sum([x for x in [1, 2]]) == 3",  # comprehension: interpreted by asteval
+    ],
+)
+def test_compiled_conditions_match_asteval(interpreter, condition):
+    compiled = ConditionCompiler(interpreter).compile(condition)
+    assert compiled() == interpreter(condition)
+
+
+def test_symbol_updates_are_seen_without_recompiling(interpreter):
+    compiled = ConditionCompiler(interpreter).compile("WaterTank__TANK > 50")
+    assert compiled() is False
+    interpreter.symtable["WaterTank__TANK"] = 60
+    assert compiled() is True
+
+
+def test_invalid_conditions(interpreter):
+    compiler = ConditionCompiler(interpreter)
+    assert compiler.compile("WaterTank__TANK >") is None
+    with pytest.raises(NameError):
+        compiler.compile("Unknown__TAG > 1")()
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        "__import__('os')",
+        "eval('1')",
+        "WaterTank__PUMP.__class__",
+        "10 ** 100000000 > 1",
+        "'x' * 100000000 == ''",
+    ],
+)
+def test_restrictions_of_asteval_are_kept(interpreter, condition):
+    compiled = ConditionCompiler(interpreter).compile(condition)
+    with pytest.raises(Exception):
+        compiled()
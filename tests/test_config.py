@@ -2,6 +2,7 @@ import os
 import pytest
 
 from openscada_lite.common.config.config import Config
+from openscada_lite.common.config.tag_registry import UNKNOWN_TAG, TagIndex, TagRegistry
 
 
 @pytest.fixture
@@ -67,3 +68,31 @@ def test_get_allowed_tags(sample_config_file):
         "AuxServer@TEMPERATURE",
     ]:
         assert tag in tags
+
+
+def test_tag_registry_assigns_dense_indexes(sample_config_file):
+    Config.reset_instance()
+    config = Config.get_instance(sample_config_file)
+    registry = TagRegistry.get_instance(config)
+    tags = config.get_allowed_datapoint_identifiers()
+    assert registry.names == tags
+    assert [registry.index_of(tag) for tag in tags] == list(range(len(tags)))
+    assert registry.name_of(registry.index_of("WaterTank@PUMP")) is registry.names[1]
+    assert registry.index_of("ServerX@UNKNOWN") == UNKNOWN_TAG
+    assert TagRegistry.get_instance() is registry
+
+    # A new config gets a new registry
+    Config.reset_instance()
+    assert TagRegistry.get_instance(Config.get_instance(sample_config_file)) is not registry
+
+
+def test_tag_index_looks_up_by_index_and_falls_back_to_name(sample_config_file):
+    registry = TagRegistry.get_instance(Config.get_instance(sample_config_file))
+    index = TagIndex(registry, {"WaterTank@TANK": "tank", "Other@TAG": "other"}, "none")
+    assert index.get(registry.index_of("WaterTank@TANK"), "WaterTank@TANK") == "tank"
+    assert index.get(registry.index_of("WaterTank@PUMP"), "WaterTank@PUMP") == "none"
+    assert index.get(UNKNOWN_TAG, "Other@TAG") == "other"
+    assert index.get(len(registry), "Other@TAG") == "other"
+    # An index stamped for another tag is not trusted
+    assert index.get(registry.index_of("WaterTank@TANK"), "Other@TAG") == "other"
+    assert index.get(registry.index_of("WaterTank@PUMP"), "WaterTank@TANK") == "tank"
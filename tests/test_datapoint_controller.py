@@ -53,8 +53,10 @@ def controller(model, socketio_mock):
     return controller
 
 
-def test_publish_tag_blocks_when_initializing(controller):
+@pytest.mark.asyncio
+async def test_publish_tag_is_held_while_initializing(controller):
     controller._initializing_clients.add("sid1")
+    controller._urgent = True
     controller.socketio.emit.reset_mock()
     controller.publish(
         TagUpdateMsg(
@@ -64,6 +66,7 @@ def test_publish_tag_blocks_when_initializing(controller):
             timestamp=datetime.datetime.now(),
         )
     )
+    await sleep(0.01)
     controller.socketio.emit.assert_not_called()
 
 
@@ -84,11 +87,9 @@ async def test_publish_tag_emits_when_no_initializing(controller):
     # Wait for the batch worker to process the buffer
     await sleep(1.1)  # Slightly longer than the batch interval (1 second)
 
-    # Assert that socketio.emit was called
-    controller.socketio.emit.assert_called_once()
-    args, _ = controller.socketio.emit.call_args
-    assert args[0] == "datapoint_tagupdatemsg"
-    assert any(tag["datapoint_identifier"] == "Test@TAG" and tag["value"] == 456 for tag in args[1])
+    # Assert that the batch was emitted
+    [batch] = _emits(controller, "datapoint_tagupdatemsg")
+    assert any(tag["datapoint_identifier"] == "Test@TAG" and tag["value"] == 456 for tag in batch)
 
 
 @pytest.mark.asyncio
@@ -179,3 +180,240 @@ async def test_set_tag_calls_service_and_emits_ack(controller):
         timestamp=test_data.timestamp,
     )
     test_controller.service.handle_controller_message.assert_called_once_with(expected_data)
+
+
+def _emits(controller, event):
+    return [c.args[1] for c in controller.socketio.emit.call_args_list if c.args[0] == event]
+
+
+@pytest.mark.asyncio
+async def test_reconnecting_client_only_receives_changes(controller, model):
+    controller.socketio.enter_room = AsyncMock()
+    await controller.handle_subscribe_live_feed("sid1")
+    state_version = _emits(controller, "datapoint_state_version")[-1]
+    assert state_version["epoch"] == model.epoch
+    assert state_version["version"] == model.version
+
+    model.update(TagUpdateMsg(datapoint_identifier="Test@TAG", value=7, quality="good"))
+    model._store.pop("Test@TAG")
+    model.update(TagUpdateMsg(datapoint_identifier="Test@NEW", value=1, quality="good"))
+    controller.socketio.emit.reset_mock()
+
+    await controller.handle_subscribe_live_feed("sid2", state_version)
+    assert not _emits(controller, "datapoint_initial_state")
+    [resume] = _emits(controller, "datapoint_resume_state")
+    assert [tag["datapoint_identifier"] for tag in resume["updates"]] == ["Test@NEW"]
+    # Removed items come as their last state, for clients keyed on other fields than get_id()
+    assert [(tag["datapoint_identifier"], tag["value"]) for tag in resume["removed"]] == [
+        ("Test@TAG", 7)
+    ]
+    assert _emits(controller, "datapoint_state_version")[-1]["version"] == model.version
+
+
+@pytest.mark.asyncio
+async def test_live_batches_advance_the_resume_version(controller, model):
+    controller.socketio.enter_room = AsyncMock()
+    controller._urgent = True
+    await controller.handle_subscribe_live_feed("sid1")
+    controller.socketio.emit.reset_mock()
+
+    model.update(TagUpdateMsg(datapoint_identifier="Test@TAG", value=8, quality="good"))
+    controller.publish(model.get("Test@TAG"))
+    await sleep(0.01)
+    assert len(_emits(controller, "datapoint_tagupdatemsg")) == 1
+    state_version = _emits(controller, "datapoint_state_version")[-1]
+    assert state_version["version"] == model.version
+
+    # Reconnecting after the batch replays nothing the client already has
+    controller.socketio.emit.reset_mock()
+    await controller.handle_subscribe_live_feed("sid1", state_version)
+    [resume] = _emits(controller, "datapoint_resume_state")
+    assert resume == {"updates": [], "removed": []}
+
+
+@pytest.mark.asyncio
+async def test_updates_published_while_a_client_subscribes_still_reach_the_room(
+    controller, model
+):
+    controller.socketio.enter_room = AsyncMock()
+    controller._urgent = True
+    await controller.handle_subscribe_live_feed("sid1")
+    controller.socketio.emit.reset_mock()
+
+    async def update_while_sending(event, payload, **recipients):
+        if event == "datapoint_initial_state":
+            model.update(TagUpdateMsg(datapoint_identifier="Test@TAG", value=8, quality="good"))
+            controller.publish(model.get("Test@TAG"))
+            await sleep(0.01)
+
+    controller.socketio.emit.side_effect = update_while_sending
+    await controller.handle_subscribe_live_feed("sid2")
+    assert not _emits(controller, "datapoint_tagupdatemsg")  # held until sid2 is in the room
+    await sleep(0.01)
+
+    room_events = [c.args[0] for c in controller.socketio.emit.call_args_list if "room" in c.kwargs]
+    assert room_events == ["datapoint_tagupdatemsg", "datapoint_state_version"]
+    assert _emits(controller, "datapoint_tagupdatemsg")[0][0]["value"] == 8
+    assert _emits(controller, "datapoint_state_version")[-1]["version"] == model.version
+
+
+@pytest.mark.asyncio
+async def test_unknown_epoch_gets_full_initial_state(controller, model):
+    controller.socketio.enter_room = AsyncMock()
+    await controller.handle_subscribe_live_feed("sid1", {"epoch": "other", "version": 1})
+    [state] = _emits(controller, "datapoint_initial_state")
+    assert len(state) == len(model.get_all())
+    assert not _emits(controller, "datapoint_resume_state")
+
+
+def test_initial_state_is_cached_until_the_model_changes(model):
+    version, first = model.get_state_dicts()
+    assert model.get_state_dicts()[1] is first
+    ids = [tag["datapoint_identifier"] for tag in first]
+    assert ids == sorted(ids)
+
+    model.update(TagUpdateMsg(datapoint_identifier="Test@TAG", value=5, quality="good"))
+    new_version, second = model.get_state_dicts()
+    assert new_version == version + 1
+    assert second is not first
+    assert next(t for t in second if t["datapoint_identifier"] == "Test@TAG")["value"] == 5
+
+
+@pytest.mark.asyncio
+async def test_filtered_subscription_only_receives_matching_datapoints(controller, model):
+    sio = controller.socketio
+    sio.enter_room = AsyncMock()
+    sio.leave_room = AsyncMock()
+    connected = {"sid1", "sid2", "sid3"}
+    sio.manager.is_connected = lambda sid, namespace: sid in connected
+    sio.manager.get_participants = lambda namespace, room: iter([])  # nobody unfiltered
+
+    model.update(TagUpdateMsg(datapoint_identifier="Pump@P1", value=1, quality="good"))
+    await controller.handle_subscribe_live_feed("sid1", {"filter": ["Test@*"]})
+    [state] = _emits(controller, "datapoint_initial_state")
+    assert [tag["datapoint_identifier"] for tag in state] == ["Test@TAG"]
+    sio.leave_room.assert_awaited_with("sid1", "datapoint_room")
+    sio.enter_room.assert_not_called()
+
+    await controller.handle_subscribe_live_feed("sid2", {"filter": ["Test@*"]})
+    await controller.handle_subscribe_live_feed("sid3", {"filter": ["Pump@P1"]})
+    sio.emit.reset_mock()
+    await controller._emit_batch(
+        [
+            ("Test@TAG", {"datapoint_identifier": "Test@TAG"}),
+            ("Pump@P1", {"datapoint_identifier": "Pump@P1"}),
+            ("Other@X", {"datapoint_identifier": "Other@X"}),
+        ]
+    )
+    sent = {tuple(c.kwargs["to"]): c.args[1] for c in sio.emit.call_args_list}
+    assert sent == {
+        ("sid1", "sid2"): [{"datapoint_identifier": "Test@TAG"}],
+        ("sid3",): [{"datapoint_identifier": "Pump@P1"}],
+    }
+
+    # Disconnected clients are dropped from the index at the next batch
+    connected.discard("sid3")
+    sio.emit.reset_mock()
+    await controller._emit_batch([("Pump@P1", {"datapoint_identifier": "Pump@P1"})])
+    sio.emit.assert_not_called()
+    assert "sid3" not in controller._sid_filters
+
+
+@pytest.mark.asyncio
+async def test_batch_flushes_when_size_threshold_is_reached(controller):
+    controller._max_batch = 3
+    controller._idle_gap = 10
+    controller.socketio.emit.reset_mock()
+    for value in range(3):
+        controller.publish(TagUpdateMsg(datapoint_identifier=f"Test@TAG{value}", value=value))
+    await sleep(0.01)
+    assert len(_emits(controller, "datapoint_tagupdatemsg")) == 1
+    metrics = controller.get_feed_metrics()
+    assert metrics["flushes"]["size"] == 1
+    assert metrics["last_batch_size"] == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_flushes_after_idle_gap_or_deadline(controller):
+    controller._idle_gap = 0.05
+    controller._batch_interval = 0.2
+    controller.socketio.emit.reset_mock()
+    controller.publish(TagUpdateMsg(datapoint_identifier="Test@TAG", value=1))
+    await sleep(0.1)
+    assert controller.get_feed_metrics()["flushes"]["idle"] == 1
+
+    # A steady stream never leaves an idle gap, the deadline bounds the delay
+    for _ in range(10):
+        controller.publish(TagUpdateMsg(datapoint_identifier="Test@TAG", value=2))
+        await sleep(0.03)
+    metrics = controller.get_feed_metrics()
+    assert metrics["flushes"]["deadline"] >= 1
+    assert metrics["max_delay"] < 0.3
+
+
+@pytest.mark.asyncio
+async def test_urgent_live_feed_is_sent_immediately(controller):
+    controller._urgent = True
+    controller.socketio.emit.reset_mock()
+    controller.publish(TagUpdateMsg(datapoint_identifier="Test@TAG", value=1))
+    await sleep(0.01)
+    assert len(_emits(controller, "datapoint_tagupdatemsg")) == 1
+    assert controller.get_feed_metrics()["flushes"]["urgent"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_only_latest_message_per_id(controller):
+    controller.socketio.emit.reset_mock()
+    for value in range(20):
+        controller.publish(TagUpdateMsg(datapoint_identifier="Test@TAG", value=value))
+    controller.publish_many(
+        [
+            TagUpdateMsg(datapoint_identifier="Test@OTHER", value=1),
+            TagUpdateMsg(datapoint_identifier="Test@OTHER", value=2),
+        ]
+    )
+    await sleep(0.3)
+    [batch] = _emits(controller, "datapoint_tagupdatemsg")
+    assert [(item["datapoint_identifier"], item["value"]) for item in batch] == [
+        ("Test@TAG", 19),
+        ("Test@OTHER", 2),
+    ]
+    assert controller.get_feed_metrics()["superseded"] == 20
+
+
+@pytest.mark.asyncio
+async def test_batch_without_dedup_keeps_every_message(controller):
+    controller._dedup = False
+    controller.socketio.emit.reset_mock()
+    for value in range(3):
+        controller.publish(TagUpdateMsg(datapoint_identifier="Test@TAG", value=value))
+    await sleep(0.3)
+    [batch] = _emits(controller, "datapoint_tagupdatemsg")
+    assert [item["value"] for item in batch] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_columnar_wire_format(controller, model):
+    controller._wire_format = "columnar"
+    controller.socketio.enter_room = AsyncMock()
+    await controller.handle_subscribe_live_feed("sid1")
+    await controller.handle_subscribe_live_feed("sid2")
+    first, second = _emits(controller, "datapoint_initial_state")
+    assert second is first  # encoded once for both clients
+    items = [dict(zip(first["columns"], row)) for row in first["rows"]]
+    assert {i["datapoint_identifier"]: i["value"] for i in items}["Test@TAG"] == 123
+
+    controller.publish(TagUpdateMsg(datapoint_identifier="Test@TAG", value=5))
+    await sleep(0.3)
+    batch = _emits(controller, "datapoint_tagupdatemsg")[-1]
+    assert [dict(zip(batch["columns"], r))["value"] for r in batch["rows"]] == [5]
+
+
+def test_to_columnar_fills_missing_columns():
+    from openscada_lite.common.utils.WireUtils import to_columnar
+
+    assert to_columnar([{"a": 1, "b": 2}, {"a": 3, "c": 4}]) == {
+        "columns": ["a", "b", "c"],
+        "rows": [[1, 2, None], [3, None, 4]],
+    }
+    assert to_columnar([{"a": 1}, {"a": 2}]) == {"columns": ["a"], "rows": [[1], [2]]}
@@ -114,3 +114,123 @@ async def test_update_invalid_tag():
     # Should not appear in internal state
     tag = dp_engine.model.get("ServerX.UNKNOWN_TAG")
     assert tag is None
+
+
+@pytest.mark.asyncio
+async def test_publish_many_updates_model_and_forwards_one_batch():
+    bus = EventBus.get_instance()
+    dp_engine = DatapointService(bus, DatapointModel(), None)
+    batches = []
+
+    async def capture(msg: TagUpdateMsg):
+        batches.append([msg])
+
+    async def capture_batch(msgs):
+        batches.append(msgs)
+
+    bus.subscribe(EventType.TAG_UPDATE, capture, batch_callback=capture_batch)
+
+    now = datetime.datetime.now()
+    await bus.publish_many(
+        EventType.RAW_TAG_UPDATE,
+        [
+            RawTagUpdateMsg("WaterTank@TANK", 10.0, "good", now),
+            RawTagUpdateMsg("Unknown@TAG", 1, "good", now),  # rejected
+            RawTagUpdateMsg("WaterTank@PUMP", "OPENED", "good", now),
+        ],
+    )
+
+    assert dp_engine.model.get("WaterTank@TANK").value == 10.0
+    assert dp_engine.model.get("WaterTank@PUMP").value == "OPENED"
+    assert len(batches) == 1
+    assert [m.datapoint_identifier for m in batches[0]] == ["WaterTank@TANK", "WaterTank@PUMP"]
+
+
+@pytest.fixture
+def columnar_model(monkeypatch):
+    monkeypatch.setattr(Config, "get_module_config", lambda self, name: {"store": "columnar"})
+    return DatapointModel()
+
+
+@pytest.mark.asyncio
+async def test_columnar_model_round_trips_tags(columnar_model):
+    bus = EventBus.get_instance()
+    dp_engine = DatapointService(bus, columnar_model, None)
+    assert columnar_model.get("WaterTank@TANK").quality == "unknown"
+
+    now = datetime.datetime.now()
+    for value in (55.5, 7, True, "OPEN", None):
+        await dp_engine.handle_bus_message(RawTagUpdateMsg("WaterTank@TANK", value, "bad", now))
+        tag = columnar_model.get("WaterTank@TANK")
+        assert tag.value == value and type(tag.value) is type(value)
+        assert tag.quality == "bad" and tag.timestamp == now
+        assert tag.to_dict() in columnar_model.get_state_dicts()[1]
+
+    # Older updates are still rejected
+    old = now - datetime.timedelta(seconds=1)
+    await dp_engine.handle_bus_message(RawTagUpdateMsg("WaterTank@TANK", 1.0, "good", old))
+    assert columnar_model.get("WaterTank@TANK").timestamp == now
+
+
+def test_columnar_model_snapshot_and_bulk_update(columnar_model):
+    tags = sorted(columnar_model.get_all())
+    version = columnar_model.version
+    now = datetime.datetime.now()
+    columnar_model.bulk_update(tags[:2], [10.5, 20], timestamp=now)
+
+    updates, removed = columnar_model.get_changes_since(version)
+    assert [(u["datapoint_identifier"], u["value"]) for u in updates] == [
+        (tags[0], 10.5),
+        (tags[1], 20),
+    ]
+    assert removed == []
+    columns = columnar_model.snapshot()
+    assert columns.version == columnar_model.version
+    row = columns.ids.index(tags[1])
+    assert columns.values[row] == 20
+    assert columns.quality_names[columns.qualities[row]] == "good"
+
+    version = columnar_model.version
+    row = columns.ids.index(tags[0])
+    columnar_model._store.pop(tags[0])
+    assert columnar_model.get(tags[0]) is None
+    assert columnar_model.snapshot().ids[row] is None
+    assert columnar_model.snapshot().ids.count(None) == 1
+    # The removed tag resumes as its last state, whichever row it held
+    updates, removed = columnar_model.get_changes_since(version)
+    assert updates == []
+    assert [(r["datapoint_identifier"], r["value"]) for r in removed] == [(tags[0], 10.5)]
+
+
+def test_columnar_model_serializes_rows_with_and_without_a_timestamp(columnar_model):
+    tags = sorted(columnar_model.get_all())
+    now = datetime.datetime.now()
+    columnar_model.bulk_update(tags[:2], [None, None], timestamp=now)
+    columnar_model.get_state_dicts()
+    columnar_model.bulk_update(tags[2:3], [1.5])
+
+    by_id = {item["datapoint_identifier"]: item for item in columnar_model.get_state_dicts()[1]}
+    assert by_id[tags[0]]["timestamp"] == now.isoformat()
+    assert by_id[tags[2]]["timestamp"] is None and by_id[tags[2]]["value"] == 1.5
+    assert by_id[tags[2]] == columnar_model.get(tags[2]).to_dict()
+
+
+@pytest.mark.asyncio
+async def test_published_updates_carry_the_tag_index():
+    bus = EventBus.get_instance()
+    model = DatapointModel()
+    dp_engine = DatapointService(bus, model, None)
+    results = []
+
+    async def capture(msg: TagUpdateMsg):
+        results.append(msg)
+
+    bus.subscribe(EventType.TAG_UPDATE, capture)
+
+    identifier = "".join(["WaterTank@", "PUMP"])  # not the interned string
+    await dp_engine.handle_bus_message(RawTagUpdateMsg(identifier, "OPENED"))
+    await asyncio.sleep(0.01)
+
+    registry = model.tag_registry
+    assert results[0].tag_index == registry.index_of("WaterTank@PUMP")
+    assert results[0].datapoint_identifier is registry.name_of(results[0].tag_index)
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from asteval import Interpreter
+
+from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.bus.event_types import EventType
+from openscada_lite.common.models.dtos import SendCommandMsg, TagUpdateMsg
+from openscada_lite.common.models.entities import DerivedTag, Rule
+from openscada_lite.modules.rule.manager.condition_compiler import ConditionCompiler
+from openscada_lite.modules.rule.manager.derived_tags import DerivedTagGraph
+from openscada_lite.modules.rule.manager.rule_manager import RuleEngine
+
+
+def graph(*derived, datapoints=()):
+    interpreter = Interpreter()
+    return DerivedTagGraph(
+        [DerivedTag(name, expression) for name, expression in derived],
+        ConditionCompiler(interpreter),
+        lambda tag: tag.replace("@", "__", 1),
+        datapoints,
+    )
+
+
+def set_tag(derived_graph, tag, value, quality="good"):
+    derived_graph._symtable[tag.replace("@", "__", 1)] = value
+    return derived_graph.update(tag, quality)
+
+
+def test_only_affected_tags_are_recomputed_in_topological_order():
+    derived_graph = graph(
+        ("Calc@TOTAL", "Calc@IN_SUM + Calc@LIMIT"),
+        ("Calc@IN_SUM", "Plant@A + Plant@B"),
+        ("Calc@LIMIT", "min(Plant@B, 10)"),
+        ("Calc@OTHER", "Plant@C * 2"),
+    )
+    assert set_tag(derived_graph, "Plant@A", 1) == [
+        ("Calc@IN_SUM", None, "unknown"),
+        ("Calc@TOTAL", None, "unknown"),
+    ]
+    assert set_tag(derived_graph, "Plant@B", 2) == [
+        ("Calc@IN_SUM", 3, "good"),
+        ("Calc@LIMIT", 2, "good"),
+        ("Calc@TOTAL", 5, "good"),
+    ]
+    # Calc@LIMIT does not change, Calc@TOTAL is recomputed once, after Calc@IN_SUM
+    set_tag(derived_graph, "Plant@B", 20)
+    assert set_tag(derived_graph, "Plant@B", 30) == [
+        ("Calc@IN_SUM", 31, "good"),
+        ("Calc@TOTAL", 41, "good"),
+    ]
+    assert set_tag(derived_graph, "Plant@A", 1) == []
+    assert set_tag(derived_graph, "Plant@A", 1, "bad") == [
+        ("Calc@IN_SUM", 31, "bad"),
+        ("Calc@TOTAL", 41, "bad"),
+    ]
+
+
+def test_a_scan_recomputes_each_derived_tag_once():
+    derived_graph = graph(
+        ("Calc@TOTAL", "Calc@IN_SUM + Calc@LIMIT"),
+        ("Calc@IN_SUM", "Plant@A + Plant@B"),
+        ("Calc@LIMIT", "min(Plant@B, 10)"),
+    )
+    evaluated = []
+    evaluate = derived_graph._evaluate
+
+    def count(name):
+        evaluated.append(name)
+        return evaluate(name)
+
+    derived_graph._evaluate = count
+    derived_graph._symtable.update(Plant__A=1, Plant__B=2)
+    assert derived_graph.update_many([("Plant@A", "good"), ("Plant@B", "good")]) == [
+        ("Calc@IN_SUM", 3, "good"),
+        ("Calc@LIMIT", 2, "good"),
+        ("Calc@TOTAL", 5, "good"),
+    ]
+    assert evaluated == ["Calc@IN_SUM", "Calc@LIMIT", "Calc@TOTAL"]
+
+
+def test_failing_expressions_are_bad_and_logged(caplog):
+    derived_graph = graph(("Calc@RATIO", "Plant@A / Plant@B"))
+    set_tag(derived_graph, "Plant@A", 1)
+    with caplog.at_level("ERROR"):
+        assert set_tag(derived_graph, "Plant@B", 0) == [("Calc@RATIO", None, "bad")]
+    assert "Calc@RATIO" in caplog.text and "division by zero" in caplog.text
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        graph(("Calc@A", "Calc@B + 1"), ("Calc@B", "Calc@C + 1"), ("Calc@C", "Calc@A + 1"))
+    with pytest.raises(ValueError, match="cycle"):
+        graph(("Calc@A", "Calc@A + 1"))
+    with pytest.raises(ValueError, match="more than once"):
+        graph(("Calc@A", "Plant@A"), ("Calc@A", "Plant@B"))
+    with pytest.raises(ValueError, match="driver datapoint"):
+        graph(("Plant@A", "Plant@B"), datapoints=["Plant@A"])
+
+
+@pytest.mark.asyncio
+async def test_derived_tags_are_published_and_trigger_rules():
+    EventBus.get_instance().clear_subscribers()
+    RuleEngine.reset_instance()
+    bus = EventBus.get_instance()
+    engine = RuleEngine.get_instance()
+    engine.derived_tags = [DerivedTag("Calc@DIFF", "Plant@IN - Plant@OUT")]
+    engine.rules = [
+        Rule(
+            rule_id="leak",
+            on_condition="Calc@DIFF > 5",
+            on_actions=["send_command('Plant@VALVE', 0)"],
+        )
+    ]
+    engine.build_tag_to_rules_index()
+    updates, commands = [], []
+
+    async def capture_update(msg: TagUpdateMsg):
+        updates.append(msg)
+
+    async def capture_command(msg: SendCommandMsg):
+        commands.append(msg)
+
+    bus.subscribe(EventType.TAG_UPDATE, capture_update)
+    bus.subscribe(EventType.SEND_COMMAND, capture_command)
+
+    await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="Plant@IN", value=10))
+    source = TagUpdateMsg(datapoint_identifier="Plant@OUT", value=3)
+    await bus.publish(EventType.TAG_UPDATE, source)
+    await asyncio.sleep(0.01)
+
+    derived = [msg for msg in updates if msg.datapoint_identifier == "Calc@DIFF"]
+    assert [(msg.value, msg.quality) for msg in derived] == [(None, "unknown"), (7, "good")]
+    assert derived[-1].track_id == source.track_id
+    assert len(commands) == 1
+    EventBus.get_instance().clear_subscribers()
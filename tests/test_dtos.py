@@ -0,0 +1,111 @@
+import copy
+import datetime
+import pickle
+from dataclasses import FrozenInstanceError, asdict, dataclass, fields
+
+import pytest
+
+from openscada_lite.common.models.dtos import (
+    AnimationUpdateMsg,
+    DataFlowEventMsg,
+    DTO,
+    TagUpdateMsg,
+    make_json_serializable,
+)
+from openscada_lite.common.tracking.tracking_types import DataFlowStatus
+
+
+def _asdict_json(msg):
+    d = make_json_serializable(asdict(msg))
+    for f in fields(msg):
+        if f.name.startswith("_") or not f.metadata.get("serialize", True):
+            del d[f.name]
+    return d
+
+
+def test_to_dict_matches_asdict_serialization():
+    now = datetime.datetime.now()
+    messages = [
+        TagUpdateMsg(datapoint_identifier="WaterTank@LEVEL", value=1.5, timestamp=now),
+        DataFlowEventMsg(
+            event_type="TagUpdateMsg",
+            source="datapoint",
+            status=DataFlowStatus.FORWARDED,
+            timestamp=now,
+            payload={"at": now, "values": [now, 1]},
+        ),
+    ]
+    for msg in messages:
+        assert msg.to_dict() == _asdict_json(msg)
+    assert messages[1].to_dict()["status"] == DataFlowStatus.FORWARDED.value
+    assert messages[1].to_dict()["payload"]["values"][0] == now.isoformat()
+
+
+def test_to_dict_copies_mutable_fields():
+    msg = AnimationUpdateMsg(
+        svg_name="plant.svg",
+        element_id="tank1",
+        animation_type="fill",
+        value=1.0,
+        config={"attr": {"height": 1}},
+    )
+    msg.to_dict()["config"]["attr"]["height"] = 2
+    assert msg.config == {"attr": {"height": 1}}
+
+
+def test_subclasses_get_their_own_serializer():
+    @dataclass(slots=True)
+    class LabelledTagUpdateMsg(TagUpdateMsg):
+        label: str = "level"
+
+    assert issubclass(LabelledTagUpdateMsg, DTO)
+    assert TagUpdateMsg(datapoint_identifier="a", value=1).to_dict().get("label") is None
+    assert LabelledTagUpdateMsg(datapoint_identifier="a", value=1).to_dict()["label"] == "level"
+
+
+def test_dtos_are_slotted_with_unique_track_ids():
+    first = TagUpdateMsg(datapoint_identifier="a", value=1)
+    second = TagUpdateMsg(datapoint_identifier="a", value=1)
+    assert not hasattr(first, "__dict__")
+    assert first.track_id != second.track_id
+    with pytest.raises(AttributeError):
+        first.unknown = 1
+
+
+def test_tag_index_is_not_serialized():
+    msg = TagUpdateMsg(datapoint_identifier="a", value=1, tag_index=3)
+    assert "tag_index" not in msg.to_dict()
+    assert msg == TagUpdateMsg(datapoint_identifier="a", value=1, track_id=msg.track_id)
+    assert pickle.loads(pickle.dumps(msg)).tag_index == 3
+
+
+@pytest.mark.parametrize(
+    "clone", [copy.copy, copy.deepcopy, lambda m: pickle.loads(pickle.dumps(m))]
+)
+def test_copies_keep_fields_and_come_back_modifiable(clone):
+    msg = TagUpdateMsg(datapoint_identifier="a", value=1)
+    copied = clone(msg)
+    assert copied == msg and copied.track_id == msg.track_id
+    copied.value = 2
+    assert msg.value == 1
+
+    frozen = msg.freeze()
+    thawed = clone(frozen)
+    assert type(thawed) is TagUpdateMsg and not thawed.frozen
+    assert thawed == frozen and thawed.track_id == msg.track_id
+    thawed.value = 3
+    assert frozen.value == 1
+
+
+def test_freeze_makes_a_read_only_copy():
+    msg = TagUpdateMsg(datapoint_identifier="a", value=1)
+    frozen = msg.freeze()
+    assert frozen.frozen and frozen is not msg and frozen.freeze() is frozen
+    assert frozen == msg and msg == frozen and isinstance(frozen, TagUpdateMsg)
+    assert type(frozen).__name__ == "TagUpdateMsg" and repr(frozen) == repr(msg)
+    assert frozen.to_dict() == msg.to_dict()
+    with pytest.raises(FrozenInstanceError):
+        frozen.value = 3
+    msg.value = 2  # the publisher's own DTO stays modifiable
+    assert not msg.frozen and frozen.value == 1
+    assert "_mutable_class" not in {f.name for f in fields(frozen)}
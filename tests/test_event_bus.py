@@ -1,8 +1,20 @@
 import asyncio
+import time
+from dataclasses import FrozenInstanceError, replace
 import pytest
 from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.bus.subscriber_queue import OverflowPolicy
+from openscada_lite.common.bus.transport import (
+    FRAME_EVENTS,
+    FRAME_INTEREST,
+    BusHub,
+    StreamTransport,
+    encode_frame,
+    read_frame,
+)
 from openscada_lite.common.bus.event_types import EventType
 from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.modules.loader import get_worker_groups
 
 
 # Reset the bus for each test
@@ -72,3 +84,539 @@ async def test_publish_no_subscribers():
     bus = EventBus.get_instance()
     # Should not raise any error
     await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t4", value=True))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatch_runs_subscribers_in_parallel():
+    bus = EventBus.get_instance()
+    bus.configure({"dispatch_mode": "concurrent"})
+    started = []
+    release = asyncio.Event()
+
+    async def slow(msg: TagUpdateMsg):
+        started.append("slow")
+        await release.wait()
+
+    async def fast(msg: TagUpdateMsg):
+        started.append("fast")
+        release.set()
+
+    bus.subscribe(EventType.TAG_UPDATE, slow)
+    bus.subscribe(EventType.TAG_UPDATE, fast)
+    # With sequential dispatch this would deadlock: slow waits for fast
+    await asyncio.wait_for(
+        bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t5", value=1)),
+        timeout=1,
+    )
+    assert started == ["slow", "fast"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatch_isolates_errors_and_timeouts():
+    bus = EventBus.get_instance()
+    bus.configure({"dispatch_mode": "concurrent"})
+    results = []
+
+    async def failing(msg: TagUpdateMsg):
+        raise RuntimeError("boom")
+
+    async def hanging(msg: TagUpdateMsg):
+        await asyncio.sleep(10)
+
+    async def healthy(msg: TagUpdateMsg):
+        results.append(msg.value)
+
+    bus.subscribe(EventType.TAG_UPDATE, failing)
+    bus.subscribe(EventType.TAG_UPDATE, hanging, timeout=0.05)
+    bus.subscribe(EventType.TAG_UPDATE, healthy)
+    for value in range(3):
+        await bus.publish(
+            EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t6", value=value)
+        )
+    assert results == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_sequential_dispatch_applies_default_timeout():
+    bus = EventBus.get_instance()
+    bus.configure({"subscriber_timeout": 0.05})
+
+    async def hanging(msg: TagUpdateMsg):
+        await asyncio.sleep(10)
+
+    bus.subscribe(EventType.TAG_UPDATE, hanging)
+    with pytest.raises(asyncio.TimeoutError):
+        await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t7", value=1))
+
+
+@pytest.mark.asyncio
+async def test_queued_subscriber_does_not_block_publisher():
+    bus = EventBus.get_instance()
+    release = asyncio.Event()
+    results = []
+
+    async def slow(msg: TagUpdateMsg):
+        await release.wait()
+        results.append(msg.value)
+
+    bus.subscribe(EventType.TAG_UPDATE, slow, queue_size=10)
+    for value in range(3):
+        await asyncio.wait_for(
+            bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="q1", value=value)),
+            timeout=1,
+        )
+    release.set()
+    await bus.drain()
+    assert results == [0, 1, 2]
+    metrics = bus.get_queue_metrics()["tag_update"][0]
+    assert metrics["processed"] == 3
+    assert metrics["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_subscriber_drop_oldest():
+    bus = EventBus.get_instance()
+    release = asyncio.Event()
+    results = []
+
+    async def slow(msg: TagUpdateMsg):
+        await release.wait()
+        results.append(msg.value)
+
+    bus.subscribe(EventType.TAG_UPDATE, slow, queue_size=2, overflow=OverflowPolicy.DROP_OLDEST)
+    await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="q2", value=0))
+    await asyncio.sleep(0)  # worker takes value 0 and waits on the release
+    for value in range(1, 5):
+        await bus.publish(
+            EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="q2", value=value)
+        )
+    release.set()
+    await bus.drain()
+    assert results == [0, 3, 4]
+    assert bus.get_queue_metrics()["tag_update"][0]["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_queued_subscriber_coalesce_by_id():
+    bus = EventBus.get_instance()
+    release = asyncio.Event()
+    results = []
+
+    async def slow(msg: TagUpdateMsg):
+        await release.wait()
+        results.append((msg.datapoint_identifier, msg.value))
+
+    bus.subscribe(EventType.TAG_UPDATE, slow, queue_size=10, overflow=OverflowPolicy.COALESCE)
+    await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="a", value=0))
+    await asyncio.sleep(0)
+    for value in range(1, 4):
+        await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="a", value=value))
+        await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="b", value=value))
+    release.set()
+    await bus.drain()
+    assert results == [("a", 0), ("a", 3), ("b", 3)]
+    assert bus.get_queue_metrics()["tag_update"][0]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_queue_settings_from_config_by_owner():
+    bus = EventBus.get_instance()
+    bus.configure({"subscriber_queues": {"tracking": {"size": 5, "overflow": "drop_oldest"}}})
+
+    async def callback(msg: TagUpdateMsg):
+        pass
+
+    bus.subscribe(EventType.TAG_UPDATE, callback, owner="tracking")
+    bus.subscribe(EventType.TAG_UPDATE, callback, owner="datapoint")
+    metrics = bus.get_queue_metrics()["tag_update"]
+    assert len(metrics) == 1
+    assert metrics[0]["maxsize"] == 5
+    assert metrics[0]["overflow"] == "drop_oldest"
+
+
+@pytest.mark.asyncio
+async def test_queue_owner_defaults_to_service_module_name():
+    bus = EventBus.get_instance()
+    bus.configure({"subscriber_queues": {"animation": {"size": 3}}})
+
+    class FakeService:
+        module_name = "animation"
+
+        async def handle_bus_message(self, msg):
+            pass
+
+    bus.subscribe(EventType.TAG_UPDATE, FakeService().handle_bus_message)
+    assert bus.get_queue_metrics()["tag_update"][0]["overflow"] == "block"
+
+
+@pytest.mark.asyncio
+async def test_zero_copy_publish_shares_frozen_dto():
+    bus = EventBus.get_instance()
+    bus.configure({"copy_on_publish": False})
+    received = []
+
+    async def callback1(msg: TagUpdateMsg):
+        received.append(msg)
+
+    async def callback2(msg: TagUpdateMsg):
+        received.append(msg)
+
+    bus.subscribe(EventType.TAG_UPDATE, callback1)
+    bus.subscribe(EventType.TAG_UPDATE, callback2)
+    msg = TagUpdateMsg(datapoint_identifier="z1", value=1)
+    await bus.publish(EventType.TAG_UPDATE, msg)
+    assert received[0] is received[1] and received[0] == msg
+    assert received[0].frozen and not msg.frozen
+    with pytest.raises(FrozenInstanceError):
+        received[0].value = 2
+    thawed = replace(received[0], value=2)
+    assert not thawed.frozen and thawed.value == 2
+
+    # A frozen DTO is published as it is
+    await bus.publish(EventType.TAG_UPDATE, received[0])
+    assert received[2] is received[0]
+
+
+@pytest.mark.asyncio
+async def test_default_publish_copies_dto():
+    bus = EventBus.get_instance()
+    received = []
+
+    async def callback(msg: TagUpdateMsg):
+        received.append(msg)
+
+    bus.subscribe(EventType.TAG_UPDATE, callback)
+    msg = TagUpdateMsg(datapoint_identifier="z2", value=1)
+    await bus.publish(EventType.TAG_UPDATE, msg)
+    assert received[0] == msg and received[0] is not msg
+    assert not msg.frozen
+
+
+@pytest.mark.asyncio
+async def test_publish_many_uses_batch_callback_or_falls_back_per_event():
+    bus = EventBus.get_instance()
+    single = []
+    batches = []
+
+    async def per_event(msg: TagUpdateMsg):
+        single.append(msg.value)
+
+    async def unused(msg: TagUpdateMsg):
+        raise AssertionError("batch subscribers get the whole list")
+
+    async def per_batch(msgs):
+        batches.append([m.value for m in msgs])
+
+    bus.subscribe(EventType.TAG_UPDATE, per_event)
+    bus.subscribe(EventType.TAG_UPDATE, unused, batch_callback=per_batch)
+    await bus.publish_many(
+        EventType.TAG_UPDATE,
+        [TagUpdateMsg(datapoint_identifier=f"b{i}", value=i) for i in range(3)],
+    )
+    assert single == [0, 1, 2]
+    assert batches == [[0, 1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_hub_forwards_events_to_and_from_worker():
+    bus = EventBus.get_instance()
+    hub = BusHub(bus)
+    await hub.start()
+    received = []
+
+    async def on_alarm(msg):
+        received.append(msg)
+
+    bus.subscribe(EventType.RAISE_ALARM, on_alarm)
+    try:
+        # Act as a worker: announce interest in TAG_UPDATE only
+        reader, writer = await asyncio.open_unix_connection(hub.socket_path)
+        writer.write(encode_frame(FRAME_INTEREST, "rules", [EventType.TAG_UPDATE.value]))
+        await writer.drain()
+        for _ in range(100):
+            if bus._transports and bus._transports[0].wants(EventType.TAG_UPDATE):
+                break
+            await asyncio.sleep(0.01)
+
+        msg = TagUpdateMsg(track_id="1", datapoint_identifier="t1", value=1)
+        await bus.publish(EventType.RAISE_ALARM, "not wanted by the worker")
+        await bus.publish_many(EventType.TAG_UPDATE, [msg, replace(msg, value=2)])
+        kind, event_type, items = await asyncio.wait_for(read_frame(reader), 1.0)
+        assert (kind, event_type) == (FRAME_EVENTS, EventType.TAG_UPDATE.value)
+        assert [m.value for m in items] == [1, 2]
+
+        # Events published by the worker reach the local subscribers
+        writer.write(encode_frame(FRAME_EVENTS, EventType.RAISE_ALARM.value, ["from worker"]))
+        await writer.drain()
+        for _ in range(100):
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert received == ["not wanted by the worker", "from worker"]
+        writer.close()
+    finally:
+        await hub.stop()
+
+
+class SlowWriter:
+    """StreamWriter stand-in whose drain waits until released, like a peer that fell behind."""
+
+    def __init__(self):
+        self.written = []
+        self.release = asyncio.Event()
+
+    def write(self, frame):
+        self.written.append(frame)
+
+    async def drain(self):
+        await self.release.wait()
+        self.release.clear()
+
+    def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_transport_drops_the_oldest_bulk_frames_for_a_slow_peer():
+    bus = EventBus.get_instance()
+    bus.configure({"transport_max_pending": 3})
+    writer = SlowWriter()
+    transport = StreamTransport(
+        bus, asyncio.StreamReader(), writer, "slow", max_pending=bus.transport_max_pending
+    )
+    bus.attach_transport(transport)
+    transport._interest = {EventType.TAG_UPDATE, EventType.SEND_COMMAND}
+    transport.start()
+    try:
+        await bus.publish(EventType.TAG_UPDATE, "first")
+        await asyncio.sleep(0)  # written, the writer now waits for the peer
+        for value in range(10):
+            await bus.publish(EventType.TAG_UPDATE, value)
+        await bus.publish(EventType.SEND_COMMAND, "command")
+        assert transport.get_metrics()["pending"] == 4
+        assert transport.frames_dropped == 7
+
+        writer.release.set()
+        await asyncio.sleep(0.01)
+        frames = [frame[4:] for frame in writer.written]
+        sent = [
+            encode_frame(FRAME_EVENTS, e.value, [v])[4:]
+            for e, v in (
+                (EventType.TAG_UPDATE, "first"),
+                (EventType.SEND_COMMAND, "command"),
+                (EventType.TAG_UPDATE, 7),
+                (EventType.TAG_UPDATE, 8),
+                (EventType.TAG_UPDATE, 9),
+            )
+        ]
+        assert frames == sent  # commands are never dropped and go ahead of the telemetry
+    finally:
+        await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_subscriber_gets_latest_value_per_datapoint():
+    bus = EventBus.get_instance()
+    release = asyncio.Event()
+    batches = []
+    every_sample = []
+
+    async def on_update(msg):
+        await release.wait()
+        batches.append([msg])
+
+    async def on_updates(batch):
+        batches.append(batch)
+
+    async def history(msg):
+        every_sample.append(msg.value)
+
+    bus.subscribe(EventType.TAG_UPDATE, on_update, batch_callback=on_updates, coalesce=True)
+    bus.subscribe(EventType.TAG_UPDATE, history)
+
+    msg = TagUpdateMsg(track_id="1", datapoint_identifier="t1", value=0)
+    await bus.publish(EventType.TAG_UPDATE, msg)
+    await asyncio.sleep(0)  # the worker picks up the first update and waits
+    for value in range(1, 6):
+        await bus.publish(EventType.TAG_UPDATE, replace(msg, value=value))
+        await bus.publish(
+            EventType.TAG_UPDATE, replace(msg, datapoint_identifier="t2", value=value * 10)
+        )
+    release.set()
+    await bus.drain()
+
+    assert [[m.value for m in batch] for batch in batches] == [[0], [5, 50]]
+    assert every_sample == [0, 1, 10, 2, 20, 3, 30, 4, 40, 5, 50]
+    metrics = bus.get_queue_metrics()["tag_update"][0]
+    assert metrics["coalesced"] == 8
+
+
+@pytest.mark.asyncio
+async def test_tag_updates_wait_for_commands_in_flight():
+    bus = EventBus.get_instance()
+    release = asyncio.Event()
+    order = []
+
+    async def on_command(msg):
+        order.append("command")
+        await release.wait()
+        # Published from inside a command, so it must not wait for the command to finish
+        await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="fb", value=1))
+        order.append("command done")
+
+    async def on_tag(msg):
+        order.append(msg.datapoint_identifier)
+
+    bus.subscribe(EventType.SEND_COMMAND, on_command)
+    bus.subscribe(EventType.TAG_UPDATE, on_tag)
+
+    command = asyncio.create_task(bus.publish(EventType.SEND_COMMAND, "cmd"))
+    await asyncio.sleep(0)
+    storm = asyncio.create_task(
+        bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t1", value=0))
+    )
+    await asyncio.sleep(0.01)
+    assert order == ["command"]
+
+    release.set()
+    await asyncio.gather(command, storm)
+    assert order == ["command", "fb", "command done", "t1"]
+
+
+@pytest.mark.asyncio
+async def test_slow_command_holds_tag_updates_back_for_the_priority_wait_only():
+    bus = EventBus.get_instance()
+    bus.configure({"priority_wait": 0.02})
+    release = asyncio.Event()
+    tags = []
+
+    async def on_command(msg):
+        await release.wait()  # e.g. a driver connecting to a dead PLC
+
+    async def on_tag(msg):
+        tags.append(msg.value)
+
+    bus.subscribe(EventType.SEND_COMMAND, on_command)
+    bus.subscribe(EventType.TAG_UPDATE, on_tag)
+
+    command = asyncio.create_task(bus.publish(EventType.SEND_COMMAND, "cmd"))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    for value in range(20):
+        await bus.publish(
+            EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t1", value=value)
+        )
+    # The first update waited 0.02 s, the others went through while the command still runs
+    assert tags == list(range(20))
+    assert time.perf_counter() - started < 0.2
+    assert not command.done()
+    release.set()
+    await command
+
+
+@pytest.mark.asyncio
+async def test_tasks_spawned_by_a_command_do_not_skip_the_lanes_once_it_returns():
+    bus = EventBus.get_instance()
+    release = asyncio.Event()
+    go = asyncio.Event()
+    order = []
+    spawned = []
+
+    async def publish_later():
+        await go.wait()
+        await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t1", value=0))
+
+    async def on_command(msg):
+        if msg == "spawn":
+            spawned.append(asyncio.create_task(publish_later()))
+            return
+        await release.wait()
+        order.append("slow done")
+
+    async def on_tag(msg):
+        order.append("tag")
+
+    bus.subscribe(EventType.SEND_COMMAND, on_command)
+    bus.subscribe(EventType.TAG_UPDATE, on_tag)
+
+    await bus.publish(EventType.SEND_COMMAND, "spawn")
+    command = asyncio.create_task(bus.publish(EventType.SEND_COMMAND, "slow"))
+    await asyncio.sleep(0)
+    go.set()
+    await asyncio.sleep(0.01)
+    assert order == []  # the spawned task's update waits for the slow command like any other
+
+    release.set()
+    await asyncio.gather(command, *spawned)
+    assert order == ["slow done", "tag"]
+
+
+@pytest.mark.asyncio
+async def test_priority_lanes_can_be_disabled():
+    bus = EventBus.get_instance()
+    bus.configure({"priority_lanes": False})
+    release = asyncio.Event()
+    order = []
+
+    async def on_command(msg):
+        order.append("command")
+        await release.wait()
+
+    async def on_tag(msg):
+        order.append("tag")
+
+    bus.subscribe(EventType.SEND_COMMAND, on_command)
+    bus.subscribe(EventType.TAG_UPDATE, on_tag)
+
+    command = asyncio.create_task(bus.publish(EventType.SEND_COMMAND, "cmd"))
+    await asyncio.sleep(0)
+    await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t1", value=0))
+    assert order == ["command", "tag"]
+    release.set()
+    await command
+
+
+@pytest.mark.asyncio
+async def test_instrumentation_records_rates_latency_and_failures():
+    bus = EventBus.get_instance()
+    assert bus.get_metrics()["event_types"] == {}
+    bus.configure({"instrumentation": True, "dispatch_mode": "concurrent"})
+
+    async def ok(msg):
+        pass
+
+    async def ok_batch(batch):
+        pass
+
+    async def failing(msg):
+        raise RuntimeError("boom")
+
+    bus.subscribe(EventType.TAG_UPDATE, ok, batch_callback=ok_batch)
+    bus.subscribe(EventType.TAG_UPDATE, failing)
+    msg = TagUpdateMsg(datapoint_identifier="t1", value=1)
+    await bus.publish(EventType.TAG_UPDATE, msg)
+    await bus.publish_many(EventType.TAG_UPDATE, [msg, msg])
+
+    metrics = bus.get_metrics()["event_types"]["tag_update"]
+    assert metrics["published"] == 3
+    assert metrics["rate"] > 0
+    by_name = {s["subscriber"].split(".")[-1]: s for s in metrics["subscribers"]}
+    # One call for the publish and one for the whole batch
+    assert by_name["ok"]["calls"] == 2
+    assert by_name["ok"]["events"] == 3
+    assert by_name["failing"]["exceptions"] == 3
+    assert all(s["in_flight"] == 0 for s in metrics["subscribers"])
+    assert sum(b["count"] for b in by_name["ok"]["latency"]["buckets"]) == 2
+
+    bus.configure({})
+    assert not bus.instrumentation_enabled
+
+
+def test_only_modules_without_a_ui_run_in_workers():
+    config = {"modules": [{"name": "rule", "worker": "cpu"}, {"name": "datapoint"}]}
+    assert get_worker_groups(config) == {"cpu": ["rule"]}
+    for name in ("tracking", "animation"):
+        config["modules"].append({"name": name, "worker": True})
+        with pytest.raises(ValueError, match=f"Module {name} cannot run in worker {name}"):
+            get_worker_groups(config)
+        config["modules"].pop()
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.common.bus.event_types import EventType
+from openscada_lite.common.models.dtos import TagUpdateMsg
+from openscada_lite.modules.metrics.controller import MetricsController
+from openscada_lite.modules.metrics.model import MetricsModel
+from openscada_lite.modules.metrics.service import MetricsService
+
+
+@pytest.fixture(autouse=True)
+def reset_event_bus(monkeypatch):
+    monkeypatch.setattr(EventBus, "_instance", None)
+
+
+@pytest.fixture
+def metrics_module():
+    app = FastAPI()
+    socketio = MagicMock()
+    socketio.emit = AsyncMock()
+    socketio.enter_room = AsyncMock()
+    controller = MetricsController(MetricsModel(), socketio, "metrics", app)
+    service = MetricsService(EventBus.get_instance(), controller.model, controller)
+    return app, socketio, service
+
+
+@pytest.mark.asyncio
+async def test_metrics_module_enables_instrumentation_and_serves_it(metrics_module):
+    app, _, service = metrics_module
+    bus = service.event_bus
+    assert bus.instrumentation_enabled
+
+    async def on_tag(msg):
+        pass
+
+    bus.subscribe(EventType.TAG_UPDATE, on_tag)
+    await bus.publish(EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="t1", value=1))
+
+    response = TestClient(app).get("/metrics/bus")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["instrumentation"] is True
+    assert body["event_types"]["tag_update"]["published"] == 1
+    assert body["event_types"]["tag_update"]["subscribers"][0]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_feed_sends_snapshot_on_subscribe(metrics_module):
+    _, socketio, service = metrics_module
+    await service.controller.handle_subscribe_live_feed("sid1")
+    socketio.enter_room.assert_awaited_once_with("sid1", "metrics_room")
+    event, payload = socketio.emit.await_args.args
+    assert event == "metrics_initial_state"
+    assert payload["instrumentation"] is True
+
+    await service.controller.publish_bus_metrics(service.get_bus_metrics())
+    assert socketio.emit.await_args.args[0] == "metrics_bus_metrics"
+
+
+def test_metrics_serves_live_feed_batching_metrics(metrics_module):
+    app, _, _ = metrics_module
+    response = TestClient(app).get("/metrics/live_feeds")
+    assert response.status_code == 200
+    # The metrics controller has no live feed batcher of its own
+    assert "metrics" not in response.json()
@@ -1,10 +1,19 @@
 import asyncio
 import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 
+from openscada_lite.common.actions import action_utils
 from openscada_lite.common.bus.event_bus import EventBus
+from openscada_lite.modules.rule.controller import RuleController
 from openscada_lite.modules.rule.manager.rule_manager import RuleEngine
+from openscada_lite.modules.rule.model import RuleModel
+from openscada_lite.modules.rule.service import RuleService
+from openscada_lite.modules.rule.manager.threshold_rules import parse_threshold
 from openscada_lite.common.bus.event_types import EventType
 from openscada_lite.common.models.entities import Rule
+from openscada_lite.common.timers.timer_wheel import TimerWheel
 from openscada_lite.common.models.dtos import (
     SendCommandMsg,
     RaiseAlarmMsg,
@@ -320,3 +329,573 @@ async def test_boolean_symbols():
 
     assert len(alarms_lowered) == 1
     assert alarms_lowered[0].datapoint_identifier == "CameraDriver@CAMERA_1_ALARM"
+
+
+@pytest.mark.asyncio
+async def test_rules_evaluated_for_a_published_batch():
+    test_bus = EventBus.get_instance()
+    engine = RuleEngine.get_instance()
+    engine.rules = [
+        Rule(
+            rule_id="batch_alarm",
+            on_condition="WaterTank@level > 10",
+            on_actions=["raise_alarm()"],
+        )
+    ]
+    engine.build_tag_to_rules_index()
+
+    alarms = []
+    lowered = []
+
+    async def capture_alarm(msg: RaiseAlarmMsg):
+        alarms.append(msg)
+
+    async def capture_lower(msg: LowerAlarmMsg):
+        lowered.append(msg)
+
+    test_bus.subscribe(EventType.RAISE_ALARM, capture_alarm)
+    test_bus.subscribe(EventType.LOWER_ALARM, capture_lower)
+
+    await test_bus.publish_many(
+        EventType.TAG_UPDATE,
+        [
+            TagUpdateMsg(datapoint_identifier="WaterTank@level", value=5),
+            TagUpdateMsg(datapoint_identifier="WaterTank@level", value=15),
+            TagUpdateMsg(datapoint_identifier="WaterTank@level", value=3),
+        ],
+    )
+
+    assert len(alarms) == 1
+    assert len(lowered) == 1
+
+
+@pytest.mark.asyncio
+async def test_rules_are_looked_up_by_tag_index():
+    test_bus = EventBus.get_instance()
+    engine = RuleEngine.get_instance()
+    tag = engine.tag_registry.names[0]
+    engine.rules = [
+        Rule(
+            rule_id="test_indexed",
+            on_condition=f"{tag} > 50",
+            on_actions=["send_command('WaterTank@VALVE1_POS', 0)"],
+        )
+    ]
+    engine.build_tag_to_rules_index()
+
+    received = []
+
+    async def capture(msg: SendCommandMsg):
+        received.append(msg)
+
+    test_bus.subscribe(EventType.SEND_COMMAND, capture)
+
+    tag_index = engine.tag_registry.index_of(tag)
+    await test_bus.publish(
+        EventType.TAG_UPDATE,
+        TagUpdateMsg(datapoint_identifier=tag, value=60, tag_index=tag_index),
+    )
+    await asyncio.sleep(0.01)
+
+    assert len(received) == 1
+    assert engine.asteval.symtable[tag.replace("@", "__")] == 60
+
+
+@pytest.mark.asyncio
+async def test_actions_are_parsed_when_rules_load(monkeypatch):
+    test_bus = EventBus.get_instance()
+    engine = RuleEngine.get_instance()
+    engine.rules = [
+        Rule(
+            rule_id="precompiled_command",
+            on_condition="WaterTank@flow > 5",
+            on_actions=["send_command('WaterTank@PUMP', 1)"],
+        )
+    ]
+    engine.build_tag_to_rules_index()
+    bound = action_utils.compile_action("send_command('WaterTank@PUMP', 1)")
+    assert (bound.name, bound.params) == ("send_command", ("WaterTank@PUMP", 1))
+
+    # Firing the rule must not parse the action again
+    def fail(action_str):
+        raise AssertionError(f"{action_str} parsed again")
+
+    monkeypatch.setattr(action_utils, "parse_action", fail)
+    received = []
+
+    async def capture(msg: SendCommandMsg):
+        received.append(msg)
+
+    test_bus.subscribe(EventType.SEND_COMMAND, capture)
+    for value in (6, 4, 7):
+        await test_bus.publish(
+            EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="WaterTank@flow", value=value)
+        )
+    assert [(msg.datapoint_identifier, msg.value) for msg in received] == [
+        ("WaterTank@PUMP", 1),
+        ("WaterTank@PUMP", 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rules_keep_their_bound_actions_across_reloads():
+    engine = RuleEngine.get_instance()
+    engine.rules = [
+        Rule(rule_id=f"r{i}", on_condition="Tank@LEVEL * 2 > 100", on_actions=[f"raise_alarm({i})"])
+        for i in range(3)
+    ]
+    engine.build_tag_to_rules_index()
+    kept = engine._actions["r0"]["raise_alarm(0)"]
+    assert kept.params == (0,)
+
+    await engine.reload_rules(
+        [
+            engine.rules[0],
+            Rule(rule_id="r1", on_condition="Tank@LEVEL * 2 > 100", on_actions=["lower_alarm()"]),
+        ]
+    )
+    assert set(engine._actions) == {"r0", "r1"}
+    assert engine._actions["r0"]["raise_alarm(0)"] is kept  # unchanged rules are not parsed again
+    assert list(engine._actions["r1"]) == ["lower_alarm()"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_action_still_fails_when_the_rule_fires():
+    engine = RuleEngine.get_instance()
+    engine.rules = [
+        Rule(rule_id="bad_action", on_condition="WaterTank@flow > 5", on_actions=["explode()"])
+    ]
+    engine.build_tag_to_rules_index()  # logs the invalid action, does not raise
+    with pytest.raises(ValueError, match="Unknown action: explode"):
+        await engine.execute_action("explode()", "WaterTank@flow", "track")
+
+
+def test_parse_threshold():
+    assert parse_threshold("Tank__LEVEL > 80") == ("Tank__LEVEL", ">", 80)
+    assert parse_threshold("10.5 >= Tank__LEVEL") == ("Tank__LEVEL", "<=", 10.5)
+    assert parse_threshold("Tank__PUMP == 'OPENED'") == ("Tank__PUMP", "==", "OPENED")
+    assert parse_threshold("Tank__PUMP > 'A'") is None
+    assert parse_threshold("Tank__PUMP == OPENED") is None
+    assert parse_threshold("float(Tank__LEVEL) > 80") is None
+    assert parse_threshold("0 < Tank__LEVEL < 80") is None
+
+
+@pytest.mark.asyncio
+async def test_threshold_rules_fire_like_rules_evaluated_one_by_one(monkeypatch):
+    rules = [
+        Rule(rule_id="high", on_condition="Tank@LEVEL > 80", on_actions=["raise_alarm()"]),
+        Rule(rule_id="high_high", on_condition="Tank@LEVEL >= 95", on_actions=["a()"]),
+        Rule(rule_id="low", on_condition="Tank@LEVEL < 10", on_actions=["raise_alarm()"]),
+        Rule(rule_id="low_low", on_condition="5 >= Tank@LEVEL", on_actions=["b()"]),
+        Rule(rule_id="empty", on_condition="Tank@LEVEL == 0", on_actions=["c()"]),
+        Rule(rule_id="other", on_condition="Tank@LEVEL > Tank@LIMIT", on_actions=["d()"]),
+        Rule(
+            rule_id="hysteresis",
+            on_condition="Tank@LEVEL > 50",
+            on_actions=["e()"],
+            off_condition="Tank@LEVEL < 40",
+            off_actions=["f()"],
+        ),
+        Rule(rule_id="pump", on_condition="Tank@PUMP == 'OPENED'", on_actions=["g()"]),
+    ]
+    values = [0, 50, 81, 96, 96.0, 80, 4, 5, None, "x", float("nan"), 0.0, True, 99, -1]
+    pumps = ["OPENED", "CLOSED", "OPENED", "OPENED", None]
+
+    async def run(index_threshold_rules):
+        RuleEngine.reset_instance()
+        engine = RuleEngine.get_instance()
+        engine.index_threshold_rules = index_threshold_rules
+        engine.rules = rules
+        engine.build_tag_to_rules_index()
+        executed = []
+
+        async def record(action_str, identifier, track_id, active=True, rule_id=None):
+            executed.append((action_str, identifier, active, rule_id))
+
+        monkeypatch.setattr(engine, "execute_action", record)
+        await engine._apply_tag_update(TagUpdateMsg(datapoint_identifier="Tank@LIMIT", value=70))
+        for i, value in enumerate(values):
+            await engine._apply_tag_update(
+                TagUpdateMsg(datapoint_identifier="Tank@LEVEL", value=value)
+            )
+            await engine._apply_tag_update(
+                TagUpdateMsg(datapoint_identifier="Tank@PUMP", value=pumps[i % len(pumps)])
+            )
+        return engine, executed
+
+    engine, indexed = await run(True)
+    assert engine._thresholds_by_tag.get(-1, "Tank@LEVEL") is not None
+    scalar_rules = {rule.rule_id for rule in engine._rules_by_tag.get(-1, "Tank@LEVEL")}
+    assert scalar_rules == {"other", "hysteresis"}
+    _, one_by_one = await run(False)
+    assert indexed == one_by_one
+    assert ("raise_alarm()", "Tank@LEVEL", True, "high") in indexed
+
+
+@pytest.mark.asyncio
+async def test_scan_cycle_evaluates_each_rule_once_per_scan(monkeypatch):
+    rules = [
+        Rule(
+            rule_id="mismatch",
+            on_condition="Pump@A != Pump@B",
+            on_actions=["raise_alarm()"],
+            off_condition="Pump@A == Pump@B",
+            off_actions=["lower_alarm()"],
+        ),
+        Rule(rule_id="high", on_condition="Tank@LEVEL > 80", on_actions=["raise_alarm()"]),
+    ]
+    scans = [
+        [("Pump@A", 0), ("Pump@B", 0)],
+        [("Pump@A", 1), ("Pump@B", 1)],  # A != B only in between
+        [("Tank@LEVEL", 90), ("Tank@LEVEL", 50)],  # above 80 only in between
+        [("Pump@B", 2), ("Tank@LEVEL", 90)],
+        [("Pump@A", 2), ("Tank@LEVEL", 70)],
+    ]
+
+    async def run(scan_cycle):
+        RuleEngine.reset_instance()
+        engine = RuleEngine.get_instance()
+        engine.scan_cycle = scan_cycle
+        engine.rules = rules
+        engine.build_tag_to_rules_index()
+        executed = []
+        evaluations = []
+
+        async def record(action_str, identifier, track_id, active=True, rule_id=None):
+            executed.append((action_str, identifier, rule_id))
+
+        evaluate = engine._evaluate_rule_conditions
+
+        def count(rule, rule_id):
+            evaluations.append(rule_id)
+            return evaluate(rule, rule_id)
+
+        monkeypatch.setattr(engine, "execute_action", record)
+        monkeypatch.setattr(engine, "_evaluate_rule_conditions", count)
+        for scan in scans:
+            await engine.on_tag_updates(
+                [TagUpdateMsg(datapoint_identifier=tag, value=value) for tag, value in scan]
+            )
+        return executed, evaluations
+
+    executed, evaluations = await run(True)
+    assert executed == [
+        ("raise_alarm()", "Pump@B", "mismatch"),
+        ("raise_alarm()", "Tank@LEVEL", "high"),
+        ("lower_alarm()", "Pump@A", "mismatch"),
+        ("lower_alarm()", "Tank@LEVEL", "high"),
+    ]
+    assert evaluations == ["mismatch"] * 4
+
+    executed, evaluations = await run(False)
+    assert executed[:2] == [
+        ("raise_alarm()", "Pump@A", "mismatch"),
+        ("lower_alarm()", "Pump@B", "mismatch"),
+    ]
+    assert len(evaluations) > 4
+
+
+@pytest.mark.asyncio
+async def test_scan_cycle_evaluates_the_single_updates_of_one_tick_together(monkeypatch):
+    engine = RuleEngine.get_instance()
+    engine.scan_cycle = True
+    engine.rules = [
+        Rule(rule_id="mismatch", on_condition="Pump@A != Pump@B", on_actions=["raise_alarm()"])
+    ]
+    engine.build_tag_to_rules_index()
+    executed = []
+
+    async def record(action_str, identifier, track_id, active=True, rule_id=None):
+        executed.append((action_str, identifier, rule_id))
+
+    monkeypatch.setattr(engine, "execute_action", record)
+    await engine.on_tag_update(TagUpdateMsg(datapoint_identifier="Pump@A", value=1))
+    await engine.on_tag_update(TagUpdateMsg(datapoint_identifier="Pump@B", value=1))
+    assert executed == []
+    await asyncio.sleep(0.01)
+    assert executed == []
+    assert engine.datapoint_state == {"Pump@A": 1, "Pump@B": 1}
+
+    await engine.on_tag_update(TagUpdateMsg(datapoint_identifier="Pump@B", value=2))
+    await asyncio.sleep(0.01)
+    assert executed == [("raise_alarm()", "Pump@B", "mismatch")]
+
+
+def index_view(engine):
+    def ids(rules):
+        return [rule.rule_id for rule in rules]
+
+    def thresholds_view(thresholds):
+        groups = sorted(
+            (g.op, g.thresholds, ids(r for _, r in g.rules)) for g in thresholds._groups
+        )
+        equal = {value: ids(r for _, r in rules) for value, rules in thresholds._equal.items()}
+        return groups, equal
+
+    return (
+        ids(engine.rules),
+        {tag: ids(rules) for tag, rules in engine.tag_to_rules.items()},
+        {tag: ids(rules) for tag, rules in engine._rules_by_tag.by_name.items() if rules},
+        [ids(rules) for rules in engine._rules_by_tag.by_index],
+        {tag: thresholds_view(t) for tag, t in engine._thresholds_by_tag.by_name.items()},
+    )
+
+
+@pytest.mark.asyncio
+async def test_reload_rules_rebuilds_only_what_changed(monkeypatch):
+    engine = RuleEngine.get_instance()
+    engine.rules = [
+        Rule(rule_id="high", on_condition="Tank@LEVEL > 80", on_actions=["raise_alarm()"]),
+        Rule(rule_id="low", on_condition="Tank@LEVEL < 10", on_actions=["raise_alarm()"]),
+        Rule(rule_id="pump", on_condition="Tank@PUMP == 'OPENED'", on_actions=["raise_alarm()"]),
+        Rule(
+            rule_id="mismatch",
+            on_condition="Pump@A != Pump@B",
+            on_actions=["raise_alarm()"],
+            off_condition="Pump@A == Pump@B",
+            off_actions=["lower_alarm()"],
+        ),
+        Rule(rule_id="gone", on_condition="Tank@TEMP > 50", on_actions=["raise_alarm()"]),
+    ]
+    engine.build_tag_to_rules_index()
+    executed = []
+
+    async def record(action_str, identifier, track_id, active=True, rule_id=None):
+        executed.append((action_str, rule_id))
+
+    monkeypatch.setattr(engine, "execute_action", record)
+    for tag, value in [("Tank@LEVEL", 90), ("Tank@TEMP", 60), ("Pump@A", 1), ("Pump@B", 2)]:
+        await engine._apply_tag_update(TagUpdateMsg(datapoint_identifier=tag, value=value))
+    assert engine.rule_states == {"high": True, "gone": True, "mismatch": True}
+    high, mismatch = engine.rules[0], engine.rules[3]
+    executed.clear()
+
+    new_rules = [
+        Rule(rule_id="high", on_condition="Tank@LEVEL > 80", on_actions=["raise_alarm()"]),
+        Rule(rule_id="low", on_condition="Tank@LEVEL < 5", on_actions=["raise_alarm()"]),
+        Rule(rule_id="very_high", on_condition="Tank@LEVEL > 85", on_actions=["raise_alarm()"]),
+        Rule(rule_id="pump", on_condition="Tank@PUMP == 'CLOSED'", on_actions=["raise_alarm()"]),
+        Rule(
+            rule_id="mismatch",
+            on_condition="Pump@A != Pump@B",
+            on_actions=["raise_alarm()"],
+            off_condition="Pump@A == Pump@B",
+            off_actions=["lower_alarm()"],
+        ),
+        Rule(rule_id="hot", on_condition="Tank@TEMP > 55 and Pump@A > 0", on_actions=["x()"]),
+    ]
+    summary = await engine.reload_rules(new_rules)
+    assert summary == {
+        "added": ["very_high", "hot"],
+        "changed": ["low", "pump"],
+        "removed": ["gone"],
+    }
+    # Unchanged rules keep their objects and state, the new conditions are checked once
+    assert engine.rules[0] is high and engine.rules[4] is mismatch
+    assert executed == [
+        ("lower_alarm()", "gone"),
+        ("raise_alarm()", "very_high"),
+        ("x()", "hot"),
+    ]
+    assert engine.rule_states == {"high": True, "mismatch": True, "very_high": True, "hot": True}
+
+    reloaded = index_view(engine)
+    RuleEngine.reset_instance()
+    fresh = RuleEngine.get_instance()
+    fresh.rules = new_rules
+    fresh.build_tag_to_rules_index()
+    assert reloaded == index_view(fresh)
+
+    # Edges carry on from the values the rules were reloaded with
+    executed.clear()
+    await engine._apply_tag_update(TagUpdateMsg(datapoint_identifier="Tank@LEVEL", value=83))
+    await engine._apply_tag_update(TagUpdateMsg(datapoint_identifier="Tank@LEVEL", value=3))
+    assert executed == [
+        ("lower_alarm()", "very_high"),
+        ("lower_alarm()", "high"),
+        ("raise_alarm()", "low"),
+    ]
+
+    with pytest.raises(ValueError, match="Duplicate rule_id"):
+        await engine.reload_rules(new_rules + [new_rules[0]])
+
+
+ALARM = ["raise_alarm()"]
+
+
+async def timed_engine(monkeypatch, rules):
+    engine = RuleEngine.get_instance()
+    engine.timer_wheel = TimerWheel(resolution=0.01)
+    engine.rules = rules
+    engine.build_tag_to_rules_index()
+    executed = []
+
+    async def record(action_str, identifier, track_id, active=True, rule_id=None):
+        executed.append((action_str, rule_id))
+
+    monkeypatch.setattr(engine, "execute_action", record)
+    return engine, executed
+
+
+async def set_level(engine, value, wait=0.0):
+    await engine._apply_tag_update(TagUpdateMsg(datapoint_identifier="Tank@LEVEL", value=value))
+    await asyncio.sleep(wait)
+
+
+@pytest.mark.asyncio
+async def test_on_and_off_delays_filter_short_excursions(monkeypatch):
+    engine, executed = await timed_engine(
+        monkeypatch,
+        [
+            Rule(
+                rule_id="high",
+                on_condition="Tank@LEVEL > 80",
+                on_actions=["raise_alarm()"],
+                on_delay=0.05,
+                off_delay=0.05,
+            ),
+            Rule(
+                rule_id="low",
+                on_condition="Tank@LEVEL < 10",
+                on_actions=["open()"],
+                off_condition="Tank@LEVEL > 20",
+                off_actions=["close()"],
+                on_delay=0.05,
+            ),
+        ],
+    )
+    await set_level(engine, 90, 0.01)
+    await set_level(engine, 70)  # back before the on_delay: nothing fires
+    await asyncio.sleep(0.1)
+    assert executed == []
+    assert len(engine.timer_wheel) == 0
+
+    await set_level(engine, 90, 0.02)
+    await set_level(engine, 95, 0.1)  # still above 80, the delay counts from the first
+    assert executed == [("raise_alarm()", "high")]
+    await set_level(engine, 70, 0.01)
+    await set_level(engine, 85, 0.1)  # back before the off_delay: the alarm stays
+    assert executed == [("raise_alarm()", "high")]
+    await set_level(engine, 50, 0.1)
+    assert executed[1:] == [("lower_alarm()", "high")]
+
+    await set_level(engine, 5, 0.1)
+    await set_level(engine, 15)  # not off yet, the on/off rule stays on
+    await set_level(engine, 25)  # off_condition with no off_delay fires at once
+    assert executed[2:] == [("open()", "low"), ("close()", "low")]
+    assert engine.rule_states == {"high": False, "low": False}
+
+
+@pytest.mark.asyncio
+async def test_deadband_keeps_threshold_rules_on_near_the_limit(monkeypatch):
+    engine, executed = await timed_engine(
+        monkeypatch,
+        [
+            Rule(rule_id="high", on_condition="Tank@LEVEL > 80", deadband=5, on_actions=ALARM),
+            Rule(rule_id="low", on_condition="10 >= Tank@LEVEL", deadband=2, on_actions=ALARM),
+        ],
+    )
+    # high is on above 80 until it drops to 75, low is on from 10 until it rises above 12
+    for value in (81, 79, 76, 80.5, 75, 81, 10, 11.5, 12, 9, None):
+        await set_level(engine, value)
+    assert executed == [
+        ("raise_alarm()", "high"),
+        ("lower_alarm()", "high"),
+        ("raise_alarm()", "high"),
+        ("lower_alarm()", "high"),
+        ("raise_alarm()", "low"),
+        ("lower_alarm()", "low"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_profiler_counts_evaluations_transitions_and_errors(monkeypatch):
+    engine, _ = await timed_engine(
+        monkeypatch,
+        [
+            Rule(rule_id="slow", on_condition="sum(range(50000)) > 0 and Tank@LEVEL > 50"),
+            Rule(rule_id="broken", on_condition="Tank@LEVEL / 0 > 1"),
+            Rule(rule_id="high", on_condition="Tank@LEVEL > 80", on_actions=ALARM),
+        ],
+    )
+    for value in (10, 95, 10):
+        await set_level(engine, value)
+
+    stats = engine.profiler.rules
+    assert (stats["slow"].evaluations, stats["slow"].activations) == (3, 1)
+    assert stats["slow"].timed == 1  # one evaluation in 16 is timed, the first one
+    assert stats["slow"].deactivations == 1
+    assert (stats["broken"].evaluations, stats["broken"].errors) == (3, 3)
+    # Threshold rules are evaluated per tag, only their transitions are counted
+    assert (stats["high"].evaluations, stats["high"].activations) == (0, 1)
+
+    report = engine.profiler.report(top=1)
+    assert (report["rules"], report["evaluations"], report["errors"]) == (3, 6, 3)
+    assert [rule["rule_id"] for rule in report["top"]] == ["slow"]
+    assert engine.profiler.report(order="errors")["top"][0]["rule_id"] == "broken"
+    with pytest.raises(ValueError, match="Unknown order"):
+        engine.profiler.report(order="name")
+
+    await engine.reload_rules(
+        [engine.rules[0], Rule(rule_id="broken", on_condition="Tank@LEVEL > 1")]
+    )
+    assert set(stats) == {"slow", "broken"}
+    assert stats["broken"].errors == 0  # changed rules start over
+
+
+@pytest.mark.asyncio
+async def test_rule_reading_a_tag_twice_is_evaluated_once_per_update():
+    engine = RuleEngine.get_instance()
+    engine.rules = [
+        Rule(
+            rule_id="r1",
+            on_condition="Tank@LEVEL * 2 > 100 and Tank@LEVEL < 1000",
+            off_condition="Tank@LEVEL < 10 or Tank@FLOW > 5",
+        )
+    ]
+    engine.build_tag_to_rules_index()
+    assert engine.tag_to_rules == {"Tank@LEVEL": engine.rules, "Tank@FLOW": engine.rules}
+
+    await engine.on_tag_update(TagUpdateMsg(datapoint_identifier="Tank@LEVEL", value=60))
+    assert engine.profiler.stats("r1").evaluations == 1
+
+    await engine.reload_rules([Rule(rule_id="r1", on_condition="Tank@LEVEL + Tank@LEVEL > 1")])
+    assert engine.tag_to_rules == {"Tank@LEVEL": engine.rules}
+
+
+@pytest.mark.asyncio
+async def test_rule_service_does_not_feed_the_engine_a_second_time():
+    bus = EventBus.get_instance()
+    service = RuleService(bus, RuleModel(), None)
+    service.engine.rules = [Rule(rule_id="r1", on_condition="Tank@LEVEL * 2 > 100")]
+    service.engine.build_tag_to_rules_index()
+
+    await bus.publish(
+        EventType.TAG_UPDATE, TagUpdateMsg(datapoint_identifier="Tank@LEVEL", value=1)
+    )
+    await bus.publish_many(
+        EventType.TAG_UPDATE,
+        [TagUpdateMsg(datapoint_identifier="Tank@LEVEL", value=value) for value in (2, 3)],
+    )
+    await asyncio.sleep(0.01)
+    assert service.engine.profiler.stats("r1").evaluations == 3
+
+
+def test_rule_profile_endpoint():
+    app = FastAPI()
+    controller = RuleController(RuleModel(), MagicMock(), "rule", app)
+    service = RuleService(EventBus.get_instance(), controller.model, controller)
+    for rule_id, seconds in (("r1", 0.002), ("r2", 0.001)):
+        stats = service.engine.profiler.stats(rule_id)
+        stats.evaluations = 32
+        stats.record_time(seconds)
+
+    client = TestClient(app)
+    body = client.get("/rule/profile", params={"top": 1}).json()
+    assert body["profiling"] is True
+    assert [rule["rule_id"] for rule in body["top"]] == ["r1"]
+    assert body["top"][0]["total_time"] == pytest.approx(0.064)  # sampled mean * evaluations
+    assert client.get("/rule/profile", params={"order": "name"}).status_code == 400
+
+    service.engine.profiler = None
+    assert client.get("/rule/profile").json() == {"profiling": False}
@@ -113,3 +113,27 @@ async def test_schedule_execute_triggers_actions(monkeypatch):
     assert all(c["rule_id"] == "daily_toggle" for c in calls)
     # Track id should be a UUID-like string (non-empty)
     assert all(isinstance(c["track_id"], str) and len(c["track_id"]) > 0 for c in calls)
+
+
+@pytest.mark.asyncio
+async def test_registered_schedules_run_their_prebound_actions(monkeypatch):
+    import openscada_lite.modules.schedule.service as schedule_service_module
+    from openscada_lite.common.actions import action_utils
+
+    monkeypatch.setattr(schedule_service_module, "AsyncIOScheduler", FakeScheduler)
+    svc = ScheduleService(DummyEventBus(), ScheduleModel(), None)
+    sched = {"schedule_id": "night", "cron": "0 23 * * *", "actions": ["raise_alarm('night')"]}
+    svc._register_schedule(sched)
+    calls = []
+
+    async def handler(identifier, params, track_id, rule_id):
+        calls.append((identifier, params, rule_id))
+
+    svc._actions["night"]["raise_alarm('night')"].handler = handler
+
+    def fail(action_str):
+        raise AssertionError(f"{action_str} parsed again")
+
+    monkeypatch.setattr(action_utils, "parse_action", fail)
+    await svc._execute_schedule(sched)
+    assert calls == [("SCHEDULER", ("night",), "night")]
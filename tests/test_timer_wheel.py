@@ -0,0 +1,62 @@
+import asyncio
+import random
+
+import pytest
+
+from openscada_lite.common.timers.timer_wheel import TimerWheel
+
+
+@pytest.mark.asyncio
+async def test_timers_fire_once_on_their_tick_across_levels():
+    rng = random.Random(7)
+    wheel = TimerWheel(resolution=1.0)
+    fired = []
+    due = {}
+    timers = []
+    cancelled = set()
+    now = 0.0
+    for _ in range(500):
+        for _ in range(rng.randint(0, 10)):
+            delay = rng.choice([rng.uniform(0, 300), rng.uniform(0, 20000), rng.uniform(0, 1e8)])
+            key = len(timers)
+            due[key] = now + delay
+            timers.append(wheel.schedule(delay, fired.append, key, now=now))
+        for timer in rng.sample(timers, min(2, len(timers))):
+            if timer.active:
+                timer.cancel()
+                cancelled.add(timer.args[0])
+        now += rng.choice([0.5, 1, 3, 250, 5000, 40000])
+        await wheel.run_due(now)
+        fired_keys = set(fired)
+        assert all(due[key] <= now for key in fired_keys)  # never early
+        late = [
+            key
+            for key in due
+            if due[key] <= now - 1.0 and key not in fired_keys and key not in cancelled
+        ]
+        assert late == []  # never more than a tick late
+    await wheel.run_due(now + 2e8)
+
+    assert len(fired) == len(set(fired))
+    assert set(fired) == set(due) - cancelled
+    assert len(wheel) == 0
+
+
+@pytest.mark.asyncio
+async def test_timers_are_driven_by_one_task():
+    wheel = TimerWheel(resolution=0.01)
+    fired = []
+
+    async def record(name):
+        fired.append(name)
+
+    wheel.schedule(0.05, record, "late")
+    wheel.schedule(0.02, record, "early")
+    wheel.schedule(0.03, record, "cancelled").cancel()
+    tasks = len(asyncio.all_tasks())
+    for i in range(1000):
+        wheel.schedule(10 + i, record, i)
+    assert len(asyncio.all_tasks()) == tasks
+    await asyncio.sleep(0.1)
+    assert fired == ["early", "late"]
+    assert len(wheel) == 1000
@@ -45,7 +45,7 @@ async def test_service_bus_mode_adds_event(model, controller, sample_event):
         def __init__(self):
             self.subscribed = {}
 
-        def subscribe(self, event_type, callback):
+        def subscribe(self, event_type, callback, **kwargs):
             self.subscribed[event_type] = callback
 
         def publish(self, event_type, event):